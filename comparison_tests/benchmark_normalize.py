@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Benchmark OutputNormalizer against the previous _rstrip_all_lines + _restructure_output"""
+from timeit import repeat
+
+from ssh2net.normalize import OutputNormalizer
+
+
+def legacy_rstrip_all_lines(output):
+    output = output.decode("unicode_escape").strip().splitlines()
+    output = [line.rstrip() for line in output]
+    return "\n".join(output)
+
+
+def legacy_restructure_output(output, strip_prompt=False):
+    output = output.splitlines()
+    for row in output.copy():
+        if row == "":
+            output = output[1:]
+        else:
+            break
+    if strip_prompt:
+        output = output[:-1]
+    output = "\n".join(output)
+    return output
+
+
+def legacy(output):
+    return legacy_restructure_output(legacy_rstrip_all_lines(output), strip_prompt=True)
+
+
+def normalizer(output):
+    return OutputNormalizer().normalize(output, strip_prompt=True)
+
+
+def normalizer_chunked(output, read_size=65535):
+    output_normalizer = OutputNormalizer()
+    lines = []
+    for offset in range(0, len(output), read_size):
+        lines += output_normalizer.feed(output[offset : offset + read_size])
+    lines += output_normalizer.finish(strip_prompt=True)
+    return "\n".join(lines)
+
+
+def show_run(size):
+    block = (
+        b"interface GigabitEthernet1/0/1   \r\n"
+        b" description uplink to core\r\n"
+        b" switchport mode trunk\r\n"
+        b" no shutdown\r\n"
+        b"!\r\n"
+    )
+    return b"\r\nBuilding configuration...\r\n\r\n" + block * (size // len(block)) + b"3560CX#"
+
+
+def main():
+    outputs = {
+        "show run 1MB": show_run(1_000_000),
+        "show run 8MB": show_run(8_000_000),
+        "20k leading blank lines": b"\r\n" * 20_000 + b"hostname 3560CX\r\n3560CX#",
+    }
+    for name, output in outputs.items():
+        assert legacy(output) == normalizer(output) == normalizer_chunked(output)
+        print(f"{name}:")
+        for func in (legacy, normalizer, normalizer_chunked):
+            elapsed = min(repeat(lambda: func(output), number=1, repeat=5))  # noqa
+            print(f"    {func.__name__:<20} {elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
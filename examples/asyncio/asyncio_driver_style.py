@@ -0,0 +1,25 @@
+import asyncio
+
+from ssh2net.core.cisco_iosxe.driver import AsyncIOSXEDriver
+
+my_devices = [
+    {"setup_host": "172.18.0.11", "auth_user": "vrnetlab", "auth_password": "VR-netlab9"},
+    {"setup_host": "172.18.0.12", "auth_user": "vrnetlab", "auth_password": "VR-netlab9"},
+]
+
+
+async def get_version(device):
+    async with AsyncIOSXEDriver(**device) as conn:
+        output = await conn.send_command("show version")
+        # send_inputs returns a list of results; return the zeroith result
+        return output[0]
+
+
+async def main():
+    # all devices are driven concurrently by a single event loop; no thread per device
+    results = await asyncio.gather(*(get_version(device) for device in my_devices))
+    for result in results:
+        print(result)
+
+
+asyncio.get_event_loop().run_until_complete(main())
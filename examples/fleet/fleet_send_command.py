@@ -0,0 +1,26 @@
+from ssh2net import SSH2NetFleet
+from ssh2net.core.cisco_iosxe.driver import IOSXEDriver
+
+my_devices = [
+    {
+        "setup_host": "172.18.0.11",
+        "auth_user": "vrnetlab",
+        "auth_password": "VR-netlab9",
+        "driver": IOSXEDriver,
+    },
+    # netmiko ConnectHandler style host definitions work as well
+    {
+        "host": "172.18.0.12",
+        "username": "vrnetlab",
+        "password": "VR-netlab9",
+        "device_type": "cisco_nxos",
+    },
+]
+
+fleet = SSH2NetFleet(my_devices, max_workers=10, device_timeout=60)
+for result in fleet.send_command("show version"):
+    if result.exception:
+        print(f"{result.host} failed after {result.elapsed:.2f}s: {result.exception}")
+    else:
+        # send_command returns a list of results; print the zeroith result
+        print(f"{result.host} took {result.elapsed:.2f}s:\n{result.result[0]}")
@@ -3,22 +3,33 @@ import logging
 from logging import NullHandler
 
 from ssh2net.base import SSH2Net
+from ssh2net.aio import AsyncSSH2Net
 from ssh2net.channel import SSH2NetChannel
 from ssh2net.session import SSH2NetSession
+from ssh2net.shells import SSH2NetShellGroup
+from ssh2net.fleet import SSH2NetFleet
+from ssh2net.sharded import SSH2NetShardedExecutor
+from ssh2net.pool import SSH2NetConnectionPool
+from ssh2net.scan import SSH2NetScanner
 from ssh2net.netmiko_compatibility import connect_handler as ConnectHandler
 from ssh2net.ssh_config import SSH2NetSSHConfig
-from ssh2net.core.driver import BaseNetworkDriver
-from ssh2net.core.cisco_iosxe.driver import IOSXEDriver
-from ssh2net.core.cisco_nxos.driver import NXOSDriver
-from ssh2net.core.cisco_iosxr.driver import IOSXRDriver
-from ssh2net.core.arista_eos.driver import EOSDriver
-from ssh2net.core.juniper_junos.driver import JunosDriver
+from ssh2net.core.driver import AsyncBaseNetworkDriver, BaseNetworkDriver
+from ssh2net.core.cisco_iosxe.driver import AsyncIOSXEDriver, IOSXEDriver
+from ssh2net.core.cisco_nxos.driver import AsyncNXOSDriver, NXOSDriver
+from ssh2net.core.cisco_iosxr.driver import AsyncIOSXRDriver, IOSXRDriver
+from ssh2net.core.arista_eos.driver import AsyncEOSDriver, EOSDriver
+from ssh2net.core.juniper_junos.driver import AsyncJunosDriver, JunosDriver
 
 __version__ = "2020.01.10"
 __all__ = (
     "SSH2Net",
     "SSH2NetSession",
     "SSH2NetChannel",
+    "SSH2NetShellGroup",
+    "SSH2NetFleet",
+    "SSH2NetShardedExecutor",
+    "SSH2NetConnectionPool",
+    "SSH2NetScanner",
     "SSH2NetSSHConfig",
     "ConnectHandler",
     "BaseNetworkDriver",
@@ -27,6 +38,13 @@ __all__ = (
     "IOSXRDriver",
     "EOSDriver",
     "JunosDriver",
+    "AsyncSSH2Net",
+    "AsyncBaseNetworkDriver",
+    "AsyncIOSXEDriver",
+    "AsyncNXOSDriver",
+    "AsyncIOSXRDriver",
+    "AsyncEOSDriver",
+    "AsyncJunosDriver",
 )
 
 
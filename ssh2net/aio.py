@@ -0,0 +1,751 @@
+"""ssh2net.aio"""
+import asyncio
+import inspect
+import logging
+import socket
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
+from ssh2.exceptions import AuthenticationError
+from ssh2.session import LIBSSH2_SESSION_BLOCK_OUTBOUND, Session
+
+from ssh2net.ansi import AnsiStripper
+from ssh2net.base import SSH2Net
+from ssh2net.buffer import ReceiveBuffer
+from ssh2net.exceptions import AuthenticationFailed, SetupTimeout
+from ssh2net.prompt import PromptMatcher
+from ssh2net.resolver import RESOLVER
+
+
+channel_log = logging.getLogger("ssh2net_channel")
+session_log = logging.getLogger("ssh2net_session")
+
+
+class AsyncSSH2Net(SSH2Net):
+    def __init__(self, **kwargs: Dict[str, Any]):
+        """
+        Initialize AsyncSSH2Net Object
+
+        asyncio native flavor of SSH2Net. The libssh2 session is always non-blocking; whenever
+        libssh2 would block, the session socket is registered with the running event loop
+        (`loop.add_reader`/`loop.add_writer`) and the coroutine waits for it to become ready. No
+        threads are used, so a single event loop can drive any number of connections
+        concurrently.
+
+        Accepts the same arguments as SSH2Net. `open_shell`, `get_prompt`, `send_inputs`,
+        `send_inputs_interact` and `close` are coroutines; operations on a connection are
+        serialized with an asyncio lock. Only ssh2-python is supported as the underlying driver.
+        The thread based `send_inputs_stream`, `send_inputs_bulk`, `execute_commands` and
+        `open_shell_channel` are not supported and raise TypeError.
+
+        Args:
+            **kwargs: keyword args to pass to inherited class(es)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if setup_use_paramiko is True
+
+        """
+        super().__init__(**kwargs)
+        if self.setup_use_paramiko:
+            raise ValueError("AsyncSSH2Net does not support paramiko as the underlying driver")
+        self._keepalive_task = None
+
+    async def __aenter__(self):
+        """
+        Enter method for async context manager
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            self: instance of self
+
+        Raises:
+            N/A  # noqa
+
+        """
+        await self.open_shell()
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        """
+        Exit method to cleanup for async context manager
+
+        Args:
+            exception_type: exception type being raised
+            exception_value: message from exception being raised
+            traceback: traceback from exception being raised
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        await self.close()
+
+    def __str__(self):
+        """
+        Magic str method for AsyncSSH2Net class
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return f"AsyncSSH2Net Connection Object for host {self.host}"
+
+    async def _wait_socket_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the session socket is ready for the direction libssh2 is blocked on
+
+        Args:
+            timeout: seconds to wait for the socket to be ready; None waits indefinitely
+
+        Returns:
+            bool: True/False socket is ready (False if timeout expired)
+
+        Raises:
+            N/A  # noqa
+
+        """
+        loop = asyncio.get_event_loop()
+        ready = loop.create_future()
+
+        def _set_ready():
+            if not ready.done():
+                ready.set_result(True)
+
+        file_descriptor = self.sock.fileno()
+        # inbound is the default; libssh2 may report no direction at all after an EAGAIN
+        write = bool(self.session.block_directions() & LIBSSH2_SESSION_BLOCK_OUTBOUND)
+        if write:
+            loop.add_writer(file_descriptor, _set_ready)
+        else:
+            loop.add_reader(file_descriptor, _set_ready)
+        try:
+            await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if write:
+                loop.remove_writer(file_descriptor)
+            else:
+                loop.remove_reader(file_descriptor)
+        return True
+
+    async def _session_call(self, func, *args):
+        """
+        Call a non-blocking libssh2 function, waiting on the socket for as long as it would block
+
+        Args:
+            func: ssh2-python session/channel method to call
+            *args: arguments to call func with
+
+        Returns:
+            result: result of func
+
+        Raises:
+            N/A  # noqa
+
+        """
+        while True:
+            result = func(*args)
+            if result != LIBSSH2_ERROR_EAGAIN:
+                return result
+            await self._wait_socket_ready()
+
+    async def _operation(self, operation):
+        """
+        Run an operation (coroutine), enforcing `comms_operation_timeout`
+
+        Args:
+            operation: coroutine of the operation to run
+
+        Returns:
+            result: result of the operation
+
+        Raises:
+            TimeoutError: if the operation times out
+
+        """
+        if not self.comms_operation_timeout:
+            return await operation
+        try:
+            return await asyncio.wait_for(operation, self.comms_operation_timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError
+
+    """ socket/session setup """  # noqa
+
+    async def _socket_open(self) -> None:
+        """
+        Open underlying socket without blocking the event loop
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            SetupTimeout: if socket connection times out
+            socket.gaierror: if the host does not resolve to any address
+            OSError: if the socket connection fails for any other reason
+
+        """
+        if self._socket_alive():
+            return
+        loop = asyncio.get_event_loop()
+        # cached lookups return immediately; anything else must not block the event loop
+        addresses = await loop.run_in_executor(None, RESOLVER.resolve, self.host, self.port)
+        if not addresses:
+            raise socket.gaierror(f"Host {self.host} did not resolve to any address")
+        connect_error = None
+        for family, sockaddr in addresses:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, sockaddr), self.setup_timeout)
+            except (OSError, asyncio.TimeoutError) as exc:
+                session_log.info(f"Failed to open socket to {sockaddr[0]}: {exc}")
+                sock.close()
+                connect_error = exc
+                continue
+            self.sock = sock
+            session_log.debug(f"Socket to host {self.host} opened")
+            return
+        if isinstance(connect_error, asyncio.TimeoutError):
+            session_log.critical(
+                f"Timed out trying to open socket to {self.host} on port {self.port}"
+            )
+            raise SetupTimeout(
+                f"Timed out trying to open socket to {self.host} on port {self.port}"
+            )
+        raise connect_error
+
+    async def _session_open(self) -> None:
+        """
+        Open and authenticate SSH session
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            AuthenticationFailed: if password and keyboard interactive authentication fail
+
+        """
+        await self._socket_open()
+        if not self._session_alive():
+            self.session = Session()
+            self.session.set_blocking(False)
+            await self._session_call(self.session.handshake, self.sock)
+        logging.debug(f"Session to host {self.host} opened")
+        self.session_lock = asyncio.Lock()
+        if self.auth_public_key:
+            try:
+                await self._session_call(
+                    self.session.userauth_publickey_fromfile, self.auth_user, self.auth_public_key
+                )
+            except AuthenticationError:
+                logging.critical(f"Public key authentication with host {self.host} failed. ")
+            if self._session_alive():
+                return
+        if self.auth_password:
+            try:
+                await self._session_call(
+                    self.session.userauth_password, self.auth_user, self.auth_password
+                )
+            except AuthenticationError as exc:
+                logging.critical(
+                    f"Password authentication with host {self.host} failed. Exception: {exc}."
+                    f"\n\tTrying keyboard interactive auth..."
+                )
+                try:
+                    await self._session_call(
+                        self.session.userauth_keyboardinteractive,
+                        self.auth_user,
+                        self.auth_password,
+                    )
+                except AuthenticationError as exc:
+                    logging.critical(
+                        f"Keyboard interactive authentication with host {self.host} failed. "
+                        f"Exception: {exc}."
+                    )
+                    raise AuthenticationFailed
+
+    async def _session_keepalive(self) -> None:
+        """
+        Send keepalives from an event loop task for as long as the session is alive
+
+        Keepalives are skipped while the channel has traffic, and are only sent if no operation is
+        running.
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        delay = self.session_keepalive_interval
+        while True:
+            await asyncio.sleep(delay)
+            if not self._session_alive():
+                return
+            idle_time = time.monotonic() - self._last_activity
+            delay = self.session_keepalive_interval
+            if idle_time < self.session_keepalive_interval:
+                delay -= idle_time
+            elif self.session_lock.locked():
+                # the keepalive would wait on the socket the operation is waiting on
+                logging.debug(f"Keepalive to host {self.host} delayed, session lock is held")
+                delay /= 10
+            elif self.session_keepalive_type == "standard":
+                async with self.session_lock:
+                    await self._session_call(self.session.keepalive_send)
+                self._last_activity = time.monotonic()
+            else:
+                async with self.session_lock:
+                    await self._channel_write(self.session_keepalive_pattern)
+
+    """ channel i/o """  # noqa
+
+    async def _channel_read(self, receive_buffer: ReceiveBuffer) -> bytes:
+        """
+        Read from channel into a receive buffer, waiting for output if nothing is available yet
+
+        Args:
+            receive_buffer: ReceiveBuffer to append output to; also dictates read size
+
+        Returns:
+            output: bytes read from channel, ansi stripped if `comms_strip_ansi` is set
+
+        Raises:
+            EOFError: if the channel is at EOF, as it will never return more output
+
+        """
+        while True:
+            return_code, output = self.channel.read(receive_buffer.read_size)
+            if return_code == LIBSSH2_ERROR_EAGAIN:
+                await self._wait_socket_ready()
+                continue
+            if output:
+                break
+            if self.channel.eof():
+                raise EOFError(f"Channel to host {self.host} is at EOF")
+            # nothing read but not blocked either; yield so the read can't starve the event loop
+            await asyncio.sleep(0)
+        self._last_activity = time.monotonic()
+        if self.comms_strip_ansi:
+            if self._ansi_stripper is None:
+                self._ansi_stripper = AnsiStripper()
+            output = self._ansi_stripper.feed(output)
+        receive_buffer.extend(output)
+        return output
+
+    async def _channel_write(self, channel_input: str) -> None:
+        """
+        Write to channel, resuming partial writes
+
+        Args:
+            channel_input: string to write to channel
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        channel_input = channel_input.encode()
+        while channel_input:
+            return_code, written = self.channel.write(channel_input)
+            channel_input = channel_input[written:]
+            if return_code == LIBSSH2_ERROR_EAGAIN:
+                await self._wait_socket_ready()
+        self._last_activity = time.monotonic()
+
+    async def _read_until_input(self, channel_input: str) -> None:
+        """
+        Read until all input has been entered, then send return
+
+        Args:
+            channel_input: string to write to channel
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
+        channel_input = channel_input.encode()
+        search_start = 0
+        while receive_buffer.find(channel_input, search_start) == -1:
+            search_start = len(receive_buffer) - len(channel_input) + 1
+            await self._channel_read(receive_buffer)
+        channel_log.debug(f"Read: {repr(bytes(receive_buffer))}")
+        await self._channel_write(self.comms_return_char)
+        channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
+
+    async def _read_until_prompt(self, output=None, prompt=None) -> bytearray:
+        """
+        Read the channel until the desired prompt is seen
+
+        Args:
+            output: bytes of previously seen output if any
+            prompt: string of prompt to look for; regex if starting with ^ or ending with $
+
+        Returns:
+            output: bytes of channel output up to and including the prompt
+
+        Raises:
+            N/A  # noqa
+
+        """
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
+        if output:
+            receive_buffer.extend(output)
+        if not prompt:
+            prompt_matcher = PromptMatcher(self._prompt_pattern())
+        else:
+            prompt_matcher = PromptMatcher(
+                prompt, regex=prompt.startswith("^") or prompt.endswith("$")
+            )
+        channel_match = prompt_matcher.feed(output or b"")
+        while not channel_match:
+            output_chunk = await self._channel_read(receive_buffer)
+            channel_log.debug(f"Read: {repr(output_chunk)}")
+            channel_match = prompt_matcher.feed(output_chunk)
+        self._update_current_prompt(prompt_matcher, verify=bool(prompt))
+        return receive_buffer.buffer
+
+    async def _send_input(self, channel_input: str, strip_prompt: bool) -> str:
+        """
+        Send input to device and return results
+
+        Args:
+            channel_input: string input to write to channel
+            strip_prompt: bool True/False for whether or not to strip prompt
+
+        Returns:
+            output: string of cleaned channel data
+
+        Raises:
+            N/A  # noqa
+
+        """
+        async with self.session_lock:
+            self._current_prompt = None
+            session_log.debug(
+                f"Attempting to send input: {channel_input}; strip_prompt: {strip_prompt}"
+            )
+            await self._channel_write(channel_input)
+            channel_log.debug(f"Write: {repr(channel_input)}")
+            await self._read_until_input(channel_input)
+            output = await self._read_until_prompt()
+        return self._normalize_output(output, strip_prompt=strip_prompt)
+
+    async def _send_input_interact(
+        self,
+        channel_input: str,
+        expectation: str,
+        response: str,
+        finale: str,
+        hidden_response: bool = False,
+    ) -> str:
+        """
+        Respond to a single "staged" prompt and return results
+
+        Args:
+            channel_input: string input to write to channel
+            expectation: string of what to expect from channel
+            response: string what to respond to the "expectation"
+            finale: string of prompt to look for to know when "done"
+            hidden_response: True/False response is hidden (i.e. password input)
+
+        Returns:
+            output: string of cleaned channel data
+
+        Raises:
+            N/A  # noqa
+
+        """
+        async with self.session_lock:
+            self._current_prompt = None
+            session_log.debug(
+                f"Attempting to send input interact: {channel_input}; "
+                f"expecting: {expectation}; responding: {response}; "
+                f"with a finale: {finale}; hidden_response: {hidden_response}"
+            )
+            await self._channel_write(channel_input)
+            channel_log.debug(f"Write: {repr(channel_input)}")
+            await self._read_until_input(channel_input)
+            output = await self._read_until_prompt(prompt=expectation)
+            if not response or hidden_response is True:
+                output += self.comms_return_char.encode()
+            await self._channel_write(response)
+            channel_log.debug(f"Write: {repr(response)}")
+            await self._channel_write(self.comms_return_char)
+            output += await self._read_until_prompt(prompt=finale)
+        return self._normalize_output(output)
+
+    """ public api """  # noqa
+
+    async def open_shell(self) -> None:
+        """
+        Open and prepare interactive shell
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        session_log.info(f"Attempting to open interactive shell")
+        self._current_prompt = None
+        if not self._session_alive():
+            await self._session_open()
+        self.channel = await self._session_call(self.session.open_session)
+        await self._session_call(self.channel.pty)
+        await self._session_call(self.channel.shell)
+        self._shell = True
+        logging.debug(f"Channel to host {self.host} opened")
+        # pre-login handlers/disable paging callables may be plain functions or coroutines
+        if self.comms_pre_login_handler:
+            result = self.comms_pre_login_handler(self)
+            if inspect.isawaitable(result):
+                await result
+        if self.comms_disable_paging:
+            if callable(self.comms_disable_paging):
+                result = self.comms_disable_paging(self)
+                if inspect.isawaitable(result):
+                    await result
+            else:
+                await self.send_inputs(self.comms_disable_paging)
+        if self.session_keepalive:
+            if self.session_keepalive_type == "standard":
+                self.session.keepalive_config(
+                    want_reply=False, interval=self.session_keepalive_interval
+                )
+            self._keepalive_task = asyncio.ensure_future(self._session_keepalive())
+        session_log.info("Interactive shell opened")
+
+    async def get_prompt(self) -> str:
+        """
+        Read from shell and get the current shell prompt
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            current_prompt: string of the current prompt
+
+        Raises:
+            TimeoutError: if no prompt is seen within `comms_operation_timeout`
+
+        """
+
+        async def _get_prompt():
+            receive_buffer = ReceiveBuffer(self.comms_read_size)
+            prompt_matcher = PromptMatcher(self._prompt_pattern())
+            async with self.session_lock:
+                await self._channel_write(self.comms_return_char)
+                while not prompt_matcher.feed(await self._channel_read(receive_buffer)):
+                    pass
+            self._update_current_prompt(prompt_matcher)
+            return prompt_matcher.prompt
+
+        return await self._operation(_get_prompt())
+
+    async def send_inputs(self, inputs, strip_prompt: Optional[bool] = True) -> List[str]:
+        """
+        Send inputs to device in shell mode and return results
+
+        Args:
+            inputs: list of strings or string of inputs to send to channel
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+
+        Returns:
+            result: list of output from the input command(s)
+
+        Raises:
+            TimeoutError: if an input takes longer than `comms_operation_timeout`
+
+        """
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        results = []
+        for channel_input in inputs:
+            output = await self._operation(self._send_input(channel_input, strip_prompt))
+            results.append(output)
+        return results
+
+    async def send_inputs_interact(self, inputs, hidden_response=False) -> List[Tuple[str, bytes]]:
+        """
+        Interact with devices in shell mode; used to handle prompts
+
+        Args:
+            inputs: tuple (or list of tuples) containing strings representing:
+                initial input
+                expectation (what should ssh2net expect after input)
+                response (response to expectation)
+                finale (what should ssh2net expect when "done")
+            hidden_response: True/False response is hidden (i.e. password input)
+
+        Returns:
+            result: list of output from the input command(s)
+
+        Raises:
+            TimeoutError: if an interaction takes longer than `comms_operation_timeout`
+
+        """
+        if isinstance(inputs, tuple):
+            inputs = [inputs]
+        results = []
+        for channel_input, expectation, response, finale in inputs:
+            output = await self._operation(
+                self._send_input_interact(
+                    channel_input, expectation, response, finale, hidden_response
+                )
+            )
+            results.append(output)
+        return results
+
+    def _sync_only(self, method: str) -> TypeError:
+        """
+        Build the error raised by the sync only methods inherited from SSH2Net
+
+        Args:
+            method: name of the sync only method
+
+        Returns:
+            TypeError: error to raise
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return TypeError(f"{type(self).__name__} does not support {method}, use the sync driver")
+
+    def send_inputs_stream(self, inputs, strip_prompt: Optional[bool] = True):
+        """
+        Not supported by AsyncSSH2Net; see SSH2Net.send_inputs_stream
+
+        Args:
+            inputs: list of strings or string of input
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+
+        """
+        raise self._sync_only("send_inputs_stream")
+
+    def send_inputs_bulk(
+        self, inputs, strip_prompt: Optional[bool] = True, window: Optional[int] = None
+    ):
+        """
+        Not supported by AsyncSSH2Net; see SSH2Net.send_inputs_bulk
+
+        Args:
+            inputs: list of strings or string of input
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+            window: max number of characters written ahead of the echoed input
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+
+        """
+        raise self._sync_only("send_inputs_bulk")
+
+    def execute_commands(self, commands, max_channels: Optional[int] = 5):
+        """
+        Not supported by AsyncSSH2Net; see SSH2Net.execute_commands
+
+        Args:
+            commands: list of strings or string of commands
+            max_channels: maximum number of exec channels open at once
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+
+        """
+        raise self._sync_only("execute_commands")
+
+    def open_shell_channel(self):
+        """
+        Not supported by AsyncSSH2Net; see SSH2Net.open_shell_channel
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+
+        """
+        raise self._sync_only("open_shell_channel")
+
+    async def close(self) -> None:
+        """
+        Fully close socket, session, and channel
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if getattr(self, "channel", None) is not None:
+            await self._session_call(self.channel.close)
+            self.channel = None
+            logging.debug(f"Channel to host {self.host} closed")
+        if getattr(self, "session", None) is not None:
+            await self._session_call(self.session.disconnect)
+            self.session = None
+            logging.debug(f"Session to host {self.host} closed")
+        if self._socket_alive():
+            self.sock.close()
+            session_log.debug(f"Socket to host {self.host} closed")
+        session_log.info(f"{str(self)}; Closed")
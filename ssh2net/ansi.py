@@ -0,0 +1,73 @@
+"""ssh2net.ansi"""
+import re
+
+
+ANSI_ESCAPE_PATTERN = re.compile(rb"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+# an escape sequence that has been started but not yet terminated at the end of the data
+ANSI_PARTIAL_ESCAPE_PATTERN = re.compile(rb"\x1B(?:\[[0-?]*[ -/]*)?")
+# escape sequences longer than this are considered garbage and are no longer held back
+ANSI_MAX_PARTIAL_LENGTH = 64
+
+
+class AnsiStripper:
+    def __init__(self):
+        """
+        Initialize AnsiStripper Object
+
+        Incrementally strip ansi/vt100 escape sequences from channel output. Escape sequences
+        that are split across reads are held back until the rest of the sequence arrives rather
+        than leaking through to the output (and prompt matching). Each chunk is processed with a
+        single pass of a precompiled pattern.
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._pending = b""
+
+    def feed(self, data: bytes) -> bytes:
+        """
+        Strip ansi escape sequences from a chunk of channel output
+
+        Args:
+            data: bytes-like object read from the channel
+
+        Returns:
+            bytes: data with escape sequences removed; any trailing partial escape sequence is
+                held back until the next call to feed
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._pending:
+            data = self._pending + data
+            self._pending = b""
+        partial_start = data.rfind(b"\x1b", max(0, len(data) - ANSI_MAX_PARTIAL_LENGTH))
+        if partial_start != -1 and ANSI_PARTIAL_ESCAPE_PATTERN.fullmatch(data, partial_start):
+            self._pending = bytes(data[partial_start:])
+            data = data[:partial_start]
+        return ANSI_ESCAPE_PATTERN.sub(b"", data)
+
+    def flush(self) -> bytes:
+        """
+        Return any held back partial escape sequence and reset state
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            bytes: held back bytes, if any
+
+        Raises:
+            N/A  # noqa
+
+        """
+        pending, self._pending = self._pending, b""
+        return pending
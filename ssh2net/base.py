@@ -9,6 +9,7 @@ from typing import Callable, Optional, Union
 from ssh2net.session import SSH2NetSession
 from ssh2net.exceptions import ValidationError, SetupTimeout
 from ssh2net.helper import validate_external_function
+from ssh2net.resolver import RESOLVER
 from ssh2net.ssh_config import SSH2NetSSHConfig
 
 
@@ -29,6 +30,7 @@ class SSH2Net(SSH2NetSession):
         session_keepalive_interval: Optional[int] = 10,
         session_keepalive_type: Optional[str] = "network",
         session_keepalive_pattern: Optional[str] = "\005",
+        session_lock_timeout: Optional[int] = 0,
         auth_user: str = "",
         auth_password: Optional[Union[str]] = None,
         auth_public_key: Optional[Union[str]] = None,
@@ -38,6 +40,7 @@ class SSH2Net(SSH2NetSession):
         comms_return_char: Optional[str] = "\n",
         comms_pre_login_handler: Optional[Union[str, Callable]] = "",
         comms_disable_paging: Optional[Union[str, Callable]] = "terminal length 0",
+        comms_read_size: Optional[int] = 65535,
     ):
         r"""
         Initialize SSH2Net Object
@@ -57,14 +60,17 @@ class SSH2Net(SSH2NetSession):
             session_keepalive_interval: interval to use for session keepalives
             session_keepalive_type: network|standard -- "network" sends actual characters over the
                 channel as "normal" ssh keepalive doesn't keep sessions open. "standard" sends
-                "normal" ssh keepalives via ssh2 library. In both cases a thread is spawned in
-                which the keepalives are sent. This introduces a locking mechanism which in
+                "normal" ssh keepalives via ssh2 library. In both cases keepalives are sent from
+                a single process wide keepalive thread shared by all connections, and are skipped
+                while the channel has traffic. This introduces a locking mechanism which in
                 theory will slow things down slightly, however provides the ability to keep the
                 session alive indefinitely.
             session_keepalive_pattern: pattern to send to keep network channel alive. Default is
                 u"\005" which is equivalent to "ctrl+e". This pattern moves cursor to end of the
                 line which should be an innocuous pattern. This will only be entered *if* a lock
                 can be acquired.
+            session_lock_timeout: time in seconds to wait for other operations on the connection
+                to finish (i.e. when sharing a connection between threads); 0 waits indefinitely
             auth_user: username to use to connect to host
             auth_password: password to use to connect to host
             auth_public_key: path to ssh public key to use to connect to host
@@ -83,6 +89,7 @@ class SSH2Net(SSH2NetSession):
                 handle pre-login (pre disable paging) operations
             comms_disable_paging: callable, string that resolves to an importable function, or
                 string to send to device to disable paging
+            comms_read_size: max number of bytes to request from the channel per read
 
         Returns:
             N/A  # noqa
@@ -96,8 +103,10 @@ class SSH2Net(SSH2NetSession):
                 - session_keepalive is not a bool
                 - session_keepalive_interval is not an integer
                 - session_keepalive_type is not "network" or "standard"
+                - session_lock_timeout is not an integer
                 - comms_operation_timeout is not an integer
                 - comms_return_char is not a string
+                - comms_read_size is not an integer
 
         """
         # set a flag to indicate if a shell has been invoked
@@ -115,6 +124,7 @@ class SSH2Net(SSH2NetSession):
             session_keepalive_interval,
             session_keepalive_type,
             session_keepalive_pattern,
+            session_lock_timeout,
         )
 
         # auth setup
@@ -128,6 +138,7 @@ class SSH2Net(SSH2NetSession):
             comms_return_char,
             comms_pre_login_handler,
             comms_disable_paging,
+            comms_read_size,
         )
 
         if setup_ssh_config_file:
@@ -329,9 +340,9 @@ class SSH2Net(SSH2NetSession):
 
         """
         self.host = setup_host.strip()
+        self.port = int(setup_port)
         if setup_validate_host:
             self._validate_host()
-        self.port = int(setup_port)
         self.setup_timeout = int(setup_timeout)
         if isinstance(setup_use_paramiko, bool):
             self.setup_use_paramiko = setup_use_paramiko
@@ -345,6 +356,7 @@ class SSH2Net(SSH2NetSession):
         session_keepalive_interval,
         session_keepalive_type,
         session_keepalive_pattern,
+        session_lock_timeout,
     ) -> None:
         r"""
         Process and set "session" args
@@ -355,14 +367,17 @@ class SSH2Net(SSH2NetSession):
             session_keepalive_interval: interval to use for session keepalives
             session_keepalive_type: network|standard -- "network" sends actual characters over the
                 channel as "normal" ssh keepalive doesn't keep sessions open. "standard" sends
-                "normal" ssh keepalives via ssh2 library. In both cases a thread is spawned in
-                which the keepalives are sent. This introduces a locking mechanism which in
+                "normal" ssh keepalives via ssh2 library. In both cases keepalives are sent from
+                a single process wide keepalive thread shared by all connections, and are skipped
+                while the channel has traffic. This introduces a locking mechanism which in
                 theory will slow things down slightly, however provides the ability to keep the
                 session alive indefinitely.
             session_keepalive_pattern: pattern to send to keep network channel alive. Default is
                 u"\005" which is equivalent to "ctrl+e". This pattern moves cursor to end of the
                 line which should be an innocuous pattern. This will only be entered *if* a lock
                 can be acquired.
+            session_lock_timeout: time in seconds to wait for other operations on the connection
+                to finish (i.e. when sharing a connection between threads); 0 waits indefinitely
 
         Returns:
             N/A  # noqa
@@ -384,6 +399,7 @@ class SSH2Net(SSH2NetSession):
             )
         self.session_keepalive_type = session_keepalive_type
         self.session_keepalive_pattern = session_keepalive_pattern
+        self.session_lock_timeout = int(session_lock_timeout)
 
     def _setup_auth_args(self, auth_user, auth_public_key, auth_password) -> None:
         """
@@ -419,6 +435,7 @@ class SSH2Net(SSH2NetSession):
         comms_return_char,
         comms_pre_login_handler,
         comms_disable_paging,
+        comms_read_size,
     ):
         """
         Process and set "comms" args
@@ -439,6 +456,7 @@ class SSH2Net(SSH2NetSession):
                 handle pre-login (pre disable paging) operations
             comms_disable_paging: callable, string that resolves to an importable function, or
                 string to send to device to disable paging
+            comms_read_size: max number of bytes to request from the channel per read
 
         Returns:
             N/A  # noqa
@@ -466,6 +484,7 @@ class SSH2Net(SSH2NetSession):
             self._invalid_arg_type(str, "comms_return_char", comms_return_char)
         self.comms_pre_login_handler = self._set_comms_pre_login_handler(comms_pre_login_handler)
         self.comms_disable_paging = self._set_comms_disable_paging(comms_disable_paging)
+        self.comms_read_size = int(comms_read_size)
 
     def _setup_ssh_config_args(self, setup_ssh_config_file) -> None:
         """
@@ -512,9 +531,10 @@ class SSH2Net(SSH2NetSession):
         except ValueError:
             session_log.info(f"Failed to validate host {self.host} as an ip address")
         try:
-            socket.gethostbyname(self.host)
+            # resolved addresses are cached and reused when opening the socket
+            RESOLVER.resolve(self.host, self.port)
             return
-        except socket.gaierror:
+        except (socket.gaierror, UnicodeError):
             session_log.info(f"Failed to validate host {self.host} as a resolvable dns name")
         raise ValidationError(f"Host {self.host} is not an IP or resolvable DNS name.")
 
@@ -558,21 +578,37 @@ class SSH2Net(SSH2NetSession):
 
         Raises:
             SetupTimeout: if socket connection times out
+            socket.gaierror: if the host does not resolve to any address
+            OSError: if the socket connection fails for any other reason
 
         """
         if not self._socket_alive():
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.settimeout(self.setup_timeout)
-            try:
-                self.sock.connect((self.host, self.port))
-            except socket.timeout:
+            # try each (IPv4 or IPv6) address the host resolves to in order of preference
+            addresses = RESOLVER.resolve(self.host, self.port)
+            if not addresses:
+                raise socket.gaierror(f"Host {self.host} did not resolve to any address")
+            connect_error = None
+            for family, sockaddr in addresses:
+                sock = socket.socket(family, socket.SOCK_STREAM)
+                sock.settimeout(self.setup_timeout)
+                try:
+                    sock.connect(sockaddr)
+                except OSError as exc:
+                    session_log.info(f"Failed to open socket to {sockaddr[0]}: {exc}")
+                    sock.close()
+                    connect_error = exc
+                    continue
+                self.sock = sock
+                session_log.debug(f"Socket to host {self.host} opened")
+                return
+            if isinstance(connect_error, socket.timeout):
                 session_log.critical(
                     f"Timed out trying to open socket to {self.host} on port {self.port}"
                 )
                 raise SetupTimeout(
                     f"Timed out trying to open socket to {self.host} on port {self.port}"
                 )
-            session_log.debug(f"Socket to host {self.host} opened")
+            raise connect_error
 
     def _socket_close(self) -> None:
         """
@@ -588,6 +624,7 @@ class SSH2Net(SSH2NetSession):
             N/A  # noqa
 
         """
+        self._socket_selector_close()
         if self._socket_alive():
             self.sock.close()
             session_log.debug(f"Socket to host {self.host} closed")
@@ -606,7 +643,13 @@ class SSH2Net(SSH2NetSession):
             N/A  # noqa
 
         """
+        self._session_keepalive_stop()
         self._channel_close()
+        if not self._session_owner:
+            # shell channel opened with `open_shell_channel`; session and socket are shared
+            self._socket_selector_close()
+            session_log.info(f"{str(self)}; Shell channel closed")
+            return
         self._session_close()
         self._socket_close()
         session_log.info(f"{str(self)}; Closed")
@@ -0,0 +1,225 @@
+"""ssh2net.buffer"""
+import time
+from typing import Optional
+
+
+DEFAULT_READ_SIZE = 65535
+
+
+class ReceiveBuffer:
+    def __init__(self, read_size: Optional[int] = DEFAULT_READ_SIZE):
+        """
+        Initialize ReceiveBuffer Object
+
+        Growable buffer for channel output. Output is appended in place to a bytearray rather than
+        re-allocating an immutable bytes object for every chunk read, and matching/decoding work
+        on memoryviews of the buffer so large outputs are not copied around.
+
+        Args:
+            read_size: max number of bytes to request from the channel per read
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.read_size = read_size
+        self.buffer = bytearray()
+
+    def __len__(self) -> int:
+        """
+        Magic len method for ReceiveBuffer class
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            int: number of bytes in buffer
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return len(self.buffer)
+
+    def __bytes__(self) -> bytes:
+        """
+        Magic bytes method for ReceiveBuffer class
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            bytes: copy of buffer contents
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return bytes(self.buffer)
+
+    def extend(self, data: bytes) -> int:
+        """
+        Append data to the buffer
+
+        Args:
+            data: bytes-like object to append
+
+        Returns:
+            int: offset in the buffer at which the appended data starts
+
+        Raises:
+            N/A  # noqa
+
+        """
+        offset = len(self.buffer)
+        self.buffer += data
+        return offset
+
+    def find(self, sub: bytes, start: Optional[int] = 0) -> int:
+        """
+        Find the first occurrence of sub in the buffer at or after start
+
+        Args:
+            sub: bytes to search for
+            start: offset to start searching from
+
+        Returns:
+            int: offset of sub or -1 if not found
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return self.buffer.find(sub, max(0, start))
+
+    def view(self, start: Optional[int] = 0, end: Optional[int] = None) -> memoryview:
+        """
+        Return a zero-copy view of (part of) the buffer
+
+        Note: the buffer cannot be extended while a view is held, release views before reading more
+
+        Args:
+            start: start offset of the view
+            end: end offset of the view; None for end of buffer
+
+        Returns:
+            memoryview: view of the buffer
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return memoryview(self.buffer)[start:end]
+
+    def decode(
+        self,
+        encoding: Optional[str] = "utf-8",
+        errors: Optional[str] = "strict",
+        start: Optional[int] = 0,
+        end: Optional[int] = None,
+    ) -> str:
+        """
+        Decode (part of) the buffer without first copying it to a bytes object
+
+        Args:
+            encoding: codec to decode with
+            errors: codec error handling scheme
+            start: start offset to decode from
+            end: end offset to decode to; None for end of buffer
+
+        Returns:
+            str: decoded buffer contents
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self.view(start, end) as buffer_view:
+            return str(buffer_view, encoding, errors)
+
+    def consume(self, size: int) -> None:
+        """
+        Discard bytes from the front of the buffer once they have been handled
+
+        Args:
+            size: number of bytes to discard
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        del self.buffer[:size]
+
+    def clear(self) -> None:
+        """
+        Empty the buffer
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        del self.buffer[:]
+
+
+class ReadState:
+    def __init__(
+        self, read_size: Optional[int] = DEFAULT_READ_SIZE, deadline: Optional[float] = None
+    ):
+        """
+        Initialize ReadState Object
+
+        State of a single read operation (i.e. reading until the input is echoed or until the
+        prompt is seen). The state outlives retries of the read, so a retry continues where the
+        timed out attempt left off -- output that was already received is kept and matching
+        resumes from where it stopped -- instead of starting over with an empty buffer.
+
+        Args:
+            read_size: max number of bytes to request from the channel per read
+            deadline: time.monotonic() by which the read operation (including any retries) must
+                complete; None for no deadline
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.receive_buffer = ReceiveBuffer(read_size)
+        self.deadline = deadline
+        # set by the read operation; i.e. PromptMatcher holding prompt match progress
+        self.prompt_matcher = None
+        # offset in the receive buffer from which to continue searching
+        self.search_start = 0
+        self.attempts = 0
+
+    def remaining(self) -> Optional[float]:
+        """
+        Return seconds remaining until the deadline
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            float: seconds remaining (negative once the deadline has passed), or None if there
+                is no deadline
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
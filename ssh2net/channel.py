@@ -1,93 +1,307 @@
 """ssh2net.channel"""
+import copy
 import logging
+import os
 import re
-import sys
-from typing import List, Optional, Tuple
+import selectors
+import time
+from typing import BinaryIO, Iterator, List, Optional, Pattern, Tuple, Union
 
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
 from ssh2.exceptions import SocketRecvError, Timeout
+from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND, LIBSSH2_SESSION_BLOCK_OUTBOUND
 
-from ssh2net.decorators import channel_timeout
-
-if not sys.platform.startswith("win"):
-    from ssh2net.decorators import operation_timeout
-else:
-    from ssh2net.decorators import operation_timeout_win as operation_timeout
+from ssh2net.ansi import ANSI_ESCAPE_PATTERN, AnsiStripper
+from ssh2net.buffer import ReadState, ReceiveBuffer
+from ssh2net.decorators import channel_timeout, check_operation_deadline, operation_deadline
+from ssh2net.lock import SessionLock
+from ssh2net.normalize import OutputNormalizer
+from ssh2net.prompt import PromptMatcher
 
 
 channel_log = logging.getLogger("ssh2net_channel")
 session_log = logging.getLogger("ssh2net_session")
 
+# max seconds a shell channel on a shared session waits on the socket before checking its channel
+# again; another channel may have already read this channel's data off of the socket
+SHARED_SESSION_POLL_INTERVAL = 0.05
+
+# default max number of characters of bulk input written ahead of what the device has echoed
+BULK_WINDOW = 2048
+
 
 class SSH2NetChannel:
+    _ansi_stripper = None
+    _socket_selector = None
+    # True once additional shell channels have been opened on the session
+    _session_shared = False
+    # False for shell channels opened with `open_shell_channel`, the session belongs to the parent
+    _session_owner = True
+    # time.monotonic() of the last channel read/write; keepalives are skipped while there is traffic
+    _last_activity = 0.0
+    # prompt the shell was last seen at; None if unknown, i.e. while an input is being sent
+    _current_prompt = None
+    # regex match of the current prompt against `_prompt_pattern`
+    _current_prompt_match = None
+
     @staticmethod
-    def _rstrip_all_lines(output: bytes) -> str:
+    def _normalize_output(output: bytes, strip_prompt: bool = False) -> str:
         """
-        Right strip all lines in provided output
+        Decode and clean up output; right strip lines, drop surrounding empty lines, strip prompt
 
         Args:
-            output: bytes object to handle
+            output: bytes (or bytearray) of output to handle
+            strip_prompt: bool True/False whether to strip prompt or not
 
         Returns:
-            output: bytes object with each line right stripped
+            output: string of joined output lines
 
         Raises:
             N/A  # noqa
 
         """
-        output = output.decode("unicode_escape").strip().splitlines()
-        output = [line.rstrip() for line in output]
-        return "\n".join(output)
+        return OutputNormalizer().normalize(output, strip_prompt=strip_prompt)
 
     @staticmethod
-    def _restructure_output(output: str, strip_prompt: bool = False) -> str:
+    def _strip_ansi(output: bytes) -> bytes:
         """
-        Clean up preceding empty lines, and strip prompt if desired
+        Strip ansi characters from bytes string
 
         Args:
-            output: list of strings to parse
-            strip_prompt: bool True/False whether to strip prompt or not
+            output: bytes from channel that need ansi stripped
 
         Returns:
-            output: string of joined output lines
+            output: bytes string with ansi stripped
 
         Raises:
             N/A  # noqa
 
         """
-        output = output.splitlines()
-        # purge empty rows before actual output
-        for row in output.copy():
-            if row == "":
-                output = output[1:]
-            else:
-                break
-        # should improve -- simply peels the last line out of the list...
-        if strip_prompt:
-            output = output[:-1]
-        output = "\n".join(output)
+        output = ANSI_ESCAPE_PATTERN.sub(b"", output)
         return output
 
-    @staticmethod
-    def _strip_ansi(output: bytes) -> bytes:
+    def _prompt_pattern(self) -> Pattern:
         """
-        Strip ansi characters from bytes string
+        Return the compiled regex prompts are matched with
+
+        Drivers override this to match prompts and determine the privilege level in one go
 
         Args:
-            output: bytes from channel that need ansi stripped
+            N/A  # noqa
 
         Returns:
-            output: bytes string with ansi stripped
+            Pattern: compiled `comms_prompt_regex`
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return re.compile(self.comms_prompt_regex, flags=re.M | re.I)
+
+    def _update_current_prompt(self, prompt_matcher: PromptMatcher, verify: bool = False) -> None:
+        """
+        Record the prompt a read operation ended at as the current prompt of the shell
+
+        Args:
+            prompt_matcher: PromptMatcher that found the prompt
+            verify: True/False prompt_matcher did not use `_prompt_pattern`; the prompt is only
+                recorded if it matches `_prompt_pattern`, anything else (i.e. a password prompt an
+                interaction stopped at) leaves the current prompt unknown
+
+        Returns:
+            N/A  # noqa
 
         Raises:
             N/A  # noqa
 
         """
-        ansi_escape_pattern = re.compile(rb"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        output = re.sub(ansi_escape_pattern, b"", output)
+        current_prompt = prompt_matcher.prompt
+        prompt_match = prompt_matcher.match
+        if verify:
+            prompt_match = self._prompt_pattern().search(current_prompt)
+        self._current_prompt = current_prompt if prompt_match else None
+        self._current_prompt_match = prompt_match
+
+    def _wait_channel_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the underlying socket is ready for the direction(s) libssh2 is blocked on
+
+        Used when a non-blocking libssh2 call returns EAGAIN so that waiting for the device costs
+        no cpu rather than spinning on the channel. A single selector is kept per connection and
+        is cleaned up when the socket is closed.
+
+        Args:
+            timeout: seconds to wait for the socket to be ready; None waits indefinitely. Never
+                waits past the deadline of the current operation
+
+        Returns:
+            bool: True/False socket is ready (False if timeout expired)
+
+        Raises:
+            TimeoutError: if the deadline of the current operation has passed
+
+        """
+        remaining = check_operation_deadline()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        with self.session_io_lock:
+            block_directions = self.session.block_directions()
+        events = 0
+        if block_directions & LIBSSH2_SESSION_BLOCK_INBOUND:
+            events |= selectors.EVENT_READ
+        if block_directions & LIBSSH2_SESSION_BLOCK_OUTBOUND:
+            events |= selectors.EVENT_WRITE
+        if not events:
+            events = selectors.EVENT_READ
+        if self._socket_selector is None:
+            self._socket_selector = selectors.DefaultSelector()
+            self._socket_selector.register(self.sock, events)
+        else:
+            self._socket_selector.modify(self.sock, events)
+        if self._session_shared:
+            timeout = min(timeout or SHARED_SESSION_POLL_INTERVAL, SHARED_SESSION_POLL_INTERVAL)
+        return bool(self._socket_selector.select(timeout))
+
+    def _socket_selector_close(self) -> None:
+        """
+        Close the selector used to wait on the socket, if any
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._socket_selector is not None:
+            self._socket_selector.close()
+            self._socket_selector = None
+
+    def _session_set_blocking(self, blocking: bool) -> None:
+        """
+        Set session blocking mode
+
+        A session shared by multiple shell channels is left in non-blocking mode for as long as it
+        is shared, so that a channel waiting on the device never blocks the other channels.
+
+        Args:
+            blocking: True/False session should block
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self.session_io_lock:
+            if not self._session_shared:
+                self.session.set_blocking(blocking)
+
+    def _channel_read(
+        self,
+        receive_buffer: ReceiveBuffer,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> bytes:
+        """
+        Read from channel into a receive buffer
+
+        If nothing is available to be read yet, wait for the socket to be readable.
+
+        Args:
+            receive_buffer: ReceiveBuffer to append output to; also dictates read size
+            timeout: seconds to wait for output when the session is non-blocking before raising
+                Timeout (blocking sessions raise Timeout per `session_timeout`); None waits
+                indefinitely
+            deadline: time.monotonic() deadline of the operation the read is part of; for
+                generators, the deadline of the current thread's operation does not apply to them
+                while they are suspended, so they pass their deadline explicitly
+
+        Returns:
+            output: bytes read from channel, ansi stripped if `comms_strip_ansi` is set
+
+        Raises:
+            Timeout: if no output has been read before timeout expires
+            TimeoutError: if the deadline of the current operation has passed
+
+        """
+        timeout_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            check_operation_deadline()
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError
+            with self.session_io_lock:
+                return_code, output = self.channel.read(receive_buffer.read_size)
+            if return_code != LIBSSH2_ERROR_EAGAIN:
+                break
+            wait_timeout = self.session_timeout / 1000 or None
+            if timeout_at is not None:
+                remaining = timeout_at - time.monotonic()
+                if remaining <= 0:
+                    raise Timeout
+                wait_timeout = min(wait_timeout or remaining, remaining)
+            if deadline is not None:
+                remaining = max(0, deadline - time.monotonic())
+                wait_timeout = min(wait_timeout or remaining, remaining)
+            self._wait_channel_ready(wait_timeout)
+        self._last_activity = time.monotonic()
+        if self.comms_strip_ansi:
+            # escape sequences may be split across reads, so a stripper that carries partial
+            # sequences over is kept for the life of the channel
+            if self._ansi_stripper is None:
+                self._ansi_stripper = AnsiStripper()
+            output = self._ansi_stripper.feed(output)
+        receive_buffer.extend(output)
         return output
 
+    def _channel_write(self, channel_input: str) -> None:
+        """
+        Write to channel
+
+        Resumes partial writes and waits on the socket when the session is non-blocking.
+
+        Args:
+            channel_input: string to write to channel
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        channel_input = channel_input.encode()
+        while channel_input:
+            with self.session_io_lock:
+                return_code, written = self.channel.write(channel_input)
+            channel_input = channel_input[written:]
+            if return_code == LIBSSH2_ERROR_EAGAIN:
+                self._wait_channel_ready(self.session_timeout / 1000 or None)
+        self._last_activity = time.monotonic()
+
+    def _channel_flush(self) -> None:
+        """
+        Flush channel
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self.session_io_lock:
+            self.channel.flush()
+
     @channel_timeout(Timeout)
-    def _read_until_input(self, channel_input: str) -> None:
+    def _read_until_input(self, channel_input: str, read_state: ReadState = None) -> None:
         """
         Read until all input has been entered, then send return.
 
@@ -95,6 +309,7 @@ class SSH2NetChannel:
 
         Args:
             channel_input: string to write to channel
+            read_state: ReadState of this read operation; provided by `channel_timeout`
 
         Returns:
             N/A  # noqa
@@ -103,75 +318,117 @@ class SSH2NetChannel:
             N/A  # noqa
 
         """
-        output = b""
-        while channel_input.encode() not in output:
-            if not self.comms_strip_ansi:
-                output += self.channel.read()[1]
-            else:
-                output += self._strip_ansi(self.channel.read()[1])
-        channel_log.debug(f"Read: {repr(output)}")
+        receive_buffer = read_state.receive_buffer
+        channel_input = channel_input.encode()
+        while receive_buffer.find(channel_input, read_state.search_start) == -1:
+            # only search the newly read data (plus enough to catch a split input) next time
+            read_state.search_start = len(receive_buffer) - len(channel_input) + 1
+            self._channel_read(receive_buffer, timeout=self.session_timeout / 1000 or None)
+        channel_log.debug(f"Read: {repr(bytes(receive_buffer))}")
         # once the input has been fully written to channel; flush it and send return char
-        self.channel.flush()
-        self.channel.write(self.comms_return_char)
+        self._channel_flush()
+        self._channel_write(self.comms_return_char)
         channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
 
     @channel_timeout(Timeout)
-    def _read_until_prompt(self, output=None, prompt=None):
+    def _read_until_prompt(self, output=None, prompt=None, read_state: ReadState = None):
         """
         Read the channel until the desired prompt is seen
 
         Args:
             output: bytes of previously seen output if any
             prompt: string of prompt to look for; refactor to prefer regex
+            read_state: ReadState of this read operation; provided by `channel_timeout`
 
         Returns:
-            output: bytes of any channel reads after prompt has been seen
+            output: bytes of channel output up to and including the prompt
 
         Raises:
             N/A  # noqa
 
         """
-        if not output:
-            output = b""
-
-        # prefer to use regex match where possible; assume pattern is regex if starting with
-        # ^ or ending with $ -- this works as we always use multi line search
-        if not prompt:
-            prompt_pattern = re.compile(self.comms_prompt_regex, flags=re.M | re.I)
-            prompt_regex = True
-        else:
-            if prompt.startswith("^") or prompt.endswith("$"):
-                prompt_pattern = re.compile(prompt, flags=re.M | re.I)
-                prompt_regex = True
+        receive_buffer = read_state.receive_buffer
+        prompt_matcher = read_state.prompt_matcher
+        if prompt_matcher is None:
+            # first attempt of this read; retries resume with the output and match progress
+            # of the previous attempt
+            if output:
+                receive_buffer.extend(output)
+            # prefer to use regex match where possible; assume pattern is regex if starting with
+            # ^ or ending with $ -- this works as we always use multi line search
+            if not prompt:
+                prompt_matcher = PromptMatcher(self._prompt_pattern())
             else:
-                prompt_pattern = prompt
-                prompt_regex = False
+                prompt_matcher = PromptMatcher(
+                    prompt, regex=prompt.startswith("^") or prompt.endswith("$")
+                )
+            read_state.prompt_matcher = prompt_matcher
+            # only new bytes (plus a small tail) are inspected for the prompt on each read; the
+            # output itself is left untouched until the prompt is found
+            prompt_matcher.feed(output or b"")
+        channel_match = bool(prompt_matcher.match)
 
         # disabling session blocking means the while loop will actually iterate
-        # without this iteration we can never properly check for prompts
-        self.session.set_blocking(False)
-        while True:
-            if not self.comms_strip_ansi:
-                output += self.channel.read()[1]
-            else:
-                output += self._strip_ansi(self.channel.read()[1])
-            channel_log.debug(f"Read: {repr(output)}")
-            # we do not need to deal w/ line replacement for the actual output, only for
-            # parsing if a prompt-like thing is at the end of the output
-            output_copy = output
-            output_copy = re.sub("\r", "\n", output_copy.decode("unicode_escape").strip())
-            if prompt_regex:
-                channel_match = re.search(prompt_pattern, output_copy)
-            elif prompt in output_copy:
-                channel_match = True
-            else:
-                channel_match = False
-            if channel_match:
-                output = self._rstrip_all_lines(output)
-                self.session.set_blocking(True)
-                return output
+        # without this iteration we can never properly check for prompts; when there is nothing
+        # to read we wait on the socket instead of spinning
+        self._session_set_blocking(False)
+        try:
+            while not channel_match:
+                output_chunk = self._channel_read(receive_buffer)
+                channel_log.debug(f"Read: {repr(output_chunk)}")
+                channel_match = prompt_matcher.feed(output_chunk)
+        finally:
+            self._session_set_blocking(True)
+        channel_log.debug(f"Prompt found at offset {prompt_matcher.start}")
+        self._update_current_prompt(prompt_matcher, verify=bool(prompt))
+        return receive_buffer.buffer
+
+    def _read_until_prompt_stream(
+        self, strip_prompt: bool, deadline: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Read the channel until the prompt is seen, yielding complete lines as they are read
+
+        Only the current partial line is kept in memory; every complete line is normalized and
+        yielded as soon as it has been read. The last non blank line is held until more output or
+        the prompt is seen so that the prompt can be stripped.
 
-    @operation_timeout("comms_operation_timeout")
+        Args:
+            strip_prompt: bool True/False whether to strip prompt or not
+            deadline: time.monotonic() deadline of the read; None for no deadline
+
+        Yields:
+            output: string of one or more complete lines, each line terminated with a newline
+
+        Raises:
+            N/A  # noqa
+
+        """
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
+        prompt_matcher = PromptMatcher(self._prompt_pattern())
+        output_normalizer = OutputNormalizer()
+        channel_match = False
+
+        self._session_set_blocking(False)
+        try:
+            while not channel_match:
+                output_chunk = self._channel_read(receive_buffer, deadline=deadline)
+                receive_buffer.clear()
+                channel_log.debug(f"Read: {repr(output_chunk)}")
+                channel_match = prompt_matcher.feed(output_chunk)
+                lines = output_normalizer.feed(output_chunk)
+                if lines:
+                    yield "\n".join(lines) + "\n"
+        finally:
+            self._session_set_blocking(True)
+
+        channel_log.debug(f"Prompt found at offset {prompt_matcher.start}")
+        self._update_current_prompt(prompt_matcher)
+        lines = output_normalizer.finish(strip_prompt=strip_prompt)
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @operation_deadline("comms_operation_timeout")
     def _send_input(self, channel_input: str, strip_prompt: bool):
         """
         Send input to device and return results
@@ -188,18 +445,22 @@ class SSH2NetChannel:
 
         """
         self._acquire_session_lock()
-        session_log.debug(
-            f"Attempting to send input: {channel_input}; strip_prompt: {strip_prompt}"
-        )
-        self.channel.flush()
-        self.channel.write(channel_input)
-        channel_log.debug(f"Write: {repr(channel_input)}")
-        self._read_until_input(channel_input)
-        output = self._read_until_prompt()
-        self.session_lock.release_lock()
-        return self._restructure_output(output, strip_prompt=strip_prompt)
-
-    @operation_timeout("comms_operation_timeout")
+        self._current_prompt = None
+        try:
+            session_log.debug(
+                f"Attempting to send input: {channel_input}; strip_prompt: {strip_prompt}"
+            )
+            self._channel_flush()
+            self._channel_write(channel_input)
+            channel_log.debug(f"Write: {repr(channel_input)}")
+            self._read_until_input(channel_input)
+            output = self._read_until_prompt()
+        finally:
+            # an operation timing out must not leave the session locked
+            self.session_lock.release_lock()
+        return self._normalize_output(output, strip_prompt=strip_prompt)
+
+    @operation_deadline("comms_operation_timeout")
     def _send_input_interact(
         self,
         channel_input: str,
@@ -226,30 +487,229 @@ class SSH2NetChannel:
 
         """
         self._acquire_session_lock()
-        session_log.debug(
-            f"Attempting to send input interact: {channel_input}; "
-            f"expecting: {expectation}; responding: {response}; "
-            f"with a finale: {finale}; hidden_response: {hidden_response}"
+        self._current_prompt = None
+        try:
+            session_log.debug(
+                f"Attempting to send input interact: {channel_input}; "
+                f"expecting: {expectation}; responding: {response}; "
+                f"with a finale: {finale}; hidden_response: {hidden_response}"
+            )
+            self._channel_flush()
+            self._channel_write(channel_input)
+            channel_log.debug(f"Write: {repr(channel_input)}")
+            self._read_until_input(channel_input)
+            output = self._read_until_prompt(prompt=expectation)
+            # if response is simply a return; add that so it shows in output
+            # likewise if response is "hidden" (i.e. password input), add return
+            # otherwise, skip
+            if not response:
+                output += self.comms_return_char.encode()
+            elif hidden_response is True:
+                output += self.comms_return_char.encode()
+            self._channel_write(response)
+            channel_log.debug(f"Write: {repr(response)}")
+            self._channel_write(self.comms_return_char)
+            channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
+            output += self._read_until_prompt(prompt=finale)
+        finally:
+            self.session_lock.release_lock()
+        return self._normalize_output(output)
+
+    def _send_input_stream(self, channel_input: str, strip_prompt: bool) -> Iterator[str]:
+        """
+        Send input to device and yield results as they are read
+
+        `comms_operation_timeout` applies from the first read until the prompt is seen, including
+        any time the generator spends suspended.
+
+        Args:
+            channel_input: string input to write to channel
+            strip_prompt: bool True/False for whether or not to strip prompt
+
+        Yields:
+            output: string of one or more complete lines of cleaned channel data
+
+        Raises:
+            N/A  # noqa
+
+        """
+        deadline = None
+        if self.comms_operation_timeout:
+            deadline = time.monotonic() + self.comms_operation_timeout
+        remaining = check_operation_deadline()
+        if remaining is not None:
+            deadline = min(deadline or float("inf"), time.monotonic() + remaining)
+        self._acquire_session_lock()
+        self._current_prompt = None
+        try:
+            session_log.debug(
+                f"Attempting to stream input: {channel_input}; strip_prompt: {strip_prompt}"
+            )
+            self._channel_flush()
+            self._channel_write(channel_input)
+            channel_log.debug(f"Write: {repr(channel_input)}")
+            self._read_until_input(channel_input)
+            yield from self._read_until_prompt_stream(strip_prompt, deadline)
+        finally:
+            self.session_lock.release_lock()
+
+    @operation_deadline("comms_operation_timeout")
+    def _send_inputs_pipeline(self, inputs: List[str], strip_prompt: bool) -> List[str]:
+        """
+        Send all inputs to device back to back and split the returned output per input
+
+        Rather than waiting for each input to be echoed and for the prompt to return before
+        sending the next input, all inputs are written at once. The output is then split on the
+        echo of each input; other than for the first input, an echo is only accepted if it is
+        preceded by a prompt on the same line, so an input string appearing in the output of a
+        previous input is not mistaken for the echo. Reading stops once every input has been
+        echoed and the final prompt is seen.
+
+        Args:
+            inputs: list of strings of inputs to write to channel
+            strip_prompt: bool True/False for whether or not to strip prompt
+
+        Returns:
+            results: list of strings of cleaned channel data, one per input
+
+        Raises:
+            N/A  # noqa
+
+        """
+        session_log.debug(f"Attempting to send pipelined inputs: {inputs}")
+        prompt_matcher = PromptMatcher(self._prompt_pattern())
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
+        channel_inputs = [channel_input.encode() for channel_input in inputs]
+        echoes = []
+        search_start = 0
+        channel_match = False
+        pipeline_input = "".join(
+            f"{channel_input}{self.comms_return_char}" for channel_input in inputs
         )
-        self.channel.flush()
-        self.channel.write(channel_input)
-        channel_log.debug(f"Write: {repr(channel_input)}")
-        self._read_until_input(channel_input)
-        output = self._read_until_prompt(prompt=expectation)
-        # if response is simply a return; add that so it shows in output
-        # likewise if response is "hidden" (i.e. password input), add return
-        # otherwise, skip
-        if not response:
-            output += self.comms_return_char
-        elif hidden_response is True:
-            output += self.comms_return_char
-        self.channel.write(response)
-        channel_log.debug(f"Write: {repr(response)}")
-        self.channel.write(self.comms_return_char)
-        channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
-        output += self._read_until_prompt(prompt=finale)
-        self.session_lock.release_lock()
-        return self._restructure_output(output)
+
+        self._acquire_session_lock()
+        self._current_prompt = None
+        try:
+            self._channel_flush()
+            self._channel_write(pipeline_input)
+            channel_log.debug(f"Write: {repr(pipeline_input)}")
+            self._session_set_blocking(False)
+            while not channel_match:
+                output_chunk = self._channel_read(receive_buffer)
+                channel_log.debug(f"Read: {repr(output_chunk)}")
+                if len(echoes) == len(channel_inputs):
+                    channel_match = prompt_matcher.feed(output_chunk)
+                    continue
+                while len(echoes) < len(channel_inputs):
+                    echo = channel_inputs[len(echoes)]
+                    echo_start = receive_buffer.find(echo, search_start)
+                    if echo_start == -1:
+                        search_start = max(search_start, len(receive_buffer) - len(echo) + 1)
+                        break
+                    line_start = (
+                        max(
+                            receive_buffer.buffer.rfind(b"\n", 0, echo_start),
+                            receive_buffer.buffer.rfind(b"\r", 0, echo_start),
+                        )
+                        + 1
+                    )
+                    search_start = echo_start + len(echo)
+                    # the prompt preceding the first input was read by the previous operation
+                    echo_prompt = receive_buffer.buffer[line_start:echo_start].strip()
+                    if not echoes or prompt_matcher.pattern.fullmatch(echo_prompt):
+                        echoes.append((echo_start, search_start))
+                if len(echoes) == len(channel_inputs):
+                    channel_match = prompt_matcher.feed(receive_buffer.view(search_start))
+        finally:
+            self._session_set_blocking(True)
+            self.session_lock.release_lock()
+        self._update_current_prompt(prompt_matcher)
+
+        output_end = search_start + prompt_matcher.end
+        results = []
+        for echo_index, (_, output_start) in enumerate(echoes):
+            if echo_index + 1 < len(echoes):
+                output = receive_buffer.buffer[output_start : echoes[echo_index + 1][0]]
+            else:
+                output = receive_buffer.buffer[output_start:output_end]
+            results.append(self._normalize_output(output, strip_prompt=strip_prompt))
+        return results
+
+    @operation_deadline("comms_operation_timeout")
+    def _send_inputs_bulk(self, inputs: List[str], strip_prompt: bool, window: int) -> str:
+        """
+        Stream inputs to device as one block and wait for the prompt once at the end
+
+        Input is written ahead of the device in chunks; at most `window` characters that have not
+        been echoed yet are outstanding at any time (but always at least the next complete
+        input), so the input buffer of the device is never overrun. Echoes are tracked in order
+        as output arrives; once the last input has been echoed, the prompt following it ends the
+        read.
+
+        Args:
+            inputs: list of strings of inputs to write to channel
+            strip_prompt: bool True/False for whether or not to strip prompt
+            window: max number of characters written ahead of the echoed input
+
+        Returns:
+            output: string of cleaned channel data of the whole block, including the echoes
+
+        Raises:
+            N/A  # noqa
+
+        """
+        session_log.debug(f"Attempting to send {len(inputs)} inputs in bulk")
+        prompt_matcher = PromptMatcher(self._prompt_pattern())
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
+        echoes = [channel_input.encode() for channel_input in inputs]
+        bulk_input = ""
+        # offset in bulk_input after each input (and its return character)
+        input_ends = []
+        for channel_input in inputs:
+            bulk_input += f"{channel_input}{self.comms_return_char}"
+            input_ends.append(len(bulk_input))
+        written = 0
+        echoed = 0
+        search_start = 0
+        channel_match = False
+
+        self._acquire_session_lock()
+        self._current_prompt = None
+        try:
+            self._channel_flush()
+            self._session_set_blocking(False)
+            while not channel_match:
+                if written < len(bulk_input):
+                    acknowledged = input_ends[echoed - 1] if echoed else 0
+                    next_input_end = input_ends[min(echoed, len(input_ends) - 1)]
+                    write_end = min(len(bulk_input), max(acknowledged + window, next_input_end))
+                    if write_end > written:
+                        self._channel_write(bulk_input[written:write_end])
+                        channel_log.debug(f"Write: {repr(bulk_input[written:write_end])}")
+                        written = write_end
+                output_chunk = self._channel_read(receive_buffer)
+                channel_log.debug(f"Read: {repr(output_chunk)}")
+                if echoed == len(echoes):
+                    channel_match = prompt_matcher.feed(output_chunk)
+                    continue
+                while echoed < len(echoes):
+                    echo_start = receive_buffer.find(echoes[echoed], search_start)
+                    if echo_start == -1:
+                        search_start = max(
+                            search_start, len(receive_buffer) - len(echoes[echoed]) + 1
+                        )
+                        break
+                    search_start = echo_start + len(echoes[echoed])
+                    echoed += 1
+                if echoed == len(echoes):
+                    channel_match = prompt_matcher.feed(receive_buffer.view(search_start))
+        finally:
+            self._session_set_blocking(True)
+            self.session_lock.release_lock()
+        self._update_current_prompt(prompt_matcher)
+
+        output = receive_buffer.buffer[: search_start + prompt_matcher.end]
+        return self._normalize_output(output, strip_prompt=strip_prompt)
 
     def open_and_execute(self, command: str):
         """
@@ -273,22 +733,92 @@ class SSH2NetChannel:
         if self._shell:
             self._channel_close()
         self._channel_open()
-        output = b""
+        receive_buffer = ReceiveBuffer(self.comms_read_size)
         channel_buff = 1
         session_log.debug(f"Channel open, executing command: {command}")
         self.channel.execute(command)
         while channel_buff > 0:
             try:
-                channel_buff, data = self.channel.read()
-                output += data
+                channel_buff, data = self.channel.read(receive_buffer.read_size)
+                receive_buffer.extend(data)
             except SocketRecvError:
                 break
-        output = self._rstrip_all_lines(output)
-        result = self._restructure_output(output)
+        result = self._normalize_output(receive_buffer.buffer)
         self.close()
         session_log.info(f"Command executed, channel closed")
         return result
 
+    @operation_deadline("comms_operation_timeout")
+    def execute_commands(self, commands, max_channels: Optional[int] = 5) -> List[str]:
+        """
+        Execute commands on concurrent exec channels of a single (kept open) ssh session
+
+        Unlike `open_and_execute`, the session is not torn down after the command(s) run, so
+        subsequent calls do not need to reconnect, handshake or authenticate again. Up to
+        `max_channels` exec channels are open at any one time and their output is read as it
+        arrives; an open shell channel (if any) is left untouched. `comms_operation_timeout`
+        applies to the batch as a whole.
+
+        Args:
+            commands: string or list of strings of commands to execute
+            max_channels: max number of exec channels to have open at once; ssh servers limit the
+                number of channels per session (openssh defaults to 10)
+
+        Returns:
+            results: list of output from each command, in the order commands were provided
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if isinstance(commands, str):
+            commands = [commands]
+        if not self._session_alive():
+            self._session_open()
+        self._acquire_session_lock()
+        session_log.info(f"Attempting to execute {len(commands)} command(s) on exec channels")
+        results = [""] * len(commands)
+        pending = list(enumerate(commands))
+        active = {}
+        finished = []
+        if not self.setup_use_paramiko:
+            self._session_set_blocking(False)
+        try:
+            while pending or active:
+                check_operation_deadline()
+                while pending and len(active) < max_channels:
+                    command_index, command = pending.pop(0)
+                    channel = self._channel_open_exec(command)
+                    active[command_index] = (channel, ReceiveBuffer(self.comms_read_size))
+                progress = False
+                for command_index, (channel, receive_buffer) in list(active.items()):
+                    while True:
+                        with self.session_io_lock:
+                            output = self._channel_read_exec(channel, receive_buffer.read_size)
+                        if output is None:
+                            break
+                        if not output:
+                            results[command_index] = self._normalize_output(receive_buffer.buffer)
+                            finished.append(active.pop(command_index)[0])
+                            progress = True
+                            break
+                        receive_buffer.extend(output)
+                        progress = True
+                if active and not progress:
+                    self._channel_wait_exec(
+                        [channel for channel, _ in active.values()],
+                        self.session_timeout / 1000 or None,
+                    )
+        finally:
+            if not self.setup_use_paramiko:
+                self._session_set_blocking(True)
+            for channel in finished + [channel for channel, _ in active.values()]:
+                with self.session_io_lock:
+                    channel.close()
+            self.session_lock.release_lock()
+        session_log.info(f"Executed {len(commands)} command(s), exec channels closed")
+        return results
+
     def open_shell(self) -> None:
         """
         Open and prepare interactive SSH shell
@@ -304,10 +834,28 @@ class SSH2NetChannel:
 
         """
         session_log.info(f"Attempting to open interactive shell")
+        self._current_prompt = None
         # open the channel itself
         self._channel_open()
         # invoke a shell on the channel
         self._channel_invoke_shell()
+        self._shell_prepare()
+        session_log.info("Interactive shell opened")
+
+    def _shell_prepare(self) -> None:
+        """
+        Prepare a freshly invoked shell; handle pre-login, disable paging and start keepalives
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
         # pre-login handling if needed for things like wlc
         if self.comms_pre_login_handler:
             self.comms_pre_login_handler(self)
@@ -318,47 +866,167 @@ class SSH2NetChannel:
             else:
                 self.send_inputs(self.comms_disable_paging)
         self._session_keepalive()
-        session_log.info("Interactive shell opened")
+
+    def open_shell_channel(self):
+        """
+        Open an additional interactive shell channel on this connection's ssh session
+
+        The returned object is a copy of this connection with its own shell channel, prompt state
+        and session lock, but sharing the socket and the authenticated session -- commands sent on
+        different shell channels can run concurrently (from different threads) without logging in
+        to the device again. See `SSH2NetShellGroup` to dispatch inputs across shell channels.
+
+        Once a shell channel has been opened the session is shared: it is left in non-blocking
+        mode and all libssh2 calls are serialized with a session wide i/o lock. Closing a shell
+        channel only closes that channel; closing this connection closes the session and with it
+        all of its shell channels.
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            shell: SSH2Net object for the new shell channel
+
+        Raises:
+            N/A  # noqa
+
+        """
+        session_log.info(f"Attempting to open additional interactive shell")
+        if not self._session_alive():
+            self._session_open()
+        shell = copy.copy(self)
+        shell.channel = None
+        shell._shell = False
+        shell._session_owner = False
+        shell._ansi_stripper = None
+        shell._socket_selector = None
+        shell._current_prompt = None
+        shell.session_lock = SessionLock()
+        # driver methods are bound to the object they were created for, rebind them to the copy
+        shell._session_bind_driver()
+        with self.session_io_lock:
+            if not self.setup_use_paramiko:
+                self.session.set_blocking(True)
+            try:
+                shell._channel_open_driver()
+                shell._channel_invoke_shell()
+            finally:
+                if not self.setup_use_paramiko:
+                    self.session.set_blocking(False)
+                self._session_shared = shell._session_shared = True
+        shell._shell_prepare()
+        session_log.info("Additional interactive shell opened")
+        return shell
 
     @channel_timeout(Timeout)
-    def get_prompt(self) -> bool:
+    def get_prompt(self, read_state: ReadState = None) -> str:
         """
         Read from shell and get the current shell prompt
 
+        The output is searched incrementally (see `PromptMatcher`), so a prompt split across
+        reads is still found. Every attempt sends a return character and starts a new search.
+
         Args:
+            read_state: ReadState of this read operation; provided by `channel_timeout`
+
+        Returns:
+            str: current prompt
+
+        Raises:
             N/A  # noqa
 
+        """
+        receive_buffer = read_state.receive_buffer
+        prompt_matcher = PromptMatcher(self._prompt_pattern())
+        read_state.prompt_matcher = prompt_matcher
+        self.session.set_timeout(1000)
+        try:
+            self._channel_flush()
+            self._channel_write(self.comms_return_char)
+            channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
+            while not prompt_matcher.feed(self._channel_read(receive_buffer, timeout=1)):
+                pass
+        finally:
+            self.session.set_timeout(self.session_timeout)
+        self._update_current_prompt(prompt_matcher)
+        return prompt_matcher.prompt
+
+    @operation_deadline("comms_operation_timeout")
+    def _send_input_sink(self, channel_input: str, strip_prompt: bool, sink: BinaryIO) -> int:
+        """
+        Send input to device writing results to a sink as they are read
+
+        Args:
+            channel_input: string input to write to channel
+            strip_prompt: strip prompt or not
+            sink: binary file-like object to write output to
+
         Returns:
+            written: number of bytes written to the sink
+
+        Raises:
             N/A  # noqa
 
+        """
+        written = 0
+        for output in self._send_input_stream(channel_input, strip_prompt):
+            output = output.encode()
+            sink.write(output)
+            written += len(output)
+        return written
+
+    def _send_inputs_sink(
+        self, inputs: List[str], strip_prompt: bool, sink: Union[str, os.PathLike, BinaryIO]
+    ) -> List[int]:
+        """
+        Send inputs to device writing results to a sink as they are read
+
+        Args:
+            inputs: list of strings of inputs to send to channel
+            strip_prompt: strip prompt or not
+            sink: path to a file to (over)write, or binary file-like object to write output to
+
+        Returns:
+            result: list of number of bytes written to the sink for each input
+
         Raises:
             N/A  # noqa
 
         """
-        pattern = re.compile(self.comms_prompt_regex, flags=re.M | re.I)
-        self.session.set_timeout(1000)
-        self.channel.flush()
-        self.channel.write(self.comms_return_char)
-        channel_log.debug(f"Write (sending return character): {repr(self.comms_return_char)}")
-        while True:
-            output = self.channel.read()[1].rstrip(b"\\")
-            output = output.decode("unicode_escape").strip()
-            channel_match = re.search(pattern, output)
-            if channel_match:
-                self.session.set_timeout(self.session_timeout)
-                current_prompt = channel_match.group(0)
-                return current_prompt
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, "wb") as sink_file:
+                return self._send_inputs_sink(inputs, strip_prompt, sink_file)
+        results = []
+        for channel_input in inputs:
+            results.append(self._send_input_sink(channel_input, strip_prompt, sink))
+        return results
 
-    def send_inputs(self, inputs, strip_prompt: Optional[bool] = True) -> List[bytes]:
+    def send_inputs(
+        self,
+        inputs,
+        strip_prompt: Optional[bool] = True,
+        sink: Optional[Union[str, os.PathLike, BinaryIO]] = None,
+        pipeline: Optional[bool] = False,
+    ) -> List[bytes]:
         """
         Primary entry point to send data to devices in shell mode; accept inputs and return results
 
         Args:
             inputs: list of strings or string of inputs to send to channel
             strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+            sink: optional path or binary file-like object; if provided output is written to the
+                sink as it is read instead of being buffered and returned. Outputs of multiple
+                inputs are written one after another, each line terminated with a newline
+            pipeline: send all inputs back to back without waiting for the prompt after each input
+                and split the output per input afterwards; saves a round trip per input on high
+                latency links. Only use with devices/inputs that do not prompt for anything and
+                that echo "typed ahead" inputs after the prompt (as network devices typically do).
+                `comms_operation_timeout` applies to the batch as a whole. Ignored if a sink is
+                provided
 
         Returns:
-            result: list of output from the input command(s)
+            result: list of output from the input command(s); if a sink is provided, list of
+                number of bytes written to the sink for each input
 
         Raises:
             N/A  # noqa
@@ -366,12 +1034,77 @@ class SSH2NetChannel:
         """
         if isinstance(inputs, str):
             inputs = [inputs]
+        if sink is not None:
+            return self._send_inputs_sink(inputs, strip_prompt, sink)
+        if pipeline and inputs:
+            return self._send_inputs_pipeline(inputs, strip_prompt)
         results = []
         for channel_input in inputs:
             output = self._send_input(channel_input, strip_prompt)
             results.append(output)
         return results
 
+    def send_inputs_stream(self, inputs, strip_prompt: Optional[bool] = True) -> Iterator[str]:
+        """
+        Send data to devices in shell mode; yield results as they are read from the channel
+
+        Rather than buffering the entire output of each input, complete lines of output are
+        yielded as soon as they are read. Each yielded string contains one or more lines, each
+        terminated by a newline; joining all yielded strings for an input gives the same content
+        `send_inputs` would have returned (plus a trailing newline). If multiple inputs are
+        provided their outputs are yielded one after another.
+
+        The session lock is held while output is being consumed, the generator should be fully
+        consumed (or closed) before sending other inputs.
+
+        Args:
+            inputs: list of strings or string of inputs to send to channel
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+
+        Yields:
+            output: string of one or more complete lines of output
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        for channel_input in inputs:
+            yield from self._send_input_stream(channel_input, strip_prompt)
+
+    def send_inputs_bulk(
+        self, inputs, strip_prompt: Optional[bool] = True, window: Optional[int] = BULK_WINDOW
+    ) -> str:
+        """
+        Send a block of inputs to device without waiting for the prompt after each input
+
+        Meant for large blocks of input such as configuration; rather than two round trips per
+        input (echo and prompt) the whole block is streamed to the device, flow controlled by
+        the echoes of the device, and the prompt is only waited for once, after the last input.
+        Only use with devices/inputs that do not prompt for anything. `comms_operation_timeout`
+        applies to the block as a whole.
+
+        Args:
+            inputs: list of strings or (multi line) string of inputs to send to channel; empty
+                lines are skipped
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+            window: max number of characters written ahead of what the device has echoed
+
+        Returns:
+            result: string of output of the whole block, including the echoed inputs
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if isinstance(inputs, str):
+            inputs = inputs.splitlines()
+        inputs = [channel_input for channel_input in inputs if channel_input.strip()]
+        if not inputs:
+            return ""
+        return self._send_inputs_bulk(inputs, strip_prompt, window)
+
     def send_inputs_interact(self, inputs, hidden_response=False) -> List[Tuple[str, bytes]]:
         """
         Primary entry point to interact with devices in shell mode; used to handle prompts
@@ -2,7 +2,12 @@
 import re
 from typing import Any, Dict
 
-from ssh2net.core.driver import BaseNetworkDriver, PrivilegeLevel
+from ssh2net.core.driver import (
+    AsyncBaseNetworkDriver,
+    ConfigSession,
+    ConfigSessionDriver,
+    PrivilegeLevel,
+)
 
 
 EOS_ARG_MAPPER = {
@@ -45,7 +50,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config\)#$", flags=re.M | re.I),
             "configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -59,7 +64,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config[a-z0-9.\-@/:]{1,16}\)#$", flags=re.M | re.I),
             "special_configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -71,8 +76,18 @@ PRIVS = {
     ),
 }
 
+CONFIG_SESSION = ConfigSession(
+    "privilege_exec",
+    "configure session {name}",
+    "show session-config diffs",
+    "commit",
+    "commit timer {timer}",
+    "configure session {name} commit",
+    ["abort"],
+)
+
 
-class EOSDriver(BaseNetworkDriver):
+class EOSDriver(ConfigSessionDriver):
     def __init__(self, **kwargs: Dict[str, Any]):
         """
         Initialize SSH2Net EOSDriver Object
@@ -90,3 +105,14 @@ class EOSDriver(BaseNetworkDriver):
         self.privs = PRIVS
         self.default_desired_priv = "privilege_exec"
         self.textfsm_platform = "arista_eos"
+        self.config_error_markers = [
+            "% Invalid input",
+            "% Incomplete command",
+            "% Ambiguous command",
+            "% Error",
+        ]
+        self.config_session = CONFIG_SESSION
+
+
+class AsyncEOSDriver(AsyncBaseNetworkDriver, EOSDriver):
+    """asyncio flavor of EOSDriver; see AsyncSSH2Net"""
@@ -2,7 +2,7 @@
 import re
 from typing import Any, Dict
 
-from ssh2net.core.driver import BaseNetworkDriver, PrivilegeLevel
+from ssh2net.core.driver import AsyncBaseNetworkDriver, BaseNetworkDriver, PrivilegeLevel
 
 
 IOSXE_ARG_MAPPER = {
@@ -45,7 +45,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config\)#$", flags=re.M | re.I),
             "configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -59,7 +59,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config[a-z0-9.\-@/:]{1,16}\)#$", flags=re.M | re.I),
             "special_configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -90,3 +90,12 @@ class IOSXEDriver(BaseNetworkDriver):
         self.privs = PRIVS
         self.default_desired_priv = "privilege_exec"
         self.textfsm_platform = "cisco_ios"
+        self.config_error_markers = [
+            "% Invalid input",
+            "% Incomplete command",
+            "% Ambiguous command",
+        ]
+
+
+class AsyncIOSXEDriver(AsyncBaseNetworkDriver, IOSXEDriver):
+    """asyncio flavor of IOSXEDriver; see AsyncSSH2Net"""
@@ -3,7 +3,12 @@ import re
 import time
 from typing import Any, Dict
 
-from ssh2net.core.driver import BaseNetworkDriver, PrivilegeLevel
+from ssh2net.core.driver import (
+    AsyncBaseNetworkDriver,
+    ConfigSession,
+    ConfigSessionDriver,
+    PrivilegeLevel,
+)
 
 
 IOSXR_ARG_MAPPER = {
@@ -32,7 +37,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config\)#$", flags=re.M | re.I),
             "configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -46,7 +51,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config[a-z0-9.\-@/:]{1,16}\)#$", flags=re.M | re.I),
             "special_configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -64,7 +69,18 @@ def comms_pre_login_handler(cls):  # pylint: disable=W0613
     time.sleep(1)
 
 
-class IOSXRDriver(BaseNetworkDriver):
+CONFIG_SESSION = ConfigSession(
+    "configuration",
+    None,
+    "show commit changes diff",
+    "commit",
+    "commit confirmed {seconds}",
+    "commit",
+    ["abort"],
+)
+
+
+class IOSXRDriver(ConfigSessionDriver):
     def __init__(self, **kwargs: Dict[str, Any]):
         """
         Initialize SSH2Net IOSXRDriver Object
@@ -82,3 +98,14 @@ class IOSXRDriver(BaseNetworkDriver):
         self.privs = PRIVS
         self.default_desired_priv = "privilege_exec"
         self.textfsm_platform = "cisco_xr"
+        self.config_error_markers = [
+            "% Invalid input",
+            "% Incomplete command",
+            "% Ambiguous command",
+            "% Failed to commit",
+        ]
+        self.config_session = CONFIG_SESSION
+
+
+class AsyncIOSXRDriver(AsyncBaseNetworkDriver, IOSXRDriver):
+    """asyncio flavor of IOSXRDriver; see AsyncSSH2Net"""
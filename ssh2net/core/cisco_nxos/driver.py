@@ -2,7 +2,12 @@
 import re
 from typing import Any, Dict
 
-from ssh2net.core.driver import BaseNetworkDriver, PrivilegeLevel
+from ssh2net.core.driver import (
+    AsyncBaseNetworkDriver,
+    ConfigSession,
+    ConfigSessionDriver,
+    PrivilegeLevel,
+)
 
 
 NXOS_ARG_MAPPER = {
@@ -45,7 +50,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config\)#$", flags=re.M | re.I),
             "configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -59,7 +64,7 @@ PRIVS = {
         PrivilegeLevel(
             re.compile(r"^[a-z0-9.\-@/:]{1,32}\(config[a-z0-9.\-@/:]{1,16}\)#$", flags=re.M | re.I),
             "special_configuration",
-            "priv",
+            "privilege_exec",
             "end",
             None,
             None,
@@ -71,8 +76,20 @@ PRIVS = {
     ),
 }
 
+# NX-OS has no diff of a config session against the running configuration; the "diff" is the
+# pending contents of the session
+CONFIG_SESSION = ConfigSession(
+    "privilege_exec",
+    "configure session {name}",
+    "show configuration session {name}",
+    "commit",
+    None,
+    None,
+    ["abort"],
+)
+
 
-class NXOSDriver(BaseNetworkDriver):
+class NXOSDriver(ConfigSessionDriver):
     def __init__(self, **kwargs: Dict[str, Any]):
         """
         Initialize SSH2Net NXOSDriver Object
@@ -89,3 +106,16 @@ class NXOSDriver(BaseNetworkDriver):
         super().__init__(**kwargs)
         self.privs = PRIVS
         self.default_desired_priv = "privilege_exec"
+        self.config_error_markers = [
+            "% Invalid command",
+            "% Invalid input",
+            "% Incomplete command",
+            "% Ambiguous command",
+            "Verification Failed",
+            "Failed to commit",
+        ]
+        self.config_session = CONFIG_SESSION
+
+
+class AsyncNXOSDriver(AsyncBaseNetworkDriver, NXOSDriver):
+    """asyncio flavor of NXOSDriver; see AsyncSSH2Net"""
@@ -1,10 +1,13 @@
 """ssh2net.core.driver"""
 import collections
+import math
 import re
-from typing import Any, Dict, Optional, Union
+import time
+from typing import Any, Dict, Iterator, List, Match, Optional, Pattern, Union
 
+from ssh2net.aio import AsyncSSH2Net
 from ssh2net.base import SSH2Net
-from ssh2net.exceptions import UnknownPrivLevel
+from ssh2net.exceptions import ConfigurationFailed, UnknownPrivLevel
 from ssh2net.helper import _textfsm_get_template, textfsm_parse
 
 
@@ -22,9 +25,175 @@ PrivilegeLevel = collections.namedtuple(
     "level",
 )
 
+ConfigSession = collections.namedtuple(
+    "ConfigSession", "priv open diff commit commit_confirmed confirm abort"
+)
+
+PrivilegeTransition = collections.namedtuple(
+    "PrivilegeTransition", "priv command escalate_auth escalate_prompt"
+)
+
 PRIVS = {}
 
 
+class PrivilegeGraph:
+    def __init__(self, privs: Dict[str, PrivilegeLevel]):
+        """
+        Initialize PrivilegeGraph Object
+
+        Privilege levels compiled into a graph; each level is a node, its escalate and deescalate
+        commands are the edges to the levels they lead to. Edges to levels that are not part of
+        `privs` are ignored. Plans are computed once per pair of levels and cached.
+
+        The patterns of all levels are also compiled into a single alternation with a named group
+        per level, so a single search of a prompt tells which privilege level it belongs to.
+
+        Args:
+            privs: dict of privilege level name to PrivilegeLevel
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.privs = privs
+        self.transitions = {name: [] for name in privs}
+        for name, priv_level in privs.items():
+            if priv_level.escalate and priv_level.escalate_priv in privs:
+                self.transitions[name].append(
+                    PrivilegeTransition(
+                        priv_level.escalate_priv,
+                        priv_level.escalate,
+                        priv_level.escalate_auth,
+                        priv_level.escalate_prompt,
+                    )
+                )
+            if priv_level.deescalate and priv_level.deescalate_priv in privs:
+                self.transitions[name].append(
+                    PrivilegeTransition(
+                        priv_level.deescalate_priv, priv_level.deescalate, False, None
+                    )
+                )
+        self._plans = {}
+        # named group -> privilege level name; level names are not necessarily valid group names
+        self._groups = {f"priv{index}": name for index, name in enumerate(privs)}
+        self._alternation = "|".join(
+            f"(?P<{group}>{getattr(privs[name].pattern, 'pattern', privs[name].pattern)})"
+            for group, name in self._groups.items()
+        )
+        self.pattern = re.compile(self._alternation or "(?!)", flags=re.M | re.I)
+        # comms_prompt_regex -> compiled prompt pattern
+        self._prompt_patterns = {}
+
+    def prompt_pattern(self, comms_prompt_regex: str) -> Pattern:
+        """
+        Return a pattern matching any prompt and telling the privilege level of it in one search
+
+        Only `comms_prompt_regex` decides what is a prompt, so the pattern matches exactly what
+        `comms_prompt_regex` matches. The privilege level patterns sit in an (optional) lookahead
+        at the same position, so the named group that matched tells the privilege level, if any.
+
+        Args:
+            comms_prompt_regex: regex matching any prompt of the device
+
+        Returns:
+            Pattern: compiled pattern of comms_prompt_regex and the privilege level lookahead
+
+        Raises:
+            N/A  # noqa
+
+        """
+        pattern = self._prompt_patterns.get(comms_prompt_regex)
+        if pattern is None:
+            lookahead = f"(?:(?={self._alternation})|)" if self._alternation else ""
+            pattern = self._prompt_patterns[comms_prompt_regex] = re.compile(
+                f"{lookahead}(?:{comms_prompt_regex})", flags=re.M | re.I
+            )
+        return pattern
+
+    def match_priv(self, prompt_match: Optional[Match]) -> Optional[PrivilegeLevel]:
+        """
+        Return the privilege level of a prompt matched with `pattern` or `prompt_pattern`
+
+        Args:
+            prompt_match: regex match of the prompt; None if there was no match
+
+        Returns:
+            PrivilegeLevel: privilege level of the prompt; None if the prompt does not belong to
+                any privilege level
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if prompt_match is None:
+            return None
+        for group, value in prompt_match.groupdict().items():
+            if value is not None and group in self._groups:
+                return self.privs[self._groups[group]]
+        return None
+
+    def plan(self, current_priv: str, desired_priv: str) -> List[PrivilegeTransition]:
+        """
+        Compute the shortest sequence of transitions from one privilege level to another
+
+        Args:
+            current_priv: name of the current privilege level
+            desired_priv: name of the desired privilege level
+
+        Returns:
+            list: PrivilegeTransitions to send in order; empty if already at the desired level
+
+        Raises:
+            UnknownPrivLevel: if the desired privilege level cannot be reached  # noqa
+
+        """
+        plan = self._plans.get((current_priv, desired_priv))
+        if plan is not None:
+            return plan
+        # breadth first search; every transition costs one command
+        paths = {current_priv: []}
+        queue = collections.deque([current_priv])
+        while queue and desired_priv not in paths:
+            priv = queue.popleft()
+            for transition in self.transitions[priv]:
+                if transition.priv not in paths:
+                    paths[transition.priv] = paths[priv] + [transition]
+                    queue.append(transition.priv)
+        if desired_priv not in paths:
+            raise UnknownPrivLevel(
+                f"Privilege level {desired_priv} cannot be reached from {current_priv}"
+            )
+        self._plans[(current_priv, desired_priv)] = paths[desired_priv]
+        return paths[desired_priv]
+
+
+# id of privs dict -> (privs dict, PrivilegeGraph)
+_PRIVILEGE_GRAPHS = {}
+
+
+def privilege_graph(privs: Dict[str, PrivilegeLevel]) -> PrivilegeGraph:
+    """
+    Return the (cached) PrivilegeGraph of a privs dict
+
+    Args:
+        privs: dict of privilege level name to PrivilegeLevel
+
+    Returns:
+        PrivilegeGraph: graph of the privilege levels
+
+    Raises:
+        N/A  # noqa
+
+    """
+    cached = _PRIVILEGE_GRAPHS.get(id(privs))
+    if cached is None or cached[0] is not privs:
+        cached = _PRIVILEGE_GRAPHS[id(privs)] = (privs, PrivilegeGraph(privs))
+    return cached[1]
+
+
 class BaseNetworkDriver(SSH2Net):
     def __init__(self, auth_secondary: Optional[Union[str]] = None, **kwargs: Dict[str, Any]):
         """
@@ -44,6 +213,8 @@ class BaseNetworkDriver(SSH2Net):
         self.privs = PRIVS
         self.default_desired_priv = None
         self.textfsm_platform = None
+        # strings in configuration output indicating a configuration line was rejected
+        self.config_error_markers = []
 
     def _determine_current_priv(self, current_prompt: str):
         """
@@ -60,47 +231,70 @@ class BaseNetworkDriver(SSH2Net):
             # darglint raises DAR401 for some reason hence the noqa...
 
         """
-        for priv_level in self.privs.values():
-            if re.search(priv_level.pattern, current_prompt):
-                return priv_level
-        raise UnknownPrivLevel
+        graph = privilege_graph(self.privs)
+        priv_level = graph.match_priv(graph.pattern.search(current_prompt))
+        if priv_level is None:
+            raise UnknownPrivLevel
+        return priv_level
 
-    def _escalate(self) -> None:
+    def _prompt_pattern(self) -> Pattern:
         """
-        Escalate to the next privilege level up
+        Return the compiled regex prompts are matched with
+
+        Matches any prompt and, through the named group that matched, tells the privilege level
+        of the prompt; see PrivilegeGraph.prompt_pattern
 
         Args:
             N/A  # noqa
 
         Returns:
-            N/A  # noqa
+            Pattern: compiled prompt pattern
 
         Raises:
             N/A  # noqa
 
         """
-        current_priv = self._determine_current_priv(self.get_prompt())
-        if current_priv.escalate:
-            if current_priv.escalate_auth:
-                self.send_inputs_interact(
-                    (
-                        current_priv.escalate,
-                        current_priv.escalate_prompt,
-                        self.auth_enable,
-                        self.privs.get("escalate_priv"),
-                    ),
-                    hidden_response=True,
-                )
-            else:
-                self.send_inputs(current_priv.escalate)
+        return privilege_graph(self.privs).prompt_pattern(self.comms_prompt_regex)
 
-    def _deescalate(self) -> None:
+    def _current_priv(self):
         """
-        Deescalate to the next privilege level down
+        Return the current privilege level
+
+        The privilege level is determined from the prompt the previous operation ended at; the
+        device is only probed with `get_prompt` if that prompt is unknown (i.e. nothing has been
+        sent yet or the previous operation failed) or does not map to a privilege level.
 
         Args:
             N/A  # noqa
 
+        Returns:
+            priv_level: NamedTuple of current privilege level
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._current_prompt:
+            # the prompt was matched with `_prompt_pattern`, the match already tells the level
+            priv_level = privilege_graph(self.privs).match_priv(self._current_prompt_match)
+            if priv_level is not None:
+                return priv_level
+            try:
+                return self._determine_current_priv(self._current_prompt)
+            except UnknownPrivLevel:
+                pass
+        return self._determine_current_priv(self.get_prompt())
+
+    def _send_priv_transitions(self, transitions: List[PrivilegeTransition]) -> None:
+        """
+        Send the commands of a privilege level plan
+
+        Consecutive commands not requiring authentication are sent as a single pipelined batch,
+        so only the prompt after the last command is waited for.
+
+        Args:
+            transitions: PrivilegeTransitions to send in order
+
         Returns:
             N/A  # noqa
 
@@ -108,14 +302,34 @@ class BaseNetworkDriver(SSH2Net):
             N/A  # noqa
 
         """
-        current_priv = self._determine_current_priv(self.get_prompt())
-        if current_priv.deescalate:
-            self.send_inputs(current_priv.deescalate)
+        batch = []
+        for transition in transitions:
+            if not transition.escalate_auth:
+                batch.append(transition.command)
+                continue
+            if batch:
+                self.send_inputs(batch, pipeline=len(batch) > 1)
+                batch = []
+            self.send_inputs_interact(
+                (
+                    transition.command,
+                    transition.escalate_prompt,
+                    self.auth_secondary,
+                    self.comms_prompt_regex,
+                ),
+                hidden_response=True,
+            )
+        if batch:
+            self.send_inputs(batch, pipeline=len(batch) > 1)
 
     def attain_priv(self, desired_priv) -> None:
         """
         Attain desired priv level
 
+        The shortest sequence of commands to the desired level is planned on the privilege graph
+        and sent at once; the prompt the last command ends at confirms the level was reached,
+        otherwise planning starts over from the level actually reached.
+
         Args:
             desired_priv: string name of desired privilege level
                 (see ssh2net.core.<device_type>.driver for levels)
@@ -127,21 +341,20 @@ class BaseNetworkDriver(SSH2Net):
             N/A  # noqa
 
         """
+        graph = privilege_graph(self.privs)
         while True:
-            current_priv = self._determine_current_priv(self.get_prompt())
+            current_priv = self._current_priv()
             if current_priv == self.privs[desired_priv]:
                 return
-            if current_priv.level > self.privs[desired_priv].level:
-                self._deescalate()
-            else:
-                self._escalate()
+            self._send_priv_transitions(graph.plan(current_priv.name, desired_priv))
 
-    def send_command(self, commands):
+    def send_command(self, commands, sink=None):
         """
         Send command(s)
 
         Args:
             commands: string or list of strings to send to device in privilege exec mode
+            sink: optional path or binary file-like object to write output to as it is read
 
         Returns:
             N/A  # noqa
@@ -150,25 +363,77 @@ class BaseNetworkDriver(SSH2Net):
             N/A  # noqa
         """
         self.attain_priv(self.default_desired_priv)
-        result = self.send_inputs(commands)
+        result = self.send_inputs(commands, sink=sink)
         return result
 
-    def send_config_set(self, configs):
+    def send_command_stream(self, commands) -> Iterator[str]:
         """
-        Send configuration(s)
+        Send command(s) and yield output as it is read from the device
 
         Args:
-            configs: string or list of strings to send to device in config mode
+            commands: string or list of strings to send to device in privilege exec mode
 
-        Returns:
+        Yields:
+            output: string of one or more complete lines of output
+
+        Raises:
             N/A  # noqa
+        """
+        self.attain_priv(self.default_desired_priv)
+        yield from self.send_inputs_stream(commands)
+
+    def _config_errors(self, output: str) -> List[str]:
+        """
+        Return the lines of configuration output containing any of the platform's error markers
+
+        Args:
+            output: output of configuration lines
+
+        Returns:
+            list: lines of output indicating errors
 
         Raises:
             N/A  # noqa
         """
+        return [
+            line
+            for line in output.splitlines()
+            if any(marker in line for marker in self.config_error_markers)
+        ]
+
+    def send_config_set(self, configs, bulk: Optional[bool] = False):
+        """
+        Send configuration(s)
+
+        In bulk mode the configuration is streamed to the device as one block (see
+        `send_inputs_bulk`) instead of waiting for the prompt after every line, and the output is
+        checked once for the platform's error markers at the end.
+
+        Args:
+            configs: string or list of strings to send to device in config mode; in bulk mode a
+                multi line string is split into lines
+            bulk: True/False send configuration as one block
+
+        Returns:
+            result: list of output from the configuration(s); in bulk mode a list holding the
+                output of the whole block
+
+        Raises:
+            ConfigurationFailed: in bulk mode, if the output contains any of the platform's error
+                markers
+        """
         self.attain_priv("configuration")
-        result = self.send_inputs(configs)
+        if bulk:
+            result = [self.send_inputs_bulk(configs)]
+        else:
+            result = self.send_inputs(configs)
         self.attain_priv(self.default_desired_priv)
+        if bulk:
+            config_errors = self._config_errors(result[0])
+            if config_errors:
+                raise ConfigurationFailed(
+                    f"Configuration rejected by {self.host}: {'; '.join(config_errors)}"
+                )
         return result
 
     def textfsm_parse_output(self, command: str, output: str) -> str:
@@ -189,3 +454,324 @@ class BaseNetworkDriver(SSH2Net):
         if template:
             output = textfsm_parse(template, output)
         return output
+
+
+class ConfigSessionDriver(BaseNetworkDriver):
+    def __init__(self, **kwargs: Dict[str, Any]):
+        """
+        Initialize SSH2Net ConfigSessionDriver Object
+
+        Base of platform drivers supporting candidate configurations and commits; platform drivers
+        set `config_session` to the ConfigSession describing their commit workflow.
+
+        Args:
+            **kwargs: keyword args to pass to inherited class(es)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+        """
+        super().__init__(**kwargs)
+        self.config_session = None
+        self._config_session_name = None
+
+    def _config_session_command(self, command: str, confirmed: Optional[int] = None) -> str:
+        """
+        Fill in the session name and confirm timeout of a ConfigSession command
+
+        Args:
+            command: ConfigSession command; may contain {name}, {seconds}, {minutes} and {timer}
+            confirmed: seconds to wait for the commit to be confirmed, if any
+
+        Returns:
+            str: command to send
+
+        Raises:
+            N/A  # noqa
+        """
+        confirmed = confirmed or 0
+        return command.format(
+            name=self._config_session_name,
+            seconds=confirmed,
+            minutes=max(1, math.ceil(confirmed / 60)),
+            timer=time.strftime("%H:%M:%S", time.gmtime(confirmed)),
+        )
+
+    def _abort_config_session(self) -> None:
+        """
+        Discard the candidate configuration and leave the config session
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+        """
+        self.send_inputs(
+            [self._config_session_command(command) for command in self.config_session.abort]
+        )
+        self.attain_priv(self.default_desired_priv)
+
+    def send_config_commit(
+        self,
+        configs,
+        confirmed: Optional[int] = None,
+        dry_run: Optional[bool] = False,
+        session_name: Optional[str] = None,
+    ) -> str:
+        """
+        Load configuration(s) into a candidate configuration and apply them with a single commit
+
+        The whole candidate is loaded in one go (see `send_inputs_bulk`) into a config session
+        (EOS, NX-OS) or the candidate configuration (IOS-XR, Junos). The candidate is only
+        committed if no line was rejected, so a failing line never leaves the device with half
+        of the configuration applied; otherwise, or with `dry_run`, the candidate is discarded.
+
+        Args:
+            configs: string or list of strings of configuration lines
+            confirmed: seconds after which the commit is rolled back unless confirmed with
+                `confirm_commit`; None for a regular commit
+            dry_run: True/False only return the diff and discard the candidate
+            session_name: name of the config session (EOS, NX-OS); generated if not provided
+
+        Returns:
+            diff: string of differences between the running and the candidate configuration; on
+                NX-OS, which can't diff a config session, the pending contents of the session
+
+        Raises:
+            ValueError: if a confirmed commit is requested but not supported by the platform
+            ConfigurationFailed: if a line of the configuration or the commit itself is rejected
+        """
+        if confirmed is not None and not self.config_session.commit_confirmed:
+            raise ValueError(f"{type(self).__name__} does not support confirmed commits")
+        self._config_session_name = session_name or f"ssh2net_{int(time.time())}"
+        self.attain_priv(self.config_session.priv)
+        if self.config_session.open:
+            self.send_inputs(self._config_session_command(self.config_session.open))
+        try:
+            config_errors = self._config_errors(self.send_inputs_bulk(configs))
+            if config_errors:
+                raise ConfigurationFailed(
+                    f"Configuration rejected by {self.host}: {'; '.join(config_errors)}"
+                )
+            diff = self.send_inputs(self._config_session_command(self.config_session.diff))[0]
+        except ConfigurationFailed:
+            self._abort_config_session()
+            raise
+        if dry_run:
+            self._abort_config_session()
+            return diff
+        if confirmed is not None:
+            commit = self._config_session_command(self.config_session.commit_confirmed, confirmed)
+        else:
+            commit = self.config_session.commit
+        config_errors = self._config_errors(self.send_inputs(commit)[0])
+        if config_errors:
+            self._abort_config_session()
+            raise ConfigurationFailed(f"Commit failed on {self.host}: {'; '.join(config_errors)}")
+        self.attain_priv(self.default_desired_priv)
+        return diff
+
+    def confirm_commit(self) -> None:
+        """
+        Confirm the last commit made with `send_config_commit(configs, confirmed=...)`
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if the platform does not support confirmed commits
+        """
+        if not self.config_session.confirm:
+            raise ValueError(f"{type(self).__name__} does not support confirmed commits")
+        self.attain_priv(self.config_session.priv)
+        self.send_inputs(self._config_session_command(self.config_session.confirm))
+        self.attain_priv(self.default_desired_priv)
+
+
+class AsyncBaseNetworkDriver(AsyncSSH2Net, BaseNetworkDriver):
+    """
+    asyncio flavor of BaseNetworkDriver
+
+    Platform drivers get an asyncio flavor by inheriting from this class and the platform
+    driver, i.e. `class AsyncIOSXEDriver(AsyncBaseNetworkDriver, IOSXEDriver)`; privilege levels
+    and other platform settings come from the platform driver, the channel from AsyncSSH2Net.
+    The thread based `send_command_stream`, bulk `send_config_set` and the config session
+    commits are not supported and raise TypeError; use the sync driver for those.
+
+    """
+
+    async def _current_priv(self):
+        """
+        Return the current privilege level; see BaseNetworkDriver._current_priv
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            priv_level: NamedTuple of current privilege level
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._current_prompt:
+            priv_level = privilege_graph(self.privs).match_priv(self._current_prompt_match)
+            if priv_level is not None:
+                return priv_level
+            try:
+                return self._determine_current_priv(self._current_prompt)
+            except UnknownPrivLevel:
+                pass
+        return self._determine_current_priv(await self.get_prompt())
+
+    async def _send_priv_transitions(self, transitions: List[PrivilegeTransition]) -> None:
+        """
+        Send the commands of a privilege level plan
+
+        Args:
+            transitions: PrivilegeTransitions to send in order
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        for transition in transitions:
+            if transition.escalate_auth:
+                await self.send_inputs_interact(
+                    (
+                        transition.command,
+                        transition.escalate_prompt,
+                        self.auth_secondary,
+                        self.comms_prompt_regex,
+                    ),
+                    hidden_response=True,
+                )
+            else:
+                await self.send_inputs(transition.command)
+
+    async def attain_priv(self, desired_priv) -> None:
+        """
+        Attain desired priv level; see BaseNetworkDriver.attain_priv
+
+        Args:
+            desired_priv: string name of desired privilege level
+                (see ssh2net.core.<device_type>.driver for levels)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        graph = privilege_graph(self.privs)
+        while True:
+            current_priv = await self._current_priv()
+            if current_priv == self.privs[desired_priv]:
+                return
+            await self._send_priv_transitions(graph.plan(current_priv.name, desired_priv))
+
+    async def send_command(self, commands):
+        """
+        Send command(s)
+
+        Args:
+            commands: string or list of strings to send to device in privilege exec mode
+
+        Returns:
+            result: list of output from the command(s)
+
+        Raises:
+            N/A  # noqa
+        """
+        await self.attain_priv(self.default_desired_priv)
+        result = await self.send_inputs(commands)
+        return result
+
+    async def send_config_set(self, configs, bulk: Optional[bool] = False):
+        """
+        Send configuration(s)
+
+        Args:
+            configs: string or list of strings to send to device in config mode
+            bulk: True/False send configuration as one block; not supported by the asyncio
+                flavor, use the sync driver
+
+        Returns:
+            result: list of output from the configuration(s)
+
+        Raises:
+            TypeError: if bulk is True
+        """
+        if bulk:
+            raise self._sync_only("send_config_set(bulk=True)")
+        await self.attain_priv("configuration")
+        result = await self.send_inputs(configs)
+        await self.attain_priv(self.default_desired_priv)
+        return result
+
+    def send_command_stream(self, commands):
+        """
+        Not supported by the asyncio flavor; see BaseNetworkDriver.send_command_stream
+
+        Args:
+            commands: string or list of strings to send to device in privilege exec mode
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+        """
+        raise self._sync_only("send_command_stream")
+
+    def send_config_commit(
+        self,
+        configs,
+        confirmed: Optional[int] = None,
+        dry_run: Optional[bool] = False,
+        session_name: Optional[str] = None,
+    ):
+        """
+        Not supported by the asyncio flavor; see ConfigSessionDriver.send_config_commit
+
+        Args:
+            configs: string or list of strings of configuration lines
+            confirmed: seconds after which the commit is rolled back unless confirmed
+            dry_run: True/False only return the diff and discard the candidate
+            session_name: name of the config session (EOS, NX-OS)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+        """
+        raise self._sync_only("send_config_commit")
+
+    def confirm_commit(self):
+        """
+        Not supported by the asyncio flavor; see ConfigSessionDriver.confirm_commit
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            TypeError: always
+        """
+        raise self._sync_only("confirm_commit")
@@ -2,7 +2,12 @@
 import re
 from typing import Any, Dict
 
-from ssh2net.core.driver import BaseNetworkDriver, PrivilegeLevel
+from ssh2net.core.driver import (
+    AsyncBaseNetworkDriver,
+    ConfigSession,
+    ConfigSessionDriver,
+    PrivilegeLevel,
+)
 
 
 JUNOS_ARG_MAPPER = {
@@ -43,8 +48,18 @@ PRIVS = {
     ),
 }
 
+CONFIG_SESSION = ConfigSession(
+    "configuration",
+    None,
+    "show | compare",
+    "commit",
+    "commit confirmed {minutes}",
+    "commit",
+    ["rollback 0"],
+)
 
-class JunosDriver(BaseNetworkDriver):
+
+class JunosDriver(ConfigSessionDriver):
     def __init__(self, **kwargs: Dict[str, Any]):
         """
         Initialize SSH2Net IOSXEDriver Object
@@ -61,3 +76,14 @@ class JunosDriver(BaseNetworkDriver):
         super().__init__(**kwargs)
         self.privs = PRIVS
         self.default_desired_priv = "exec"
+        self.config_error_markers = [
+            "syntax error",
+            "unknown command",
+            "missing argument",
+            "error:",
+        ]
+        self.config_session = CONFIG_SESSION
+
+
+class AsyncJunosDriver(AsyncBaseNetworkDriver, JunosDriver):
+    """asyncio flavor of JunosDriver; see AsyncSSH2Net"""
@@ -1,25 +1,30 @@
 """ssh2net.decorators"""
 import logging
-import multiprocessing.pool
+import threading
 import time
+from typing import Optional
+
+from ssh2net.buffer import ReadState
 
 
 channel_log = logging.getLogger("ssh2net_channel")
 
+# deadline of the operation currently running in each thread
+_operation_deadlines = threading.local()
+
 
-def operation_timeout(attribute):
+def operation_deadline(attribute):
     """
     Decorate an "operation" -- raises exception if the operation timeout is exceeded
 
-    This decorator wraps an entire "operation" -- in other words for each send_input or
-    send_inputs_interact this decorator wraps that entire operation. The `comms_operation_timeout`
-    value governs this timeout decorator -- and as such it should always be larger than the base
-    `session_timeout` argument plus the amount of time that `channel_timeout` decorator will delay
-    while retrying the read operation.
+    Rather than relying on a (process wide, main thread only) alarm signal, a deadline is set for
+    the thread running the operation; the deadline is checked by the channel read loops before
+    every read and every wait on the socket (waits never extend past the deadline), so operations
+    can be run concurrently from any number of threads. Nested operations never extend the
+    deadline of the outer operation.
 
-    Note: Different versions for Windows vs POSIX systems as I think the Windows version is ugly
-    and would prefer to not use it if possible. I imagine there is a better way to implement
-    a OS dependant decorator, but for now this works!
+    Note: a read on a blocking session is only interrupted by `session_timeout`, so the deadline
+    can be overrun by at most `session_timeout` while waiting for an input to be echoed.
 
     Args:
         attribute: attribute to inspect in class (to set timeout duration)
@@ -31,80 +36,72 @@ def operation_timeout(attribute):
         TimeoutError: if timeout exceeded
 
     """
-    import signal  # noqa
-
-    def _raise_exception(signum, frame):
-        raise TimeoutError
 
     def decorate(wrapped_func):
-        def timeout_wrapper(self, *args, **kwargs):
+        def deadline_wrapper(self, *args, **kwargs):
             timeout_duration = getattr(self, attribute)
+            outer_deadline = getattr(_operation_deadlines, "deadline", None)
             if not timeout_duration:
-                return wrapped_func
-            old = signal.signal(signal.SIGALRM, _raise_exception)
-            signal.setitimer(signal.ITIMER_REAL, timeout_duration)
+                return wrapped_func(self, *args, **kwargs)
+            deadline = time.monotonic() + timeout_duration
+            if outer_deadline is not None:
+                deadline = min(deadline, outer_deadline)
+            _operation_deadlines.deadline = deadline
             try:
                 return wrapped_func(self, *args, **kwargs)
             finally:
-                if timeout_duration:
-                    signal.setitimer(signal.ITIMER_REAL, 0)
-                    signal.signal(signal.SIGALRM, old)
+                _operation_deadlines.deadline = outer_deadline
 
-        return timeout_wrapper
+        return deadline_wrapper
 
     return decorate
 
 
-def operation_timeout_win(attribute):
+def check_operation_deadline() -> Optional[float]:
     """
-    Decorate an "operation" -- raises exception if the operation timeout is exceeded
-
-    See documentation for "operation_timeout"
-
-    This is a variation of the "operation_timeout" decorator that supports windows. I think the
-    Windows version is ugly and would prefer to not use it if possible, so the `ssh2net.channel`
-    module checks for os type and imports the appropriate version to not use this if it can at all
-    be avoided.
+    Check the deadline of the operation running in the current thread (if any)
 
     Args:
-        attribute: attribute to inspect in class (to set timeout duration)
+        N/A  # noqa
 
     Returns:
-        decorate: wrapped function
+        float: seconds remaining until the deadline, or None if there is no deadline
 
     Raises:
-        TimeoutError: if timeout exceeded
+        TimeoutError: if the deadline has passed
 
     """
-
-    def decorate(wrapped_func):
-        def timeout_wrapper(self, *args, **kwargs):
-            timeout_duration = getattr(self, attribute)
-            pool = multiprocessing.pool.ThreadPool(processes=1)
-            args = [self, *args]
-            async_result = pool.apply_async(wrapped_func, args, kwargs)
-            try:
-                return async_result.get(timeout_duration)
-            except multiprocessing.context.TimeoutError:
-                raise TimeoutError
-
-        return timeout_wrapper
-
-    return decorate
+    deadline = getattr(_operation_deadlines, "deadline", None)
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError
+    return remaining
 
 
-def channel_timeout(exception_to_check, attempts=5, starting_delay=0.1, backoff=2):
+def channel_timeout(
+    exception_to_check, attribute="comms_operation_timeout", attempts=5, retry_delay=0.01
+):
     """
-    Decorate read operations; basic backoff timer to try to read channel for reasonable time
+    Decorate read operations; retry timed out reads, resuming where they left off
 
     This decorator wraps individual read operations. If/when the read operation times out
-    (timeout configured by `session_timeout`), run a basic backoff process retrying five times
+    (timeout configured by `session_timeout`), the read is retried until the total deadline of the
+    read has passed. The deadline is `attribute` seconds from the start of the read, or the
+    deadline of the operation the read is part of if that is sooner; if there is no deadline at
+    all, `attempts` attempts are made.
+
+    A single `ReadState` is created per read operation and passed to every attempt as the
+    `read_state` keyword argument. Output received before a timeout is kept in it, so a retry
+    continues where the previous attempt left off rather than discarding output and possibly
+    waiting for a prompt that was already received.
 
     Args:
         exception_to_check: Exception to handle; basically if this exception is seen, try again
-        attempts: number of attempts to make to retry
-        starting_delay: initial backoff delay
-        backoff: backoff multiplier
+        attribute: attribute to inspect in class (to set total read timeout duration)
+        attempts: number of attempts to make if there is no deadline
+        retry_delay: delay before retrying
 
     Returns:
         decorate: wrapped function
@@ -116,16 +113,28 @@ def channel_timeout(exception_to_check, attempts=5, starting_delay=0.1, backoff=
 
     def decorate(wrapped_func):
         def retry_wrapper(self, *args, **kwargs):
-            attempt, delay = attempts, starting_delay
-            while attempt > 1:
+            deadline = getattr(_operation_deadlines, "deadline", None)
+            timeout_duration = getattr(self, attribute)
+            if timeout_duration:
+                read_deadline = time.monotonic() + timeout_duration
+                deadline = read_deadline if deadline is None else min(deadline, read_deadline)
+            read_state = ReadState(self.comms_read_size, deadline)
+            while True:
+                read_state.attempts += 1
                 try:
-                    return wrapped_func(self, *args, **kwargs)
+                    return wrapped_func(self, *args, read_state=read_state, **kwargs)
                 except exception_to_check:
-                    channel_log.info(f"Retrying read operation in {delay} seconds...")
-                    time.sleep(delay)
-                    attempt -= 1
-                    delay *= backoff
-            return wrapped_func(self, *args, **kwargs)
+                    remaining = read_state.remaining()
+                    if remaining is None and read_state.attempts >= attempts:
+                        raise
+                    if remaining is not None and remaining <= retry_delay:
+                        raise
+                    channel_log.info(
+                        f"Retrying read operation, {len(read_state.receive_buffer)} bytes "
+                        "already read..."
+                    )
+                    time.sleep(retry_delay)
+                    check_operation_deadline()
 
         return retry_wrapper
 
@@ -17,5 +17,17 @@ class SetupTimeout(Exception):
     pass
 
 
+class SessionLockTimeout(Exception):
+    pass
+
+
 class UnknownPrivLevel(Exception):
     pass
+
+
+class ConnectionPoolTimeout(Exception):
+    pass
+
+
+class ConfigurationFailed(Exception):
+    pass
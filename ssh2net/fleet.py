@@ -0,0 +1,259 @@
+"""ssh2net.fleet"""
+import collections
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from ssh2net.base import SSH2Net
+from ssh2net.decorators import operation_deadline
+from ssh2net.netmiko_compatibility import connect_handler
+from ssh2net.resolver import RESOLVER, host_port
+from ssh2net.scan import SSH2NetScanner, socket_connected
+
+
+session_log = logging.getLogger("ssh2net_session")
+
+FleetResult = collections.namedtuple("FleetResult", "host result exception elapsed")
+
+
+def create_connection(host: Dict[str, Any]):
+    """
+    Create (but do not open) a connection object for a host definition
+
+    Hosts are dicts of either SSH2Net style kwargs -- optionally with a "driver" key holding the
+    class to connect with (i.e. IOSXEDriver), SSH2Net if omitted -- or netmiko ConnectHandler
+    style kwargs (identified by a "device_type" key).
+
+    Args:
+        host: host definition
+
+    Returns:
+        conn: SSH2Net (or driver) object for the host
+
+    Raises:
+        N/A  # noqa
+
+    """
+    host = dict(host)
+    if "device_type" in host:
+        return connect_handler(auto_open=False, **host)
+    driver = host.pop("driver", SSH2Net)
+    return driver(**host)
+
+
+class SSH2NetFleet:
+    def __init__(
+        self,
+        hosts: List[Dict[str, Any]],
+        max_workers: Optional[int] = 10,
+        device_timeout: Optional[float] = None,
+        pre_scan_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize SSH2NetFleet Object
+
+        Run operations across an inventory of devices with bounded concurrency. Each device is
+        handled by a worker of a thread pool of at most `max_workers` threads: the connection is
+        opened, the operation run and the connection closed again. Results are yielded as each
+        device completes, in completion order.
+
+        Failures are isolated per device, an exception on one device is recorded in that device's
+        result and never affects other devices. Operation timeouts are thread safe deadlines, so
+        `comms_operation_timeout` of each device applies inside the workers as well; on top of
+        that `device_timeout` bounds the total time spent on a single device so one hung device
+        never stalls the batch.
+
+        With `pre_scan_timeout` set, the whole inventory is first scanned for tcp reachability
+        concurrently (see SSH2NetScanner); unreachable devices fail right away without taking up
+        a worker. The sockets connected by the scan are kept for up to `max_workers` reachable
+        devices, which are started first and reuse them; all other devices connect as usual, as
+        do devices whose kept socket has been closed by the device in the meantime.
+
+        Hosts are dicts of either SSH2Net style kwargs -- optionally with a "driver" key holding
+        the class to connect with (i.e. IOSXEDriver), SSH2Net if omitted -- or netmiko
+        ConnectHandler style kwargs (identified by a "device_type" key).
+
+        Args:
+            hosts: list of host definitions
+            max_workers: max number of devices to handle concurrently
+            device_timeout: max seconds to spend on a single device (connecting and running the
+                operation); None for no limit beyond the timeouts of the connection itself
+            pre_scan_timeout: seconds to wait for each connect of a tcp reachability pre-scan;
+                None to not pre-scan
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if max_workers is less than 1
+
+        """
+        if max_workers < 1:
+            raise ValueError(f"Fleet requires at least one worker, got: {max_workers}")
+        self.hosts = hosts
+        self.max_workers = max_workers
+        self.device_timeout = device_timeout
+        self.pre_scan_timeout = pre_scan_timeout
+
+    @operation_deadline("device_timeout")
+    def _run_device(
+        self, host: Dict[str, Any], operation: str, args, kwargs, sockets=None
+    ) -> FleetResult:
+        """
+        Connect to a single device and run an operation on it; called from the worker threads
+
+        Args:
+            host: host definition
+            operation: name of the connection method to call, i.e. "send_command"
+            args: positional arguments for the operation
+            kwargs: keyword arguments for the operation
+            sockets: dict of (host, port) to already connected socket (from a pre-scan), if any
+
+        Returns:
+            FleetResult: result of the operation on the device
+
+        Raises:
+            N/A  # noqa
+
+        """
+        host_name = host_port(host)[0]
+        start_time = time.monotonic()
+        conn = None
+        try:
+            conn = create_connection(host)
+            sock = sockets.pop(host_port(host), None) if sockets else None
+            if sock is not None:
+                if socket_connected(sock):
+                    conn.sock = sock
+                else:
+                    session_log.info(f"Pre-scan socket to host {host_name} closed, reconnecting")
+                    sock.close()
+            conn.open_shell()
+            result = getattr(conn, operation)(*args, **kwargs)
+        except Exception as exc:  # pylint: disable=W0703
+            session_log.warning(f"Fleet operation {operation} on host {host_name} failed: {exc}")
+            return FleetResult(host_name, None, exc, time.monotonic() - start_time)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception as exc:  # pylint: disable=W0703
+                    session_log.debug(f"Failed to close connection to host {host_name}: {exc}")
+        return FleetResult(host_name, result, None, time.monotonic() - start_time)
+
+    def run(self, operation: str, *args, **kwargs) -> Iterator[FleetResult]:
+        """
+        Run an operation on all devices; yield per device results as they complete
+
+        Args:
+            operation: name of the connection method to call, i.e. "send_inputs"
+            *args: positional arguments for the operation
+            **kwargs: keyword arguments for the operation
+
+        Yields:
+            FleetResult: namedtuple of host, result (None if failed), exception (None if
+                succeeded) and elapsed seconds
+
+        Raises:
+            N/A  # noqa
+
+        """
+        hosts, sockets, unreachable = self.hosts, {}, []
+        if self.pre_scan_timeout is not None:
+            scan_start_time = time.monotonic()
+            scanner = SSH2NetScanner(
+                self.pre_scan_timeout, keep_sockets=True, max_kept_sockets=self.max_workers
+            )
+            scan_results = scanner.scan(hosts)
+            sockets = {
+                key: result.sock for key, result in scan_results.reachable.items() if result.sock
+            }
+            hosts = [host for host in hosts if host_port(host) in scan_results.reachable]
+            # devices with a kept socket go first so their sockets do not sit idle
+            hosts.sort(key=lambda host: host_port(host) not in sockets)
+            for host in self.hosts:
+                scan_result = scan_results.unreachable.get(host_port(host))
+                if scan_result is not None:
+                    unreachable.append(
+                        FleetResult(
+                            host_port(host)[0],
+                            None,
+                            scan_result.exception,
+                            time.monotonic() - scan_start_time,
+                        )
+                    )
+        else:
+            # resolve the whole inventory up front; connections reuse the cached addresses
+            RESOLVER.resolve_hosts(hosts, self.max_workers)
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [
+            pool.submit(self._run_device, host, operation, args, kwargs, sockets) for host in hosts
+        ]
+        try:
+            yield from unreachable
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # if the caller stops consuming results, do not start any more devices
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+            # sockets of devices that were never started
+            for sock in list(sockets.values()):
+                sock.close()
+
+    def send_inputs(self, inputs, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send inputs to all devices; yield per device results as they complete
+
+        Args:
+            inputs: list of strings or string of inputs to send to each device
+            **kwargs: keyword arguments for send_inputs
+
+        Yields:
+            FleetResult: per device result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_inputs", inputs, **kwargs)
+
+    def send_command(self, commands, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send command(s) to all devices; yield per device results as they complete
+
+        Requires hosts to be connected with a driver (a "driver" or "device_type" key)
+
+        Args:
+            commands: string or list of strings to send to each device in privilege exec mode
+            **kwargs: keyword arguments for send_command
+
+        Yields:
+            FleetResult: per device result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_command", commands, **kwargs)
+
+    def send_config_set(self, configs, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send configuration(s) to all devices; yield per device results as they complete
+
+        Requires hosts to be connected with a driver (a "driver" or "device_type" key)
+
+        Args:
+            configs: string or list of strings to send to each device in config mode
+            **kwargs: keyword arguments for send_config_set, i.e. bulk=True
+
+        Yields:
+            FleetResult: per device result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_config_set", configs, **kwargs)
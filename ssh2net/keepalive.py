@@ -0,0 +1,164 @@
+"""ssh2net.keepalive"""
+import heapq
+from itertools import count
+import logging
+from threading import Condition, Thread
+import time
+import weakref
+
+
+class KeepaliveScheduler:
+    def __init__(self):
+        """
+        Initialize KeepaliveScheduler Object
+
+        Process wide scheduler sending keepalives for any number of connections from a single
+        thread. Connections are kept in a heap ordered by when their next keepalive is due, so the
+        thread sleeps until exactly the next keepalive is due rather than polling every
+        connection. Connections are only weakly referenced; a connection that is garbage collected
+        without being closed simply drops out of the schedule.
+
+        Registered connections must implement `_session_keepalive_send`, returning the number of
+        seconds until the next keepalive is due or None to stop sending keepalives.
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._condition = Condition()
+        self._heap = []
+        self._connections = {}
+        self._tokens = count()
+        self._thread = None
+
+    def register(self, conn, delay: float) -> None:
+        """
+        Register a connection (or re-register to reschedule it)
+
+        Args:
+            conn: SSH2Net object to send keepalives for
+            delay: seconds until the first keepalive is due
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            token = next(self._tokens)
+            self._connections[id(conn)] = (weakref.ref(conn), token)
+            heapq.heappush(self._heap, (time.monotonic() + delay, token, id(conn)))
+            # the thread does not survive a fork (i.e. into a process of a sharded executor)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="ssh2net_keepalive", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def unregister(self, conn) -> None:
+        """
+        Stop sending keepalives for a connection
+
+        Args:
+            conn: SSH2Net object to stop sending keepalives for
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            # any entry left in the heap is skipped as its token no longer matches
+            self._connections.pop(id(conn), None)
+
+    def registered(self, conn) -> bool:
+        """
+        Check if a connection is registered
+
+        Args:
+            conn: SSH2Net object to check
+
+        Returns:
+            bool: True/False connection is registered
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            return id(conn) in self._connections
+
+    def _next_due(self):
+        """
+        Wait for the next due keepalive; must be called with the condition held
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            tuple: connection id, registration token and connection object that is due
+
+        Raises:
+            N/A  # noqa
+
+        """
+        while True:
+            if not self._heap:
+                self._condition.wait()
+                continue
+            due, token, conn_id = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._condition.wait(delay)
+                continue
+            heapq.heappop(self._heap)
+            conn_ref, conn_token = self._connections.get(conn_id, (None, None))
+            if conn_token != token:
+                continue
+            conn = conn_ref()
+            if conn is None:
+                del self._connections[conn_id]
+                continue
+            return conn_id, token, conn
+
+    def _run(self) -> None:
+        """
+        Keepalive thread; send keepalives as they become due
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        while True:
+            with self._condition:
+                conn_id, token, conn = self._next_due()
+            try:
+                delay = conn._session_keepalive_send()  # pylint: disable=W0212
+            except Exception as exc:  # pylint: disable=W0703
+                logging.warning(f"Keepalive to host {conn.host} failed; Exception: {exc}")
+                delay = None
+            with self._condition:
+                if self._connections.get(conn_id, (None, None))[1] == token:
+                    if delay is None:
+                        del self._connections[conn_id]
+                    else:
+                        heapq.heappush(self._heap, (time.monotonic() + delay, token, conn_id))
+            del conn
+
+
+KEEPALIVE_SCHEDULER = KeepaliveScheduler()
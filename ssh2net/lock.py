@@ -0,0 +1,220 @@
+"""ssh2net.lock"""
+from collections import deque
+from threading import Lock
+import time
+from typing import Optional
+
+
+class SessionLock:
+    def __init__(self):
+        """
+        Initialize SessionLock Object
+
+        First in first out lock used to serialize operations on a connection. Waiting threads
+        block (rather than spin) and are woken up strictly in the order they started waiting; on
+        release the lock is handed directly to the next waiter, so a thread that did not wait
+        cannot jump the queue. Acquisition can time out, and time spent waiting is recorded.
+
+        Metrics: `acquire_count` (successful acquisitions), `wait_count` (acquisitions that had to
+        wait, including timed out ones), `wait_time_total`/`wait_time_max` (seconds spent waiting)
+        and `timeout_count`.
+
+        Drop in replacement for `threading.Lock` as used by ssh2net (`acquire`/`acquire_lock`,
+        `release`/`release_lock`, `locked` and context manager).
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._mutex = Lock()
+        self._locked = False
+        self._waiters = deque()
+        self.reset_metrics()
+
+    def __enter__(self):
+        """
+        Enter method for context manager
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            self: instance of self
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """
+        Exit method to release lock for context manager
+
+        Args:
+            exception_type: exception type being raised
+            exception_value: message from exception being raised
+            traceback: traceback from exception being raised
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.release()
+
+    def reset_metrics(self) -> None:
+        """
+        Reset lock wait metrics
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.acquire_count = 0
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeout_count = 0
+
+    def _record_wait(self, wait_time: float) -> None:
+        """
+        Record time spent waiting for the lock; must be called with the mutex held
+
+        Args:
+            wait_time: seconds spent waiting
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.wait_count += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def acquire(self, blocking: Optional[bool] = True, timeout: Optional[float] = -1) -> bool:
+        """
+        Acquire the lock
+
+        Args:
+            blocking: True/False wait for the lock if it is held
+            timeout: max seconds to wait for the lock; -1 (or None) waits indefinitely
+
+        Returns:
+            bool: True/False lock was acquired
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._mutex:
+            if not self._locked and not self._waiters:
+                self._locked = True
+                self.acquire_count += 1
+                return True
+            if not blocking:
+                return False
+            waiter = Lock()
+            waiter.acquire()
+            self._waiters.append(waiter)
+
+        wait_start = time.monotonic()
+        acquired = False
+        interrupted = True
+        try:
+            acquired = waiter.acquire(timeout=-1 if timeout is None else timeout)
+            interrupted = False
+        finally:
+            with self._mutex:
+                if not acquired:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        # lock was handed over just as the wait ended
+                        acquired = True
+                self._record_wait(time.monotonic() - wait_start)
+                if interrupted and acquired:
+                    # the wait was interrupted (i.e. by an operation timeout) but the lock was
+                    # handed over anyway; it will never be used so pass it on
+                    self._hand_over()
+                elif acquired:
+                    self.acquire_count += 1
+                elif not interrupted:
+                    self.timeout_count += 1
+        return acquired
+
+    def _hand_over(self) -> None:
+        """
+        Pass the lock to the longest waiting thread or unlock it; must be called with mutex held
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self._waiters:
+            # lock stays locked, ownership passes directly to the next waiter
+            self._waiters.popleft().release()
+        else:
+            self._locked = False
+
+    def release(self) -> None:
+        """
+        Release the lock, handing it to the longest waiting thread if any
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            RuntimeError: if the lock is not held
+
+        """
+        with self._mutex:
+            if not self._locked:
+                raise RuntimeError("release unlocked lock")
+            self._hand_over()
+
+    def locked(self) -> bool:
+        """
+        Check if the lock is held
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            bool: True/False lock is held
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return self._locked
+
+    acquire_lock = acquire
+    release_lock = release
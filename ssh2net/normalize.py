@@ -0,0 +1,191 @@
+"""ssh2net.normalize"""
+import codecs
+from typing import List, Optional
+
+
+def _render_line(line: str) -> str:
+    """
+    Apply carriage returns and backspaces within a line the way a terminal would
+
+    A carriage return moves the cursor back to the start of the line and a backspace moves it
+    back one character; any following characters overwrite what is already on the line.
+
+    Args:
+        line: line of output containing carriage returns and/or backspaces
+
+    Returns:
+        str: rendered and right stripped line
+
+    Raises:
+        N/A  # noqa
+
+    """
+    rendered = []
+    cursor = 0
+    for char in line:
+        if char == "\r":
+            cursor = 0
+        elif char == "\b":
+            cursor = max(0, cursor - 1)
+        elif cursor < len(rendered):
+            rendered[cursor] = char
+            cursor += 1
+        else:
+            rendered.append(char)
+            cursor += 1
+    return "".join(rendered).rstrip()
+
+
+class OutputNormalizer:
+    def __init__(self, encoding: Optional[str] = "utf-8", errors: Optional[str] = "replace"):
+        """
+        Initialize OutputNormalizer Object
+
+        Turn raw channel output into clean text in a single pass: decode, apply carriage returns
+        and backspaces, right strip every line, drop leading blank lines (and leading whitespace)
+        and trailing blank lines, and optionally peel off the trailing prompt. Output can be fed
+        in chunks as it is read, complete lines are returned as soon as it is known they are not
+        the final line; multi-byte characters split across chunks are handled by an incremental
+        decoder.
+
+        Args:
+            encoding: codec to decode output with
+            errors: codec error handling scheme
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset normalizer state so it can be reused for new output
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._decoder.reset()
+        self._partial = ""
+        self._started = False
+        # the last non blank line and any blank lines after it; the last non blank line may be
+        # the prompt and trailing blank lines are dropped, so these are held until more output is
+        # seen (or output is finished)
+        self._held = []
+
+    def _process_lines(self, text: str) -> List[str]:
+        """
+        Normalize complete lines and return the lines that can be released
+
+        Args:
+            text: decoded text of one or more complete lines (without the final line break)
+
+        Returns:
+            lines: list of normalized lines that are not held back
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if "\b" in text or text.count("\r") != text.count("\r\n"):
+            lines = [
+                _render_line(line) if "\r" in line or "\b" in line else line
+                for line in map(str.rstrip, text.split("\n"))
+            ]
+        else:
+            # fast path for the common case; trailing carriage returns are stripped with the
+            # rest of the trailing whitespace
+            lines = list(map(str.rstrip, text.split("\n")))
+        if not self._started:
+            first_line = next((index for index, line in enumerate(lines) if line), None)
+            if first_line is None:
+                return []
+            lines = lines[first_line:]
+            lines[0] = lines[0].lstrip()
+            self._started = True
+        last_line = len(lines) - 1
+        while last_line >= 0 and not lines[last_line]:
+            last_line -= 1
+        if last_line < 0:
+            self._held.extend(lines)
+            return []
+        released = self._held + lines[:last_line]
+        self._held = lines[last_line:]
+        return released
+
+    def feed(self, data: bytes) -> List[str]:
+        """
+        Feed a chunk of raw output to the normalizer
+
+        Args:
+            data: bytes-like object of output
+
+        Returns:
+            lines: list of normalized lines that are complete and known not to be the final line
+
+        Raises:
+            N/A  # noqa
+
+        """
+        text = self._partial + self._decoder.decode(data)
+        if not self._started:
+            # leading whitespace (including blank lines) is dropped from the output
+            text = text.lstrip()
+        line_end = text.rfind("\n")
+        if line_end == -1:
+            self._partial = text
+            return []
+        self._partial = text[line_end + 1 :]
+        return self._process_lines(text[:line_end])
+
+    def finish(self, strip_prompt: Optional[bool] = False) -> List[str]:
+        """
+        Signal the end of the output; return remaining lines and reset state
+
+        Args:
+            strip_prompt: True/False drop the final (non blank) line, i.e. the prompt
+
+        Returns:
+            lines: list of remaining normalized lines
+
+        Raises:
+            N/A  # noqa
+
+        """
+        text = self._partial + self._decoder.decode(b"", final=True)
+        lines = self._process_lines(text)
+        if not strip_prompt:
+            lines += self._held[:1]
+        self.reset()
+        return lines
+
+    def normalize(self, output: bytes, strip_prompt: Optional[bool] = False) -> str:
+        """
+        Normalize a complete output in one go
+
+        Args:
+            output: bytes-like object of output
+            strip_prompt: True/False drop the final (non blank) line, i.e. the prompt
+
+        Returns:
+            str: normalized output, lines joined with newlines
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.reset()
+        # no need to carry partial lines between chunks, decode and process everything at once
+        self._partial = self._decoder.decode(output, final=True).lstrip()
+        return "\n".join(self.finish(strip_prompt=strip_prompt))
@@ -0,0 +1,381 @@
+"""ssh2net.pool"""
+from collections import deque
+from contextlib import contextmanager
+import logging
+from threading import Condition
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from ssh2net.exceptions import ConnectionPoolTimeout
+from ssh2net.fleet import create_connection
+
+
+session_log = logging.getLogger("ssh2net_session")
+
+
+class SSH2NetConnectionPool:
+    def __init__(
+        self,
+        max_per_host: Optional[int] = 2,
+        idle_ttl: Optional[float] = 300,
+        checkout_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize SSH2NetConnectionPool Object
+
+        Pool of open connections so callers talking to the same device do not each pay for the
+        tcp connect, handshake, authentication and shell setup. Connections are keyed by their
+        host definition (same format as SSH2NetFleet, including host and credentials) -- only
+        connections opened with an identical definition are shared.
+
+        On checkout an idle connection is validated: the session and channel must be alive and,
+        for drivers, the connection is brought back to its default privilege level (which doubles
+        as a round trip health check). Connections failing validation are closed and replaced.
+        Idle connections are evicted once they have been idle for `idle_ttl` seconds; eviction
+        happens whenever the pool is used or `evict_idle` is called.
+
+        Args:
+            max_per_host: max number of connections (idle and checked out) per host definition
+            idle_ttl: seconds an idle connection is kept before it is closed; None keeps idle
+                connections until the pool is closed
+            checkout_timeout: default seconds to wait for a connection when `max_per_host`
+                connections are checked out; None waits indefinitely
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if max_per_host is less than 1
+
+        """
+        if max_per_host < 1:
+            raise ValueError(f"Pool requires at least one connection per host, got: {max_per_host}")
+        self.max_per_host = max_per_host
+        self.idle_ttl = idle_ttl
+        self.checkout_timeout = checkout_timeout
+        self._condition = Condition()
+        # pool key -> deque of (connection, time.monotonic() it was checked in)
+        self._idle = {}
+        # pool key -> number of open connections (idle and checked out)
+        self._open = {}
+        # id of checked out connection -> pool key
+        self._checked_out = {}
+        self._closed = False
+
+    def __enter__(self):
+        """
+        Enter method for context manager
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            self: instance of self
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """
+        Exit method to cleanup for context manager
+
+        Args:
+            exception_type: exception type being raised
+            exception_value: message from exception being raised
+            traceback: traceback from exception being raised
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.close()
+
+    @staticmethod
+    def _pool_key(host: Dict[str, Any]) -> tuple:
+        """
+        Return the key connections for a host definition are pooled under
+
+        Args:
+            host: host definition
+
+        Returns:
+            tuple: hashable representation of the host definition
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return tuple(sorted((key, repr(value)) for key, value in host.items()))
+
+    @staticmethod
+    def _close_connection(conn) -> None:
+        """
+        Close a connection, ignoring any errors
+
+        Args:
+            conn: connection to close
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        try:
+            conn.close()
+        except Exception as exc:  # pylint: disable=W0703
+            session_log.debug(f"Failed to close pooled connection to host {conn.host}: {exc}")
+
+    @staticmethod
+    def _validate(conn) -> bool:
+        """
+        Check an idle connection is still usable and normalize its privilege level
+
+        Args:
+            conn: connection to validate
+
+        Returns:
+            bool: True/False connection is usable
+
+        Raises:
+            N/A  # noqa
+
+        """
+        try:
+            if not (conn._session_alive() and conn._channel_alive()):  # pylint: disable=W0212
+                return False
+            if getattr(conn, "default_desired_priv", None):
+                # forget the tracked prompt so the device is actually probed
+                conn._current_prompt = None  # pylint: disable=W0212
+                conn.attain_priv(conn.default_desired_priv)
+        except Exception as exc:  # pylint: disable=W0703
+            session_log.info(f"Pooled connection to host {conn.host} failed validation: {exc}")
+            return False
+        return True
+
+    def _evict_idle(self) -> list:
+        """
+        Remove expired idle connections from the pool; must be called with the condition held
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            list: evicted connections, to be closed once the condition is released
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self.idle_ttl is None:
+            return []
+        expired_before = time.monotonic() - self.idle_ttl
+        evicted = []
+        for key, idle in self._idle.items():
+            # oldest idle connections are at the left
+            while idle and idle[0][1] < expired_before:
+                evicted.append(idle.popleft()[0])
+                self._open[key] -= 1
+        if evicted:
+            self._condition.notify_all()
+        return evicted
+
+    def evict_idle(self) -> int:
+        """
+        Close connections that have been idle for longer than `idle_ttl`
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            int: number of connections closed
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            evicted = self._evict_idle()
+        for conn in evicted:
+            self._close_connection(conn)
+        return len(evicted)
+
+    def _reserve(self, key: tuple, timeout: Optional[float]):
+        """
+        Take an idle connection or reserve a slot for a new one
+
+        Waits while the host is at `max_per_host` connections.
+
+        Args:
+            key: pool key of the host definition
+            timeout: seconds to wait; None waits indefinitely
+
+        Returns:
+            tuple: idle connection (None if a slot for a new connection was reserved) and list of
+                evicted connections to close
+
+        Raises:
+            ConnectionPoolTimeout: if no connection is available within timeout
+            RuntimeError: if the pool is closed
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                evicted = self._evict_idle()
+                idle = self._idle.get(key)
+                if idle:
+                    # most recently used connections are the most likely to still be healthy
+                    return idle.pop()[0], evicted
+                if self._open.get(key, 0) < self.max_per_host:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    return None, evicted
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise ConnectionPoolTimeout(
+                        f"Timed out after {timeout}s waiting for a pooled connection"
+                    )
+                self._condition.wait(remaining)
+
+    def _release_slot(self, key: tuple) -> None:
+        """
+        Release the slot of a connection that was closed or failed to open
+
+        Args:
+            key: pool key of the host definition
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            self._open[key] -= 1
+            self._condition.notify()
+
+    def checkout(self, host: Dict[str, Any], timeout: Optional[float] = None):
+        """
+        Check out an open connection for a host definition
+
+        Args:
+            host: host definition
+            timeout: seconds to wait for a connection if `max_per_host` connections are checked
+                out; None for `checkout_timeout`
+
+        Returns:
+            conn: open SSH2Net (or driver) object; must be returned with `checkin`
+
+        Raises:
+            ConnectionPoolTimeout: if no connection is available within timeout
+            RuntimeError: if the pool is closed
+
+        """
+        key = self._pool_key(host)
+        timeout = self.checkout_timeout if timeout is None else timeout
+        while True:
+            conn, evicted = self._reserve(key, timeout)
+            for evicted_conn in evicted:
+                self._close_connection(evicted_conn)
+            if conn is None:
+                try:
+                    conn = create_connection(host)
+                    conn.open_shell()
+                except Exception:
+                    self._release_slot(key)
+                    raise
+                session_log.debug(f"Pooled connection to host {conn.host} opened")
+            elif not self._validate(conn):
+                self._close_connection(conn)
+                self._release_slot(key)
+                continue
+            with self._condition:
+                self._checked_out[id(conn)] = key
+            return conn
+
+    def checkin(self, conn, discard: Optional[bool] = False) -> None:
+        """
+        Return a checked out connection to the pool
+
+        Args:
+            conn: connection returned by `checkout`
+            discard: True/False close the connection instead of keeping it (i.e. because an
+                operation on it failed and it may be in an unknown state)
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if the connection was not checked out from this pool
+
+        """
+        with self._condition:
+            key = self._checked_out.pop(id(conn), None)
+            if key is None:
+                raise ValueError("Connection was not checked out from this pool")
+            if not discard and not self._closed:
+                self._idle.setdefault(key, deque()).append((conn, time.monotonic()))
+                self._condition.notify()
+                return
+        self._close_connection(conn)
+        self._release_slot(key)
+
+    @contextmanager
+    def connection(self, host: Dict[str, Any], timeout: Optional[float] = None) -> Iterator:
+        """
+        Check out a connection for the duration of a with block
+
+        The connection is discarded (closed) rather than returned to the pool if the block raises
+
+        Args:
+            host: host definition
+            timeout: seconds to wait for a connection; None for `checkout_timeout`
+
+        Yields:
+            conn: open SSH2Net (or driver) object
+
+        Raises:
+            N/A  # noqa
+
+        """
+        conn = self.checkout(host, timeout)
+        try:
+            yield conn
+        except BaseException:
+            self.checkin(conn, discard=True)
+            raise
+        self.checkin(conn)
+
+    def close(self) -> None:
+        """
+        Close all idle connections; checked out connections are closed when checked in
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._condition:
+            self._closed = True
+            idle_connections = [conn for idle in self._idle.values() for conn, _ in idle]
+            for key, idle in self._idle.items():
+                self._open[key] -= len(idle)
+            self._idle = {}
+            self._condition.notify_all()
+        for conn in idle_connections:
+            self._close_connection(conn)
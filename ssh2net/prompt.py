@@ -0,0 +1,173 @@
+"""ssh2net.prompt"""
+from functools import lru_cache
+import re
+from typing import Optional, Pattern, Union
+
+try:
+    from re import _parser as sre_parse  # pylint: disable=C0412
+except ImportError:  # pragma: no cover
+    import sre_parse  # pylint: disable=C0412
+
+
+DEFAULT_TAIL_WINDOW = 1024
+
+
+@lru_cache(maxsize=128)
+def _pattern_max_width(pattern: bytes, flags: int) -> int:
+    """
+    Return the longest string a regex pattern could possibly match
+
+    Results are cached per pattern/flags so the pattern is only parsed once, not on every read.
+
+    Args:
+        pattern: bytes regex pattern
+        flags: regex flags to parse pattern with
+
+    Returns:
+        int: maximum width of pattern, or DEFAULT_TAIL_WINDOW if pattern is unbounded
+
+    Raises:
+        N/A  # noqa
+
+    """
+    try:
+        max_width = sre_parse.parse(pattern, flags).getwidth()[1]
+    except Exception:  # pylint: disable=W0703
+        return DEFAULT_TAIL_WINDOW
+    if max_width >= sre_parse.MAXREPEAT:
+        return DEFAULT_TAIL_WINDOW
+    return max_width
+
+
+class PromptMatcher:
+    def __init__(
+        self,
+        prompt: Union[str, Pattern],
+        regex: Optional[bool] = True,
+        tail_window: Optional[int] = None,
+    ):
+        """
+        Initialize PromptMatcher Object
+
+        Incrementally search channel output for a prompt. Each call to `feed` only inspects the
+        newly received bytes plus a bounded "tail" of previously seen bytes -- the tail is sized
+        to the longest prompt the pattern can match -- so prompt detection is linear in the size
+        of the output rather than rescanning the whole output on every read.
+
+        Matching happens on bytes with carriage returns treated as newlines and trailing
+        whitespace ignored, mirroring how prompts have always been matched; the raw channel output
+        is never modified by the matcher.
+
+        Args:
+            prompt: regex pattern (string or compiled) or plain string to look for
+            regex: True/False prompt should be treated as a regex; plain strings are matched as
+                substrings
+            tail_window: override the number of trailing bytes carried between reads
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if hasattr(prompt, "pattern"):
+            pattern = prompt.pattern
+            flags = prompt.flags & ~re.U
+        else:
+            pattern = prompt
+            flags = re.M | re.I
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+
+        if regex:
+            self.pattern = re.compile(pattern, flags=flags)
+            default_window = _pattern_max_width(pattern, flags)
+        else:
+            self.pattern = re.compile(re.escape(pattern))
+            default_window = len(pattern)
+        self.tail_window = tail_window or default_window
+
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset matcher state so it can be reused for a new read operation
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._tail = b""
+        self._tail_offset = 0
+        self._tail_at_line_start = True
+        self.match = None
+        self.start = -1
+        self.end = -1
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Feed newly read bytes to the matcher and check for a prompt
+
+        Args:
+            data: bytes read from the channel since the last call to feed
+
+        Returns:
+            bool: True/False prompt has been found; if True, `start`/`end` hold the offsets of
+                the prompt relative to all data fed to the matcher
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if self.match:
+            return True
+
+        # carriage returns are treated as line breaks for matching; replacement is length
+        # preserving so offsets map directly back to the raw output
+        window = self._tail + bytes(data).replace(b"\r", b"\n")
+
+        # prefix the window with a newline or a sentinel byte and start searching after it, this
+        # way "^" only matches the start of the window if the window truly starts a line
+        scan = (b"\n" if self._tail_at_line_start else b"\x00") + window
+        search_end = len(scan.rstrip())
+        channel_match = self.pattern.search(scan, 1, search_end)
+        if channel_match:
+            self.match = channel_match
+            self.start = self._tail_offset + channel_match.start() - 1
+            self.end = self._tail_offset + channel_match.end() - 1
+            return True
+
+        # carry forward only enough bytes to find a prompt spanning multiple reads; trailing
+        # whitespace is carried as well as it is not counted against the window
+        keep_from = max(0, search_end - 1 - self.tail_window)
+        if keep_from:
+            self._tail_at_line_start = window[keep_from - 1 : keep_from] == b"\n"
+        self._tail = window[keep_from:]
+        self._tail_offset += keep_from
+        return False
+
+    @property
+    def prompt(self) -> str:
+        """
+        Return the matched prompt as a string
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            str: matched prompt, or empty string if no prompt has been found
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if not self.match:
+            return ""
+        return self.match.group(0).decode(errors="replace").strip()
@@ -0,0 +1,153 @@
+"""ssh2net.resolver"""
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import socket
+from threading import Lock
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+session_log = logging.getLogger("ssh2net_session")
+
+
+def host_port(host: Dict[str, Any]) -> Tuple[str, int]:
+    """
+    Return host name and port of a host definition (SSH2Net or netmiko style kwargs)
+
+    Args:
+        host: host definition
+
+    Returns:
+        tuple: host name and port
+
+    Raises:
+        N/A  # noqa
+
+    """
+    name = host.get("setup_host") or host.get("host") or host.get("ip") or ""
+    return name.strip(), int(host.get("setup_port", host.get("port", 22)))
+
+
+class Resolver:
+    def __init__(self, ttl: Optional[float] = 300):
+        """
+        Initialize Resolver Object
+
+        Resolve host names to the addresses to connect to, caching results for `ttl` seconds so
+        that validating a host and then connecting to it -- or connecting to the same device
+        repeatedly -- only queries the system resolver once. Resolution uses `getaddrinfo`, so
+        both IPv4 and IPv6 addresses are returned, in the order the system prefers them. Failed
+        lookups are not cached.
+
+        Args:
+            ttl: seconds to cache resolved addresses for
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.ttl = ttl
+        self._lock = Lock()
+        # (host, port) -> (time.monotonic() the entry expires, addresses)
+        self._cache = {}
+
+    def resolve(self, host: str, port: int) -> List[Tuple[int, tuple]]:
+        """
+        Resolve a host to the addresses to connect to
+
+        Args:
+            host: ip address or host name
+            port: port to connect to
+
+        Returns:
+            list: tuples of address family and socket address, in order of preference
+
+        Raises:
+            socket.gaierror: if the host cannot be resolved
+
+        """
+        key = (host, port)
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        addresses = []
+        for family, _, _, _, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            if (family, sockaddr) not in addresses:
+                addresses.append((family, sockaddr))
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def resolve_all(
+        self, hosts: Iterable[Tuple[str, int]], max_workers: Optional[int] = 10
+    ) -> Dict[Tuple[str, int], List[Tuple[int, tuple]]]:
+        """
+        Resolve many hosts concurrently, i.e. to pre-resolve an inventory before connecting
+
+        Args:
+            hosts: iterable of (host, port) tuples
+            max_workers: max number of concurrent lookups
+
+        Returns:
+            dict: (host, port) to resolved addresses of the hosts that could be resolved
+
+        Raises:
+            N/A  # noqa
+
+        """
+
+        def _resolve(host_port):
+            try:
+                return host_port, self.resolve(*host_port)
+            except (socket.gaierror, UnicodeError) as exc:
+                session_log.info(f"Failed to resolve host {host_port[0]}: {exc}")
+                return host_port, None
+
+        hosts = list(set(hosts))
+        if not hosts:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(hosts))) as pool:
+            results = pool.map(_resolve, hosts)
+        return {host_port: addresses for host_port, addresses in results if addresses}
+
+    def resolve_hosts(self, hosts: Iterable[Dict[str, Any]], max_workers: Optional[int] = 10):
+        """
+        Pre-resolve host definitions (SSH2Net or netmiko style kwargs)
+
+        Args:
+            hosts: iterable of host definitions
+            max_workers: max number of concurrent lookups
+
+        Returns:
+            dict: (host, port) to resolved addresses of the hosts that could be resolved
+
+        Raises:
+            N/A  # noqa
+
+        """
+        host_ports = [host_port(host) for host in hosts]
+        return self.resolve_all([(name, port) for name, port in host_ports if name], max_workers)
+
+    def clear(self) -> None:
+        """
+        Clear the cache
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self._lock:
+            self._cache = {}
+
+
+RESOLVER = Resolver()
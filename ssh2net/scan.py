@@ -0,0 +1,207 @@
+"""ssh2net.scan"""
+import collections
+import errno
+import logging
+import os
+import selectors
+import socket
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from ssh2net.resolver import RESOLVER, host_port
+
+
+session_log = logging.getLogger("ssh2net_session")
+
+ScanResult = collections.namedtuple("ScanResult", "host port address rtt sock exception")
+ScanResults = collections.namedtuple("ScanResults", "reachable unreachable")
+
+CONNECT_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY}
+
+
+def socket_connected(sock: socket.socket) -> bool:
+    """
+    Check a connected socket has not been closed or reset by the peer since it was connected
+
+    Args:
+        sock: connected socket
+
+    Returns:
+        bool: True/False socket is still connected
+
+    Raises:
+        N/A  # noqa
+
+    """
+    timeout = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        # an ssh server sends its banner right away, so pending data is expected; only an orderly
+        # close (no data) or an error means the socket is unusable
+        return bool(sock.recv(1, socket.MSG_PEEK))
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+class SSH2NetScanner:
+    def __init__(
+        self,
+        timeout: Optional[float] = 5,
+        max_concurrent: Optional[int] = 512,
+        keep_sockets: Optional[bool] = False,
+        max_kept_sockets: Optional[int] = None,
+    ):
+        """
+        Initialize SSH2NetScanner Object
+
+        Pre-flight tcp reachability scan of an inventory. Non-blocking connects to all hosts are
+        issued concurrently from a single thread and completed with a selector, so scanning
+        costs roughly one `timeout` for the whole inventory rather than one per dead host. If a
+        host resolves to multiple addresses they are tried in order.
+
+        With `keep_sockets` the connected sockets of reachable hosts are kept open and returned,
+        ready to be handed to an SSH2Net object (set `conn.sock` before `open_shell`), so the
+        connect is not repeated. Every kept socket holds a file descriptor and is subject to the
+        login grace timer of the device, so only keep as many as will be used right away
+        (`max_kept_sockets`); sockets of the remaining reachable hosts are closed.
+
+        Results are keyed by (host, port) so that multiple entries for the same host -- i.e. ports
+        of a console server -- are kept apart.
+
+        Args:
+            timeout: seconds to wait for each connect
+            max_concurrent: max number of connects in flight at once
+            keep_sockets: True/False keep sockets of reachable hosts open and return them
+            max_kept_sockets: max number of sockets to keep open; None for no limit
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if max_concurrent is less than 1
+
+        """
+        if max_concurrent < 1:
+            raise ValueError(
+                f"Scanner requires at least one concurrent connect, got: {max_concurrent}"
+            )
+        self.timeout = timeout
+        self.max_concurrent = max_concurrent
+        self.keep_sockets = keep_sockets
+        self.max_kept_sockets = max_kept_sockets
+
+    def _connect(self, selector, attempt) -> Optional[OSError]:
+        """
+        Start a non-blocking connect to the next address of a host
+
+        Args:
+            selector: selector to register the connecting socket with
+            attempt: dict holding the host name, port and remaining addresses of the host
+
+        Returns:
+            OSError: if the connect failed immediately (or no socket could be created, i.e. out of
+                file descriptors), otherwise None
+
+        Raises:
+            N/A  # noqa
+
+        """
+        family, sockaddr = attempt["addresses"].pop(0)
+        attempt["address"] = sockaddr[0]
+        attempt["start"] = time.monotonic()
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError as exc:
+            return exc
+        sock.setblocking(False)
+        return_code = sock.connect_ex(sockaddr)
+        if return_code not in CONNECT_IN_PROGRESS:
+            sock.close()
+            return OSError(return_code, os.strerror(return_code))
+        attempt["sock"] = sock
+        selector.register(sock, selectors.EVENT_WRITE, attempt)
+        return None
+
+    def scan(self, hosts: Iterable[Dict[str, Any]]) -> ScanResults:
+        """
+        Scan host definitions (SSH2Net or netmiko style kwargs) for tcp reachability
+
+        Args:
+            hosts: iterable of host definitions
+
+        Returns:
+            ScanResults: namedtuple of "reachable" and "unreachable" dicts of (host, port) to
+                ScanResult (host, port, address, connect rtt in seconds, socket if kept and
+                exception if unreachable)
+
+        Raises:
+            N/A  # noqa
+
+        """
+        host_ports = list(dict.fromkeys(host_port(host) for host in hosts))
+        resolved = RESOLVER.resolve_all(host_ports)
+        reachable, unreachable = {}, {}
+        kept_sockets = 0
+        pending = collections.deque()
+        for host, port in host_ports:
+            if (host, port) not in resolved:
+                exception = socket.gaierror(f"Failed to resolve host {host}")
+                unreachable[host, port] = ScanResult(host, port, None, None, None, exception)
+                continue
+            pending.append({"host": host, "port": port, "addresses": list(resolved[host, port])})
+
+        def _failed(attempt, exception):
+            if attempt["addresses"]:
+                pending.appendleft(attempt)
+                return
+            session_log.info(f"Host {attempt['host']} on port {attempt['port']} unreachable")
+            unreachable[attempt["host"], attempt["port"]] = ScanResult(
+                attempt["host"], attempt["port"], attempt["address"], None, None, exception
+            )
+
+        with selectors.DefaultSelector() as selector:
+            while pending or selector.get_map():
+                while pending and len(selector.get_map()) < self.max_concurrent:
+                    attempt = pending.popleft()
+                    exception = self._connect(selector, attempt)
+                    if exception is not None:
+                        _failed(attempt, exception)
+                now = time.monotonic()
+                in_flight = [key.data for key in selector.get_map().values()]
+                if not in_flight:
+                    continue
+                next_expiry = min(attempt["start"] for attempt in in_flight) + self.timeout
+                for key, _ in selector.select(max(0, next_expiry - now)):
+                    attempt = key.data
+                    selector.unregister(key.fileobj)
+                    sock = attempt.pop("sock")
+                    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if error:
+                        sock.close()
+                        _failed(attempt, OSError(error, os.strerror(error)))
+                        continue
+                    rtt = time.monotonic() - attempt["start"]
+                    if self.keep_sockets and (
+                        self.max_kept_sockets is None or kept_sockets < self.max_kept_sockets
+                    ):
+                        # same socket mode as SSH2Net._socket_open leaves its sockets in
+                        sock.settimeout(self.timeout)
+                        kept_sockets += 1
+                    else:
+                        sock.close()
+                        sock = None
+                    reachable[attempt["host"], attempt["port"]] = ScanResult(
+                        attempt["host"], attempt["port"], attempt["address"], rtt, sock, None
+                    )
+                now = time.monotonic()
+                for key in list(selector.get_map().values()):
+                    attempt = key.data
+                    if now - attempt["start"] >= self.timeout:
+                        selector.unregister(key.fileobj)
+                        attempt.pop("sock").close()
+                        _failed(attempt, socket.timeout("timed out"))
+        return ScanResults(reachable, unreachable)
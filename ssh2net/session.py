@@ -1,15 +1,31 @@
 """ssh2net.session"""
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
 import logging
-from threading import Lock
+from threading import RLock
 import time
+from typing import Optional
 
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
 
 from ssh2net.channel import SSH2NetChannel
+from ssh2net.decorators import check_operation_deadline
+from ssh2net.exceptions import SessionLockTimeout
+from ssh2net.keepalive import KEEPALIVE_SCHEDULER
+from ssh2net.lock import SessionLock
 from ssh2net.session_miko import SSH2NetSessionParamiko
 from ssh2net.session_ssh2 import SSH2NetSessionSSH2
 
+# methods of the underlying "driver" (ssh2-python or paramiko) bound to SSH2NetSession objects
+DRIVER_METHODS = (
+    "_session_open_connect",
+    "_session_public_key_auth",
+    "_session_password_auth",
+    "_channel_open_driver",
+    "_channel_invoke_shell",
+    "_channel_open_exec",
+    "_channel_read_exec",
+    "_channel_wait_exec",
+)
+
 
 class SSH2NetSession(SSH2NetChannel):
     def _session_alive(self):
@@ -34,61 +50,61 @@ class SSH2NetSession(SSH2NetChannel):
             logging.debug(f"Session to host {self.host} has never been created")
             return False
 
-    def _keepalive_thread(self) -> None:
+    def _session_keepalive_send(self) -> Optional[float]:
         """
-        Attempt to keep sessions alive.
+        Send a keepalive if one is due; called from the keepalive scheduler thread
+
+        In the case of "networking" equipment this will try to acquire the session lock and send
+        an innocuous character -- such as CTRL+E -- to keep the device "exec-timeout" from
+        expiring. If an operation currently holds the lock the keepalive is retried shortly.
 
-        In the case of "networking" equipment this will try to acquire a session lock and send an
-        innocuous character -- such as CTRL+E -- to keep the device "exec-timeout" from expiring.
+        For "normal" devices that allow for a standard ssh keepalive, a standard ssh keepalive is
+        sent, again only if no other thread is in the middle of session i/o. This will likely break
+        (for "normal" devices) if using paramiko for the underlying driver, but has not been tested
+        yet!
 
-        For "normal" devices that allow for a standard ssh keepalive, this thread will simply use
-        those mechanisms to maintain the session. This will likely break (for "normal" devices) if
-        using paramiko for the underlying driver, but has not been tested yet!
+        In both cases no keepalive is sent if the channel has seen traffic within the keepalive
+        interval.
 
         Args:
             N/A  # noqa
 
         Returns:
-            N/A  # noqa
+            float: seconds until the next keepalive is due, or None to stop sending keepalives
 
         Raises:
             N/A  # noqa
 
         """
-        lock_counter = 0
-        last_keepalive = datetime.now()
+        if not self._session_alive():
+            return None
+        idle_time = time.monotonic() - self._last_activity
+        if idle_time < self.session_keepalive_interval:
+            return self.session_keepalive_interval - idle_time
         if self.session_keepalive_type == "network":
-            while True:
-                if not self._session_alive():
-                    return
-                diff = datetime.now() - last_keepalive
-                if diff.seconds >= self.session_keepalive_interval:
-                    if not self.session_lock.locked():
-                        lock_counter = 0
-                        self.session_lock.acquire_lock()
-                        self.channel.write(self.session_keepalive_pattern)
-                        self.session_lock.release_lock()
-                        last_keepalive = datetime.now()
-                    else:
-                        lock_counter += 1
-                        if lock_counter >= 3:
-                            print(
-                                f"Keepalive thread missed {lock_counter} consecutive keepalives..."
-                            )
-                time.sleep(self.session_keepalive_interval / 10)
-        elif self.session_keepalive_type == "standard":
-            self.session.keepalive_config(
-                want_reply=False, interval=self.session_keepalive_interval
-            )
-            while True:
-                if not self._session_alive():
-                    return
+            # never queue up behind operations, only send a keepalive if the lock is free
+            if not self.session_lock.acquire(blocking=False):
+                logging.debug(f"Keepalive to host {self.host} delayed, session lock is held")
+                return self.session_keepalive_interval / 10
+            try:
+                self._channel_write(self.session_keepalive_pattern)
+            finally:
+                self.session_lock.release_lock()
+        else:
+            # a channel read/write may be blocked in libssh2, don't wait behind it
+            if not self.session_io_lock.acquire(blocking=False):
+                logging.debug(f"Keepalive to host {self.host} delayed, session io lock is held")
+                return self.session_keepalive_interval / 10
+            try:
                 self.session.keepalive_send()
-                time.sleep(self.session_keepalive_interval / 10)
+            finally:
+                self.session_io_lock.release()
+            self._last_activity = time.monotonic()
+        return self.session_keepalive_interval
 
     def _session_keepalive(self) -> None:
         """
-        Spawn keepalive thread for ssh session
+        Register session with the (process wide) keepalive scheduler
 
         Args:
             N/A  # noqa
@@ -102,12 +118,15 @@ class SSH2NetSession(SSH2NetChannel):
         """
         if not self.session_keepalive:
             return
-        pool = ThreadPoolExecutor()
-        pool.submit(self._keepalive_thread)
+        if self.session_keepalive_type == "standard":
+            self.session.keepalive_config(
+                want_reply=False, interval=self.session_keepalive_interval
+            )
+        KEEPALIVE_SCHEDULER.register(self, self.session_keepalive_interval)
 
-    def _acquire_session_lock(self) -> None:
+    def _session_keepalive_stop(self) -> None:
         """
-        Attempt to acquire session lock
+        Unregister session from the keepalive scheduler
 
         Args:
             N/A  # noqa
@@ -119,14 +138,38 @@ class SSH2NetSession(SSH2NetChannel):
             N/A  # noqa
 
         """
-        while True:
-            if not self.session_lock.locked():
-                self.session_lock.acquire_lock()
-                return
+        KEEPALIVE_SCHEDULER.unregister(self)
 
-    def _session_open(self) -> None:
+    def _acquire_session_lock(self) -> None:
         """
-        Open SSH session
+        Acquire session lock; waits (in turn) for any other operations on the connection to finish
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            SessionLockTimeout: if the lock is not acquired within `session_lock_timeout` seconds
+            TimeoutError: if the deadline of the current operation passes while waiting
+
+        """
+        lock_timeout = self.session_lock_timeout or None
+        remaining = check_operation_deadline()
+        if remaining is not None and (lock_timeout is None or remaining < lock_timeout):
+            if not self.session_lock.acquire(timeout=remaining):
+                raise TimeoutError
+            return
+        if not self.session_lock.acquire(timeout=lock_timeout):
+            raise SessionLockTimeout(
+                f"Timed out after {self.session_lock_timeout}s waiting for session lock for host "
+                f"{self.host}"
+            )
+
+    def _session_bind_driver(self) -> None:
+        """
+        Bind the underlying "driver" (ssh2-python or paramiko) methods to this object
 
         Args:
             N/A  # noqa
@@ -138,48 +181,42 @@ class SSH2NetSession(SSH2NetChannel):
             N/A  # noqa
 
         """
+        # a copy of a connection (see `open_shell_channel`) carries the methods bound to the
+        # original's driver in its __dict__; drop them, or the driver object created for the copy
+        # (which shares the copy's __dict__) would look them up instead of its own methods
+        for method in DRIVER_METHODS:
+            self.__dict__.pop(method, None)
         if self.setup_use_paramiko is False:
-            ssh2_session_obj = SSH2NetSessionSSH2(self)
-            self._session_open_connect = (
-                ssh2_session_obj._session_open_connect  # pylint: disable=W0212
-            )
-            self._session_public_key_auth = (
-                ssh2_session_obj._session_public_key_auth  # pylint: disable=W0212
-            )
-            self._session_password_auth = (
-                ssh2_session_obj._session_password_auth  # pylint: disable=W0212
-            )
-            self._channel_open_driver = (
-                ssh2_session_obj._channel_open_driver  # pylint: disable=W0212
-            )
-            self._channel_invoke_shell = (
-                ssh2_session_obj._channel_invoke_shell  # pylint: disable=W0212
-            )
+            session_driver = SSH2NetSessionSSH2(self)
         else:
-            miko_sesion_obj = SSH2NetSessionParamiko(self)
-            self._session_open_connect = (
-                miko_sesion_obj._session_open_connect  # pylint: disable=W0212
-            )
-            self._session_public_key_auth = (
-                miko_sesion_obj._session_public_key_auth  # pylint: disable=W0212
-            )
-            self._session_password_auth = (
-                miko_sesion_obj._session_password_auth  # pylint: disable=W0212
-            )
-            self._channel_open_driver = (
-                miko_sesion_obj._channel_open_driver  # pylint: disable=W0212
-            )
-            self._channel_invoke_shell = (
-                miko_sesion_obj._channel_invoke_shell  # pylint: disable=W0212
-            )
+            session_driver = SSH2NetSessionParamiko(self)
+        for method in DRIVER_METHODS:
+            setattr(self, method, getattr(session_driver, method))
 
+    def _session_open(self) -> None:
+        """
+        Open SSH session
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._session_bind_driver()
         if not self._socket_alive():
             self._socket_open()
         if not self._session_alive():
             self._session_open_connect()
 
         logging.debug(f"Session to host {self.host} opened")
-        self.session_lock = Lock()
+        self.session_lock = SessionLock()
+        # serializes libssh2 calls when the session is shared by multiple shell channels
+        self.session_io_lock = RLock()
         if self.auth_public_key:
             self._session_public_key_auth()
             if self._session_alive():
@@ -288,6 +325,9 @@ class SSH2NetSession(SSH2NetChannel):
 
         """
         if self.channel is not None:  # pylint: disable=E0203
-            self.channel.close  # noqa
+            with self.session_io_lock:
+                while self.channel.close() == LIBSSH2_ERROR_EAGAIN:
+                    self._wait_channel_ready(self.session_timeout / 1000 or None)
             self.channel = None
+            self._ansi_stripper = None
             logging.debug(f"Channel to host {self.host} closed")
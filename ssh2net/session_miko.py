@@ -1,5 +1,6 @@
 """ssh2net.session_miko"""
 import logging
+import selectors
 import time
 import warnings
 
@@ -9,6 +10,9 @@ from ssh2net.exceptions import AuthenticationFailed, RequirementsNotSatisfied
 
 
 class SSH2NetSessionParamiko:
+    # p_self is kept out of the (shared) __dict__ so copies of p_self don't inherit it
+    __slots__ = ("__dict__", "_p_self")
+
     def __init__(self, p_self):
         """
         Initialize SSH2NetSessionParamiko Object
@@ -30,9 +34,29 @@ class SSH2NetSessionParamiko:
 
         """
         self.__dict__ = p_self.__dict__
-        self._session_alive = p_self._session_alive
-        self._session_open = p_self._session_open
-        self._channel_alive = p_self._channel_alive
+        self._p_self = p_self
+
+    def __getattr__(self, name):
+        """
+        Look up methods of the SSH2Net object -- i.e. `_session_alive` -- on the SSH2Net object
+
+        Methods are resolved on every lookup rather than stored as bound methods in the shared
+        __dict__, so that a copy of the SSH2Net object (see `open_shell_channel`) binding its own
+        driver never calls methods bound to the original object.
+
+        Args:
+            name: name of the attribute
+
+        Returns:
+            attribute: attribute of the SSH2Net object
+
+        Raises:
+            AttributeError: if the SSH2Net object has no such attribute
+
+        """
+        if name == "_p_self":
+            raise AttributeError(name)
+        return getattr(self._p_self, name)
 
     def _session_open_connect(self) -> None:
         """
@@ -168,11 +192,77 @@ class SSH2NetSessionParamiko:
         self._shell = True
         self.channel.invoke_shell()
         self.channel.read = self._paramiko_read_channel
-        self.channel.write = self.channel.sendall
+        self.channel.write = self._paramiko_write_channel
         self.session.set_blocking = self._set_blocking
         self.channel.flush = self._flush
 
-    def _paramiko_read_channel(self):
+    def _channel_open_exec(self, command: str):
+        """
+        Open a new channel on the existing transport and execute a command on it
+
+        Args:
+            command: command to execute
+
+        Returns:
+            channel: paramiko channel the command is executing on
+
+        Raises:
+            N/A  # noqa
+
+        """
+        channel = self.session.open_session()
+        channel.exec_command(command)
+        channel.setblocking(False)
+        logging.debug(f"Exec channel to host {self.host} opened for command: {command}")
+        return channel
+
+    @staticmethod
+    def _channel_read_exec(channel, size: int):
+        """
+        Read from an exec channel without blocking
+
+        Args:
+            channel: paramiko channel to read from
+            size: max number of bytes to read
+
+        Returns:
+            output: bytes read, empty bytes if the channel is at EOF, or None if no data is
+                available yet
+
+        Raises:
+            N/A  # noqa
+
+        """
+        if channel.recv_ready():
+            return channel.recv(size)
+        if channel.eof_received or channel.closed:
+            return b""
+        return None
+
+    @staticmethod
+    def _channel_wait_exec(channels, timeout):
+        """
+        Wait for any exec channel to have data available
+
+        Paramiko reads the socket in its own thread, so wait on the channels themselves.
+
+        Args:
+            channels: list of paramiko channels being read
+            timeout: seconds to wait; None waits indefinitely
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with selectors.DefaultSelector() as channel_selector:
+            for channel in channels:
+                channel_selector.register(channel, selectors.EVENT_READ)
+            channel_selector.select(timeout)
+
+    def _paramiko_read_channel(self, size=None):
         """
         Patch channel.read method for paramiko driver
 
@@ -180,7 +270,7 @@ class SSH2NetSessionParamiko:
         from the channel, patch this for parity with "ssh2-python".
 
         Args:
-            N/A  # noqa
+            size: max number of bytes to read; defaults to `comms_read_size`
 
         Returns:
             N/A  # noqa
@@ -189,9 +279,29 @@ class SSH2NetSessionParamiko:
             N/A  # noqa
 
         """
-        channel_read = self.channel.recv(1024)
+        channel_read = self.channel.recv(size or self.comms_read_size)
         return None, channel_read
 
+    def _paramiko_write_channel(self, channel_input):
+        """
+        Patch channel.write method for paramiko driver
+
+        "ssh2-python" returns a tuple of return code and bytes written, "paramiko" `sendall`
+        returns nothing, patch this for parity with "ssh2-python".
+
+        Args:
+            channel_input: string or bytes to write to channel
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.channel.sendall(channel_input)
+        return None, len(channel_input)
+
     def _flush(self):
         """
         Patch a "flush" method for paramiko driver
@@ -1,6 +1,7 @@
 """ssh2net.session_ssh2"""
 import logging
 
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
 from ssh2.session import Session
 from ssh2.exceptions import AuthenticationError
 
@@ -8,6 +9,9 @@ from ssh2net.exceptions import AuthenticationFailed
 
 
 class SSH2NetSessionSSH2:
+    # p_self is kept out of the (shared) __dict__ so copies of p_self don't inherit it
+    __slots__ = ("__dict__", "_p_self")
+
     def __init__(self, p_self):
         """
         Initialize SSH2NetSessionSSH2 Object
@@ -27,9 +31,29 @@ class SSH2NetSessionSSH2:
 
         """
         self.__dict__ = p_self.__dict__
-        self._session_alive = p_self._session_alive
-        self._session_open = p_self._session_open
-        self._channel_alive = p_self._channel_alive
+        self._p_self = p_self
+
+    def __getattr__(self, name):
+        """
+        Look up methods of the SSH2Net object -- i.e. `_session_alive` -- on the SSH2Net object
+
+        Methods are resolved on every lookup rather than stored as bound methods in the shared
+        __dict__, so that a copy of the SSH2Net object (see `open_shell_channel`) binding its own
+        driver never calls methods bound to the original object.
+
+        Args:
+            name: name of the attribute
+
+        Returns:
+            attribute: attribute of the SSH2Net object
+
+        Raises:
+            AttributeError: if the SSH2Net object has no such attribute
+
+        """
+        if name == "_p_self":
+            raise AttributeError(name)
+        return getattr(self._p_self, name)
 
     def _session_open_connect(self) -> None:
         """
@@ -158,3 +182,78 @@ class SSH2NetSessionSSH2:
         """
         self._shell = True
         self.channel.shell()
+
+    def _channel_open_exec(self, command: str):
+        """
+        Open a new channel on the existing session and execute a command on it
+
+        Works in blocking and non-blocking mode; in non-blocking mode waits on the socket
+        whenever libssh2 would block. The session io lock is held for each libssh2 call only.
+
+        Args:
+            command: command to execute
+
+        Returns:
+            channel: ssh2-python channel the command is executing on
+
+        Raises:
+            N/A  # noqa
+
+        """
+        # only hold the session io lock for the libssh2 calls, not while waiting on the socket
+        while True:
+            with self.session_io_lock:
+                channel = self.session.open_session()
+            if channel != LIBSSH2_ERROR_EAGAIN:
+                break
+            self._wait_channel_ready(self.session_timeout / 1000 or None)
+        while True:
+            with self.session_io_lock:
+                return_code = channel.execute(command)
+            if return_code != LIBSSH2_ERROR_EAGAIN:
+                break
+            self._wait_channel_ready(self.session_timeout / 1000 or None)
+        logging.debug(f"Exec channel to host {self.host} opened for command: {command}")
+        return channel
+
+    def _channel_read_exec(self, channel, size: int):
+        """
+        Read from an exec channel without blocking
+
+        Args:
+            channel: ssh2-python channel to read from
+            size: max number of bytes to read
+
+        Returns:
+            output: bytes read, empty bytes if the channel is at EOF, or None if no data is
+                available yet
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return_code, output = channel.read(size)
+        if return_code == LIBSSH2_ERROR_EAGAIN:
+            return None
+        if return_code == 0 and not channel.eof():
+            return None
+        return output
+
+    def _channel_wait_exec(self, channels, timeout):  # pylint: disable=W0613
+        """
+        Wait for any exec channel to have data available
+
+        All channels share the session socket, so simply wait on that.
+
+        Args:
+            channels: list of channels being read
+            timeout: seconds to wait; None waits indefinitely
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self._wait_channel_ready(timeout)
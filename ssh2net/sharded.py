@@ -0,0 +1,402 @@
+"""ssh2net.sharded"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+from threading import Lock
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ssh2net.fleet import FleetResult, create_connection
+from ssh2net.resolver import RESOLVER, host_port
+
+
+session_log = logging.getLogger("ssh2net_session")
+
+# seconds between checks that worker processes are still alive while waiting for results
+WORKER_POLL_INTERVAL = 1
+
+
+def _picklable_exception(exc: Exception) -> Exception:
+    """
+    Return an exception that can be sent back to the parent process
+
+    Args:
+        exc: exception raised in a worker process
+
+    Returns:
+        exc: the exception itself if it can be pickled, otherwise a RuntimeError describing it
+
+    Raises:
+        N/A  # noqa
+
+    """
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:  # pylint: disable=W0703
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+    return exc
+
+
+def _shard_worker(hosts: Dict[int, Dict[str, Any]], command_queue, result_queue, max_workers):
+    """
+    Worker process of SSH2NetShardedExecutor; owns the connections of one shard of hosts
+
+    Connections are opened on first use and kept open for subsequent commands; a connection an
+    operation failed on is closed and re-opened for the next command. Commands for different
+    hosts run concurrently on a thread pool, commands for the same host run one after another.
+
+    Args:
+        hosts: dict of host id to host definition of the hosts in this shard
+        command_queue: queue of (request id, host id, operation, args, kwargs) to run; None to
+            close all connections and exit
+        result_queue: queue to put (request id, FleetResult) on
+        max_workers: max number of commands to run concurrently
+
+    Returns:
+        N/A  # noqa
+
+    Raises:
+        N/A  # noqa
+
+    """
+    connections = {}
+    connection_locks = {host_id: Lock() for host_id in hosts}
+
+    def _close(host_id):
+        conn = connections.pop(host_id, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception as exc:  # pylint: disable=W0703
+                session_log.debug(f"Failed to close connection to host {conn.host}: {exc}")
+
+    def _execute(request_id, host_id, operation, args, kwargs):
+        host = hosts[host_id]
+        host_name = host_port(host)[0]
+        start_time = time.monotonic()
+        result, exception = None, None
+        with connection_locks[host_id]:
+            try:
+                conn = connections.get(host_id)
+                if conn is None:
+                    conn = create_connection(host)
+                    connections[host_id] = conn
+                    conn.open_shell()
+                result = getattr(conn, operation)(*args, **kwargs)
+            except Exception as exc:  # pylint: disable=W0703
+                session_log.warning(f"Operation {operation} on host {host_name} failed: {exc}")
+                exception = _picklable_exception(exc)
+                _close(host_id)
+        result_queue.put(
+            (request_id, FleetResult(host_name, result, exception, time.monotonic() - start_time))
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while True:
+            command = command_queue.get()
+            if command is None:
+                break
+            pool.submit(_execute, *command)
+    for host_id in list(connections):
+        _close(host_id)
+
+
+class SSH2NetShardedExecutor:
+    def __init__(
+        self,
+        hosts: List[Dict[str, Any]],
+        processes: Optional[int] = None,
+        max_workers: Optional[int] = 10,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize SSH2NetShardedExecutor Object
+
+        Spread devices across worker processes so decoding, prompt matching and parsing scale
+        beyond a single core. Hosts are assigned round robin to `processes` worker processes; each
+        worker owns the connections to its hosts -- connections are opened in the worker on first
+        use and stay open there, live sessions never cross process boundaries. The parent submits
+        commands to the workers over queues and collects results from a shared result queue.
+
+        Host definitions are the same as for SSH2NetFleet; host definitions, operation arguments
+        and results must be picklable. When using the "spawn" (or "forkserver") start method the
+        usual `if __name__ == "__main__":` guard is required in the calling script.
+
+        Args:
+            hosts: list of host definitions
+            processes: number of worker processes; defaults to the number of cpus
+            max_workers: max number of commands each worker process runs concurrently
+            start_method: multiprocessing start method; None for the platform default
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if processes or max_workers is less than 1
+
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes < 1 or max_workers < 1:
+            raise ValueError(
+                f"Sharded executor requires at least one process and one worker, got: "
+                f"{processes} processes, {max_workers} workers"
+            )
+        self.hosts = hosts
+        context = multiprocessing.get_context(start_method)
+        self._result_queue = context.Queue()
+        self._command_queues = []
+        self._processes = []
+        self._host_shard = {}
+        self._request_ids = count()
+        # request id -> host id of requests no result has been received for yet
+        self._pending = {}
+        # results received while waiting for results of other requests
+        self._unclaimed = []
+        # resolve the whole inventory before starting (forking) the workers, so the cached
+        # addresses are inherited by the workers
+        RESOLVER.resolve_hosts(hosts, max_workers)
+        shards = [{} for _ in range(min(processes, len(hosts)) or 1)]
+        for host_id, host in enumerate(hosts):
+            shards[host_id % len(shards)][host_id] = host
+            self._host_shard[host_id] = host_id % len(shards)
+        for shard in shards:
+            command_queue = context.Queue()
+            process = context.Process(
+                target=_shard_worker,
+                args=(shard, command_queue, self._result_queue, max_workers),
+                daemon=True,
+            )
+            process.start()
+            self._command_queues.append(command_queue)
+            self._processes.append(process)
+
+    def __enter__(self):
+        """
+        Enter method for context manager
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            self: instance of self
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """
+        Exit method to cleanup for context manager
+
+        Args:
+            exception_type: exception type being raised
+            exception_value: message from exception being raised
+            traceback: traceback from exception being raised
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.close()
+
+    def submit(self, host_id: int, operation: str, *args, **kwargs) -> int:
+        """
+        Submit an operation for a single host to the worker owning it
+
+        Args:
+            host_id: index of the host in `hosts`
+            operation: name of the connection method to call, i.e. "send_command"
+            *args: positional arguments for the operation
+            **kwargs: keyword arguments for the operation
+
+        Returns:
+            int: request id; matches the request id returned with the result by `get_result`
+
+        Raises:
+            N/A  # noqa
+
+        """
+        request_id = next(self._request_ids)
+        self._pending[request_id] = host_id
+        self._command_queues[self._host_shard[host_id]].put(
+            (request_id, host_id, operation, args, kwargs)
+        )
+        return request_id
+
+    def _fail_dead_shards(self) -> None:
+        """
+        Fail pending requests of worker processes that have exited unexpectedly
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        dead_shards = {
+            shard for shard, process in enumerate(self._processes) if not process.is_alive()
+        }
+        if not dead_shards:
+            return
+        for request_id, host_id in list(self._pending.items()):
+            if self._host_shard[host_id] in dead_shards:
+                del self._pending[request_id]
+                exception = RuntimeError("Worker process exited unexpectedly")
+                host_name = host_port(self.hosts[host_id])[0]
+                self._unclaimed.append((request_id, FleetResult(host_name, None, exception, 0.0)))
+
+    def get_result(self, timeout: Optional[float] = None) -> Tuple[int, FleetResult]:
+        """
+        Get the next result of any submitted request
+
+        Args:
+            timeout: seconds to wait for a result; None waits until a result is available
+
+        Returns:
+            tuple: request id and FleetResult
+
+        Raises:
+            queue.Empty: if no result is available within timeout
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._unclaimed:
+            wait_timeout = WORKER_POLL_INTERVAL
+            if deadline is not None:
+                wait_timeout = min(wait_timeout, max(0, deadline - time.monotonic()))
+            try:
+                request_id, result = self._result_queue.get(timeout=wait_timeout)
+            except queue.Empty:
+                self._fail_dead_shards()
+                if deadline is not None and time.monotonic() >= deadline and not self._unclaimed:
+                    raise
+                continue
+            self._pending.pop(request_id, None)
+            return request_id, result
+        return self._unclaimed.pop(0)
+
+    def run(self, operation: str, *args, **kwargs) -> Iterator[FleetResult]:
+        """
+        Run an operation on all hosts; yield per host results as they complete
+
+        Args:
+            operation: name of the connection method to call, i.e. "send_inputs"
+            *args: positional arguments for the operation
+            **kwargs: keyword arguments for the operation
+
+        Yields:
+            FleetResult: namedtuple of host, result (None if failed), exception (None if
+                succeeded) and elapsed seconds
+
+        Raises:
+            N/A  # noqa
+
+        """
+        request_ids = {
+            self.submit(host_id, operation, *args, **kwargs) for host_id in range(len(self.hosts))
+        }
+        unclaimed = []
+        try:
+            while request_ids:
+                request_id, result = self.get_result()
+                if request_id in request_ids:
+                    request_ids.remove(request_id)
+                    yield result
+                else:
+                    unclaimed.append((request_id, result))
+        finally:
+            # results of other requests stay available to `get_result`
+            self._unclaimed.extend(unclaimed)
+
+    def send_inputs(self, inputs, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send inputs to all hosts; yield per host results as they complete
+
+        Args:
+            inputs: list of strings or string of inputs to send to each host
+            **kwargs: keyword arguments for send_inputs
+
+        Yields:
+            FleetResult: per host result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_inputs", inputs, **kwargs)
+
+    def send_command(self, commands, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send command(s) to all hosts; yield per host results as they complete
+
+        Requires hosts to be connected with a driver (a "driver" or "device_type" key)
+
+        Args:
+            commands: string or list of strings to send to each host in privilege exec mode
+            **kwargs: keyword arguments for send_command
+
+        Yields:
+            FleetResult: per host result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_command", commands, **kwargs)
+
+    def send_config_set(self, configs, **kwargs) -> Iterator[FleetResult]:
+        """
+        Send configuration(s) to all hosts; yield per host results as they complete
+
+        Requires hosts to be connected with a driver (a "driver" or "device_type" key)
+
+        Args:
+            configs: string or list of strings to send to each host in config mode
+            **kwargs: keyword arguments for send_config_set, i.e. bulk=True
+
+        Yields:
+            FleetResult: per host result
+
+        Raises:
+            N/A  # noqa
+
+        """
+        yield from self.run("send_config_set", configs, **kwargs)
+
+    def close(self, timeout: Optional[float] = 30) -> None:
+        """
+        Close all connections and stop the worker processes
+
+        Commands already submitted are completed first.
+
+        Args:
+            timeout: seconds to wait for each worker process to exit before terminating it
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        for command_queue in self._command_queues:
+            command_queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._command_queues = []
+        self._processes = []
@@ -0,0 +1,153 @@
+"""ssh2net.shells"""
+from contextlib import contextmanager
+from queue import Queue
+from typing import Iterator, List, Optional, Tuple
+
+
+class SSH2NetShellGroup:
+    def __init__(self, conn, shells: Optional[int] = 2):
+        """
+        Initialize SSH2NetShellGroup Object
+
+        Group of interactive shell channels all opened on the single ssh session of a connection,
+        inputs sent to the group are dispatched to whichever shell channel is idle. This allows
+        one device to serve several concurrent callers (i.e. threads) without logging in once per
+        caller. The connection's own shell (opened if it is not already) is a member of the group.
+
+        Args:
+            conn: SSH2Net object (or driver) to open shell channels on
+            shells: total number of shell channels in the group, including the connection's own
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            ValueError: if shells is less than 1
+
+        """
+        if shells < 1:
+            raise ValueError(f"Shell group requires at least one shell, got: {shells}")
+        self.conn = conn
+        if not conn._shell:  # pylint: disable=W0212
+            conn.open_shell()
+        self.shells = [conn]
+        self._idle_shells = Queue()
+        self._idle_shells.put(conn)
+        for _ in range(shells - 1):
+            shell = conn.open_shell_channel()
+            self.shells.append(shell)
+            self._idle_shells.put(shell)
+
+    def __enter__(self):
+        """
+        Enter method for context manager
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            self: instance of self
+
+        Raises:
+            N/A  # noqa
+
+        """
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        """
+        Exit method to cleanup for context manager
+
+        Args:
+            exception_type: exception type being raised
+            exception_value: message from exception being raised
+            traceback: traceback from exception being raised
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        self.close()
+
+    @contextmanager
+    def shell(self) -> Iterator:
+        """
+        Check out an idle shell channel for exclusive use; waits until one is available
+
+        Args:
+            N/A  # noqa
+
+        Yields:
+            shell: SSH2Net object of the checked out shell channel
+
+        Raises:
+            N/A  # noqa
+
+        """
+        shell = self._idle_shells.get()
+        try:
+            yield shell
+        finally:
+            self._idle_shells.put(shell)
+
+    def send_inputs(self, inputs, strip_prompt: Optional[bool] = True, **kwargs) -> List[str]:
+        """
+        Send inputs on the next idle shell channel and return results
+
+        Args:
+            inputs: list of strings or string of inputs to send to channel
+            strip_prompt: strip prompt or not, defaults to True (yes, strip the prompt)
+            **kwargs: passed through to `send_inputs`
+
+        Returns:
+            result: list of output from the input command(s)
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self.shell() as shell:
+            return shell.send_inputs(inputs, strip_prompt=strip_prompt, **kwargs)
+
+    def send_inputs_interact(self, inputs, hidden_response=False) -> List[Tuple[str, bytes]]:
+        """
+        Interact with the device on the next idle shell channel and return results
+
+        Args:
+            inputs: tuple (or list of tuples) of input, expectation, response and finale
+            hidden_response: True/False response is hidden (i.e. password input)
+
+        Returns:
+            result: list of output from the input command(s)
+
+        Raises:
+            N/A  # noqa
+
+        """
+        with self.shell() as shell:
+            return shell.send_inputs_interact(inputs, hidden_response=hidden_response)
+
+    def close(self) -> None:
+        """
+        Close the additional shell channels of the group
+
+        The connection itself (and so the session) is left open.
+
+        Args:
+            N/A  # noqa
+
+        Returns:
+            N/A  # noqa
+
+        Raises:
+            N/A  # noqa
+
+        """
+        for shell in self.shells[1:]:
+            shell.close()
+        self.shells = self.shells[:1]
+        self._idle_shells = Queue()
+        self._idle_shells.put(self.conn)
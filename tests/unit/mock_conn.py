@@ -0,0 +1,86 @@
+import os
+from threading import Lock
+import time
+
+from ssh2net.decorators import check_operation_deadline
+
+
+class UnpicklableError(Exception):
+    def __init__(self, lock):
+        super().__init__("unpicklable")
+        self.lock = lock
+
+
+class MockConn:
+    # module level so the sharded executor's worker processes can unpickle host definitions
+    active = 0
+    max_active = 0
+    connections = 0
+    lock = Lock()
+
+    def __init__(self, setup_host, auth_user="", delay=0.0, fail=False, hang=False, healthy=True):
+        self.host = setup_host
+        self.auth_user = auth_user
+        self.delay = delay
+        self.fail = fail
+        self.hang = hang
+        self.healthy = healthy
+        self.opened = False
+        self.closed = False
+        self.privs = []
+        self.default_desired_priv = "privilege_exec"
+        self.connection_id = None
+
+    def open_shell(self):
+        with MockConn.lock:
+            MockConn.active += 1
+            MockConn.max_active = max(MockConn.max_active, MockConn.active)
+            MockConn.connections += 1
+            self.connection_id = MockConn.connections
+        self.opened = True
+
+    def _session_alive(self):
+        return not self.closed
+
+    def _channel_alive(self):
+        return not self.closed
+
+    def attain_priv(self, desired_priv):
+        if not self.healthy:
+            raise TimeoutError
+        self.privs.append(desired_priv)
+
+    def send_inputs(self, inputs):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("bad device")
+        while self.hang:
+            # emulate a read loop waiting on a device that never answers
+            check_operation_deadline()
+            time.sleep(0.001)
+        return [f"{self.host}: {inputs}"]
+
+    def connection_info(self):
+        return [os.getpid(), self.connection_id]
+
+    @staticmethod
+    def raise_unpicklable():
+        raise UnpicklableError(Lock())
+
+    @staticmethod
+    def crash():
+        os._exit(1)
+
+    def close(self):
+        with MockConn.lock:
+            MockConn.active -= 1
+        self.closed = True
+
+
+class MockDriverConn(MockConn):
+    def send_command(self, commands, **kwargs):
+        return [f"{self.host}: {commands}", kwargs]
+
+
+def mock_host(name="device", **kwargs):
+    return {"setup_host": name, "driver": MockConn, **kwargs}
@@ -0,0 +1,200 @@
+import asyncio
+import socket
+
+import pytest
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
+from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND
+
+from ssh2net import AsyncEOSDriver, AsyncIOSXEDriver, AsyncSSH2Net
+from ssh2net.resolver import RESOLVER
+
+
+class MockSession:
+    keepalives = 0
+
+    @staticmethod
+    def block_directions():
+        return LIBSSH2_SESSION_BLOCK_INBOUND
+
+    @staticmethod
+    def userauth_authenticated():
+        return True
+
+    def keepalive_send(self):
+        self.keepalives += 1
+        return 0
+
+
+class MockChannel:
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.writes = []
+        self._eof = False
+
+    def eof(self):
+        return self._eof
+
+    def read(self, size=1024):
+        if not self.reads:
+            return LIBSSH2_ERROR_EAGAIN, b""
+        return self.reads.pop(0)
+
+    def write(self, channel_input):
+        self.writes.append(channel_input)
+        return len(channel_input), len(channel_input)
+
+
+def _mock_conn(reads, conn_class=AsyncSSH2Net, **kwargs):
+    conn = conn_class(setup_host="my_device", **kwargs)
+    conn.session = MockSession()
+    conn.channel = MockChannel(reads)
+    conn.sock, conn.peer_sock = socket.socketpair()
+    conn.session_lock = asyncio.Lock()
+    return conn
+
+
+def _run(coroutine):
+    # asyncio.run is not available on python 3.6
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_paramiko_not_supported():
+    with pytest.raises(ValueError):
+        AsyncSSH2Net(setup_host="my_device", setup_use_paramiko=True)
+
+
+def test__read_until_prompt_waits_on_socket():
+    conn = _mock_conn([(12, b"\r\nsomedata\r\n"), (LIBSSH2_ERROR_EAGAIN, b""), (7, b"3560CX#")])
+
+    async def _read():
+        asyncio.get_event_loop().call_later(0.01, conn.peer_sock.send, b"data")
+        return await conn._read_until_prompt()
+
+    assert _run(_read()) == b"\r\nsomedata\r\n3560CX#"
+
+
+def test__socket_open_no_addresses(monkeypatch):
+    monkeypatch.setattr(RESOLVER, "resolve", lambda host, port: [])
+    conn = AsyncSSH2Net(setup_host="127.0.0.1")
+    with pytest.raises(socket.gaierror):
+        _run(conn._socket_open())
+
+
+def test__channel_read_eof():
+    conn = _mock_conn([(0, b"")])
+    conn.channel._eof = True
+    with pytest.raises(EOFError):
+        _run(conn._read_until_prompt())
+
+
+def test__channel_read_empty_read_yields_to_loop():
+    conn = _mock_conn([(0, b"")] * 3 + [(7, b"3560CX#")])
+    ticks = []
+
+    async def _tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def _read():
+        ticker = asyncio.ensure_future(_tick())
+        output = await conn._read_until_prompt()
+        ticker.cancel()
+        return output
+
+    assert _run(_read()) == b"3560CX#"
+    assert ticks
+
+
+def test__session_keepalive_skipped_during_operation():
+    conn = _mock_conn([], session_keepalive_interval=0.01, session_keepalive_type="standard")
+
+    async def _keepalive():
+        await conn.session_lock.acquire()
+        keepalive = asyncio.ensure_future(conn._session_keepalive())
+        await asyncio.sleep(0.05)
+        sent_during_operation = conn.session.keepalives
+        conn.session_lock.release()
+        await asyncio.sleep(0.05)
+        keepalive.cancel()
+        return sent_during_operation
+
+    assert _run(_keepalive()) == 0
+    assert conn.session.keepalives > 0
+
+
+def test_send_inputs():
+    conn = _mock_conn([(8, b"show run"), (18, b"\r\nhostname 3560CX\r\n"), (7, b"3560CX#")])
+    assert _run(conn.send_inputs("show run")) == ["hostname 3560CX"]
+    assert conn.channel.writes == [b"show run", b"\n"]
+
+
+def test_send_inputs_timeout():
+    conn = _mock_conn([(8, b"show run")])
+    conn.comms_operation_timeout = 0.05
+    with pytest.raises(TimeoutError):
+        _run(conn.send_inputs("show run"))
+
+
+def test_send_inputs_concurrent_connections():
+    conns = [
+        _mock_conn([(8, b"show ver"), (2, b"\r\n"), (7, b"3560CX#")], comms_operation_timeout=1)
+        for _ in range(10)
+    ]
+
+    async def _send():
+        return await asyncio.gather(*(conn.send_inputs("show ver") for conn in conns))
+
+    assert _run(_send()) == [[""]] * 10
+
+
+def test_get_prompt():
+    conn = _mock_conn([(2, b"\r\n"), (7, b"3560CX#")])
+    assert _run(conn.get_prompt()) == "3560CX#"
+
+
+def test_driver_send_command():
+    conn = _mock_conn(
+        [(9, b"\r\n3560CX#"), (8, b"show ver"), (13, b"\r\nversion 1\r\n"), (7, b"3560CX#")],
+        conn_class=AsyncIOSXEDriver,
+    )
+    assert _run(conn.send_command("show ver")) == ["version 1"]
+
+
+@pytest.mark.parametrize(
+    "method,args",
+    [
+        ("send_inputs_stream", ("show ver",)),
+        ("send_inputs_bulk", ("show ver",)),
+        ("execute_commands", ("show ver",)),
+        ("open_shell_channel", ()),
+    ],
+)
+def test_sync_only_methods(method, args):
+    conn = _mock_conn([])
+    with pytest.raises(TypeError, match="use the sync driver"):
+        getattr(conn, method)(*args)
+
+
+@pytest.mark.parametrize(
+    "method,args,kwargs",
+    [
+        ("send_command_stream", ("show ver",), {}),
+        ("send_config_commit", ("hostname r1",), {}),
+        ("confirm_commit", (), {}),
+    ],
+)
+def test_driver_sync_only_methods(method, args, kwargs):
+    conn = _mock_conn([], conn_class=AsyncEOSDriver)
+    with pytest.raises(TypeError, match="use the sync driver"):
+        getattr(conn, method)(*args, **kwargs)
+
+
+def test_driver_send_config_set_bulk():
+    conn = _mock_conn([], conn_class=AsyncEOSDriver)
+    with pytest.raises(TypeError, match="use the sync driver"):
+        _run(conn.send_config_set("hostname r1", bulk=True))
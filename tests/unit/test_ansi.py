@@ -0,0 +1,33 @@
+from ssh2net.ansi import AnsiStripper
+
+
+def test_ansi_stripper_single_chunk():
+    ansi_stripper = AnsiStripper()
+    output = ansi_stripper.feed(b"[admin@CoolDevice.Sea1: \x1b[1m/\x1b[0;0m]$")
+    assert output == b"[admin@CoolDevice.Sea1: /]$"
+    assert ansi_stripper.flush() == b""
+
+
+def test_ansi_stripper_split_sequence():
+    ansi_stripper = AnsiStripper()
+    assert ansi_stripper.feed(b"[admin@CoolDevice.Sea1: \x1b[") == b"[admin@CoolDevice.Sea1: "
+    assert ansi_stripper.feed(b"1m/\x1b") == b"/"
+    assert ansi_stripper.feed(b"[0;0m]$") == b"]$"
+
+
+def test_ansi_stripper_bytearray():
+    ansi_stripper = AnsiStripper()
+    assert ansi_stripper.feed(bytearray(b"\x1b[32mswitch#\x1b[0m")) == b"switch#"
+
+
+def test_ansi_stripper_flush():
+    ansi_stripper = AnsiStripper()
+    assert ansi_stripper.feed(b"switch#\x1b[0") == b"switch#"
+    assert ansi_stripper.flush() == b"\x1b[0"
+    assert ansi_stripper.feed(b"m") == b"m"
+
+
+def test_ansi_stripper_unterminated_sequence_not_held_forever():
+    ansi_stripper = AnsiStripper()
+    output = ansi_stripper.feed(b"\x1b[" + b"1;" * 40)
+    assert output == b"\x1b[" + b"1;" * 40
@@ -1,5 +1,6 @@
 from pathlib import Path
 import pytest
+import socket
 import sys
 
 import ssh2net
@@ -177,6 +178,28 @@ def test_init_valid_session_keepalive_pattern():
     assert conn.session_keepalive_pattern == "\x07"
 
 
+def test_init_valid_session_lock_timeout():
+    test_host = {
+        "setup_host": "my_device  ",
+        "auth_user": "username",
+        "auth_password": "password",
+        "session_lock_timeout": 30,
+    }
+    conn = SSH2Net(**test_host)
+    assert conn.session_lock_timeout == 30
+
+
+def test_init_invalid_session_lock_timeout():
+    test_host = {
+        "setup_host": "my_device  ",
+        "auth_user": "username",
+        "auth_password": "password",
+        "session_lock_timeout": "notanint",
+    }
+    with pytest.raises(ValueError):
+        SSH2Net(**test_host)
+
+
 def test_init_username_strip():
     test_host = {"setup_host": "my_device", "auth_user": "username  ", "auth_password": "password"}
     conn = SSH2Net(**test_host)
@@ -288,6 +311,28 @@ def test_init_invalid_comms_return_char():
     assert str(e.value) == "'comms_return_char' must be <class 'str'>, got: <class 'bool'>'"
 
 
+def test_init_valid_comms_read_size():
+    test_host = {
+        "setup_host": "my_device",
+        "auth_user": "username",
+        "auth_password": "password",
+        "comms_read_size": 1024,
+    }
+    conn = SSH2Net(**test_host)
+    assert conn.comms_read_size == 1024
+
+
+def test_init_invalid_comms_read_size():
+    test_host = {
+        "setup_host": "my_device",
+        "auth_user": "username",
+        "auth_password": "password",
+        "comms_read_size": "notanint",
+    }
+    with pytest.raises(ValueError):
+        SSH2Net(**test_host)
+
+
 def test_init_valid_comms_pre_login_handler_func():
     def pre_login_handler_func():
         pass
@@ -434,10 +479,12 @@ def test_repr():
         "SSH2Net {'_shell': False, 'host': '1.2.3.4', 'port': 22, 'setup_timeout': 5, "
         "'setup_use_paramiko': False, 'session_timeout': 5000, 'session_keepalive': False, "
         "'session_keepalive_interval': 10, 'session_keepalive_type': 'network', "
-        "'session_keepalive_pattern': '\\x05', 'auth_user': 'username', 'auth_public_key': None, "
-        "'auth_password': '********', 'comms_strip_ansi': False, 'comms_prompt_regex': "
+        "'session_keepalive_pattern': '\\x05', 'session_lock_timeout': 0, 'auth_user': 'username', "
+        "'auth_public_key': None, 'auth_password': '********', 'comms_strip_ansi': False, "
+        "'comms_prompt_regex': "
         "'^[a-z0-9.\\\\-@()/:]{1,32}[#>$]$', 'comms_operation_timeout': 10, 'comms_return_char': "
-        "'\\n', 'comms_pre_login_handler': '', 'comms_disable_paging': 'terminal length 0'}"
+        "'\\n', 'comms_pre_login_handler': '', 'comms_disable_paging': 'terminal length 0', "
+        "'comms_read_size': 65535}"
     )
 
 
@@ -485,6 +532,14 @@ def test__validate_host_invalid_dns():
     assert str(e.value) == f"Host {test_host['setup_host']} is not an IP or resolvable DNS name."
 
 
+def test__socket_open_no_addresses(monkeypatch):
+    monkeypatch.setattr(ssh2net.base.RESOLVER, "resolve", lambda host, port: [])
+    conn = SSH2Net(setup_host="127.0.0.1", auth_user="username", auth_password="password")
+    with pytest.raises(socket.gaierror) as exc:
+        conn._socket_open()
+    assert "127.0.0.1" in str(exc.value)
+
+
 def test__socket_alive_false():
     test_host = {"setup_host": "127.0.0.1", "auth_user": "username", "auth_password": "password"}
     conn = SSH2Net(**test_host)
@@ -0,0 +1,63 @@
+import time
+
+from ssh2net.buffer import DEFAULT_READ_SIZE, ReadState, ReceiveBuffer
+
+
+def test_receive_buffer_extend():
+    receive_buffer = ReceiveBuffer()
+    assert receive_buffer.read_size == DEFAULT_READ_SIZE
+    assert receive_buffer.extend(b"some") == 0
+    assert receive_buffer.extend(b"data") == 4
+    assert len(receive_buffer) == 8
+    assert bytes(receive_buffer) == b"somedata"
+
+
+def test_receive_buffer_find():
+    receive_buffer = ReceiveBuffer()
+    receive_buffer.extend(b"show version\r\nshow version")
+    assert receive_buffer.find(b"show version") == 0
+    assert receive_buffer.find(b"show version", 1) == 14
+    assert receive_buffer.find(b"show version", -5) == 0
+    assert receive_buffer.find(b"show run") == -1
+
+
+def test_receive_buffer_view():
+    receive_buffer = ReceiveBuffer()
+    receive_buffer.extend(b"somedata")
+    with receive_buffer.view(4) as buffer_view:
+        assert buffer_view == b"data"
+        assert buffer_view.obj is receive_buffer.buffer
+    receive_buffer.extend(b"more")
+    assert bytes(receive_buffer) == b"somedatamore"
+
+
+def test_receive_buffer_decode():
+    receive_buffer = ReceiveBuffer(read_size=1024)
+    receive_buffer.extend("description café".encode())
+    assert receive_buffer.read_size == 1024
+    assert receive_buffer.decode() == "description café"
+    assert receive_buffer.decode(start=12) == "café"
+
+
+def test_receive_buffer_clear():
+    receive_buffer = ReceiveBuffer()
+    receive_buffer.extend(b"somedata")
+    receive_buffer.clear()
+    assert len(receive_buffer) == 0
+
+
+def test_receive_buffer_consume():
+    receive_buffer = ReceiveBuffer()
+    receive_buffer.extend(b"line one\nline two")
+    receive_buffer.consume(9)
+    assert bytes(receive_buffer) == b"line two"
+
+
+def test_read_state_remaining():
+    read_state = ReadState(deadline=time.monotonic() + 10)
+    assert 9 < read_state.remaining() <= 10
+    assert read_state.receive_buffer.read_size == DEFAULT_READ_SIZE
+
+
+def test_read_state_no_deadline():
+    assert ReadState().remaining() is None
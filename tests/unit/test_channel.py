@@ -1,27 +1,40 @@
-from ssh2net import SSH2NetChannel
+from io import BytesIO
+import socket
+from threading import RLock, Thread
+import time
 
+import pytest
+from ssh2.error_codes import LIBSSH2_ERROR_EAGAIN
+from ssh2.exceptions import Timeout
+from ssh2.session import LIBSSH2_SESSION_BLOCK_INBOUND
 
-def test__rstrip_all_lines():
+from ssh2net import SSH2Net, SSH2NetChannel, SSH2NetShellGroup
+from ssh2net.buffer import ReceiveBuffer
+from ssh2net.lock import SessionLock
+from ssh2net.session_ssh2 import SSH2NetSessionSSH2
+
+
+def test__normalize_output_rstrip_all_lines():
     test_input = b"""
 some line
 another line
 one final line
     """
-    output = SSH2NetChannel._rstrip_all_lines(test_input)
+    output = SSH2NetChannel._normalize_output(test_input)
     for line in output.splitlines():
         assert line[-1] != " "
 
 
-def test__restructure_output():
-    output = "\n\nsomedata\n3560CX#"
-    output = SSH2NetChannel._restructure_output(output)
+def test__normalize_output():
+    output = b"\r\n\r\nsomedata\r\n3560CX#"
+    output = SSH2NetChannel._normalize_output(output)
     assert output.splitlines()[0] != ""
     assert output.splitlines()[1] != ""
 
 
-def test__restructure_output_strip_prompt():
-    output = "\n\nsomedata\n3560CX#"
-    output = SSH2NetChannel._restructure_output(output, strip_prompt=True)
+def test__normalize_output_strip_prompt():
+    output = b"\r\n\r\nsomedata\r\n3560CX#"
+    output = SSH2NetChannel._normalize_output(output, strip_prompt=True)
     assert output.splitlines()[0] != ""
     assert output.splitlines()[-1] != "3560CX#"
 
@@ -30,3 +43,497 @@ def test__strip_ansi():
     output = b"[admin@CoolDevice.Sea1: \x1b[1m/\x1b[0;0m]$"
     output = SSH2NetChannel._strip_ansi(output)
     assert output == b"[admin@CoolDevice.Sea1: /]$"
+
+
+class MockSession:
+    def __init__(self):
+        self.blocking = True
+
+    @staticmethod
+    def block_directions():
+        return LIBSSH2_SESSION_BLOCK_INBOUND
+
+    def set_blocking(self, blocking):
+        self.blocking = blocking
+
+    def set_timeout(self, timeout):
+        self.timeout = timeout
+
+
+class MockChannel:
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.writes = []
+
+    def read(self, size=1024):
+        read = self.reads.pop(0)
+        if isinstance(read, Exception):
+            raise read
+        return read
+
+    def write(self, channel_input):
+        self.writes.append(channel_input)
+        return len(channel_input), len(channel_input)
+
+    def flush(self):
+        pass
+
+
+class SilentChannel(MockChannel):
+    def read(self, size=1024):
+        if not self.reads:
+            return LIBSSH2_ERROR_EAGAIN, b""
+        return super().read(size)
+
+
+class FailingWriteChannel(MockChannel):
+    def write(self, channel_input):
+        raise OSError("socket closed")
+
+
+def _mock_conn(reads):
+    conn = SSH2Net(setup_host="my_device")
+    conn.session = MockSession()
+    conn.channel = MockChannel(reads)
+    conn.sock, conn.peer_sock = socket.socketpair()
+    conn.session_lock = SessionLock()
+    conn.session_io_lock = RLock()
+    return conn
+
+
+def test_get_prompt_split_across_reads():
+    conn = _mock_conn([(2, b"\r\n"), (4, b"3560"), (3, b"CX#")])
+    assert conn.get_prompt() == "3560CX#"
+    assert conn._current_prompt == "3560CX#"
+    assert conn.channel.writes == [b"\n"]
+    assert conn.session.timeout == conn.session_timeout
+
+
+def test__wait_channel_ready():
+    conn = _mock_conn([])
+    conn.peer_sock.send(b"data")
+    assert conn._wait_channel_ready(timeout=1) is True
+
+
+def test__wait_channel_ready_timeout():
+    conn = _mock_conn([])
+    assert conn._wait_channel_ready(timeout=0.01) is False
+
+
+def test__channel_read_waits_on_eagain():
+    conn = _mock_conn([(LIBSSH2_ERROR_EAGAIN, b""), (5, b"hello")])
+    conn.peer_sock.send(b"data")
+    receive_buffer = ReceiveBuffer()
+    assert conn._channel_read(receive_buffer) == b"hello"
+    assert bytes(receive_buffer) == b"hello"
+    assert conn.channel.reads == []
+
+
+def test__read_until_prompt():
+    conn = _mock_conn(
+        [
+            (12, b"\r\nsomedata\r\n"),
+            (LIBSSH2_ERROR_EAGAIN, b""),
+            (4, b"3560"),
+            (3, b"CX#"),
+        ]
+    )
+    conn.peer_sock.send(b"data")
+    output = conn._read_until_prompt()
+    assert output == b"\r\nsomedata\r\n3560CX#"
+    assert conn.session.blocking is True
+
+
+def test__read_until_prompt_tracks_current_prompt():
+    conn = _mock_conn([(12, b"\r\nsomedata\r\n"), (7, b"3560CX#")])
+    conn._read_until_prompt()
+    assert conn._current_prompt == "3560CX#"
+
+
+def test__read_until_prompt_unknown_current_prompt():
+    conn = _mock_conn([(10, b"Password: ")])
+    conn._current_prompt = "3560CX>"
+    conn._read_until_prompt(prompt="Password:")
+    assert conn._current_prompt is None
+
+
+def test__read_until_prompt_strip_ansi_split_across_reads():
+    conn = _mock_conn([(12, b"\r\nsomedata\r\n"), (9, b"3560CX\x1b[0"), (3, b"m#")])
+    conn.comms_strip_ansi = True
+    output = conn._read_until_prompt()
+    assert output == b"\r\nsomedata\r\n3560CX#"
+
+
+def test__read_until_prompt_resumes_after_timeout():
+    conn = _mock_conn([(12, b"\r\nsomedata\r\n"), (4, b"3560"), Timeout(), (3, b"CX#")])
+    output = conn._read_until_prompt()
+    assert output == b"\r\nsomedata\r\n3560CX#"
+
+
+def test__read_until_input_resumes_after_timeout():
+    conn = _mock_conn([(4, b"show"), Timeout(), (4, b" run")])
+    conn._read_until_input("show run")
+    assert conn.channel.reads == []
+    assert conn.channel.writes == [b"\n"]
+
+
+def test__read_until_prompt_retry_deadline():
+    conn = _mock_conn([Timeout()] * 1000)
+    conn.comms_operation_timeout = 0.05
+    with pytest.raises(Timeout):
+        conn._read_until_prompt()
+    assert len(conn.channel.reads) < 1000
+
+
+def test__read_until_prompt_retry_attempts_without_deadline():
+    conn = _mock_conn([Timeout()] * 10)
+    conn.comms_operation_timeout = 0
+    with pytest.raises(Timeout):
+        conn._read_until_prompt()
+    assert len(conn.channel.reads) == 5
+
+
+STREAM_READS = [
+    (10, b"show run\r\n"),
+    (12, b"\r\n\r\n Building"),
+    (29, b" configuration...\r\nhostname "),
+    (16, b"3560CX   \r\n!\r\n"),
+    (7, b"3560CX#"),
+]
+
+
+def test__read_until_prompt_stream():
+    conn = _mock_conn(STREAM_READS[1:])
+    chunks = list(conn._read_until_prompt_stream(strip_prompt=True))
+    assert chunks == ["Building configuration...\nhostname 3560CX\n", "!\n"]
+    assert conn.session.blocking is True
+
+
+def test__read_until_prompt_stream_matches_read_until_prompt():
+    for strip_prompt in (True, False):
+        conn = _mock_conn(STREAM_READS[1:])
+        streamed = "".join(conn._read_until_prompt_stream(strip_prompt=strip_prompt))
+        conn = _mock_conn(STREAM_READS[1:])
+        output = conn._normalize_output(conn._read_until_prompt(), strip_prompt=strip_prompt)
+        assert streamed == output + "\n"
+
+
+def test_send_inputs_stream():
+    conn = _mock_conn(STREAM_READS)
+    chunks = list(conn.send_inputs_stream("show run", strip_prompt=False))
+    assert chunks == ["Building configuration...\nhostname 3560CX\n", "!\n3560CX#\n"]
+    assert conn.channel.writes == [b"show run", b"\n"]
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_stream_operation_timeout():
+    conn = _mock_conn([])
+    conn.channel = SilentChannel([(8, b"show run")])
+    conn.comms_operation_timeout = 0.2
+    start_time = time.monotonic()
+    with pytest.raises(TimeoutError):
+        list(conn.send_inputs_stream("show run"))
+    assert time.monotonic() - start_time < 2
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_sink_file_object():
+    conn = _mock_conn(STREAM_READS)
+    sink = BytesIO()
+    result = conn.send_inputs("show run", sink=sink)
+    assert sink.getvalue() == b"Building configuration...\nhostname 3560CX\n!\n"
+    assert result == [len(sink.getvalue())]
+
+
+def test_send_inputs_sink_path(tmp_path):
+    conn = _mock_conn(STREAM_READS)
+    sink = tmp_path / "show_run"
+    conn.send_inputs("show run", sink=str(sink))
+    assert sink.read_bytes() == b"Building configuration...\nhostname 3560CX\n!\n"
+
+
+def test_send_inputs_sink_operation_timeout():
+    conn = _mock_conn([])
+    conn.channel = SilentChannel([(8, b"show run")])
+    conn.comms_operation_timeout = 0.2
+    start_time = time.monotonic()
+    with pytest.raises(TimeoutError):
+        conn.send_inputs("show run", sink=BytesIO())
+    assert time.monotonic() - start_time < 2
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_pipeline():
+    conn = _mock_conn(
+        [
+            (LIBSSH2_ERROR_EAGAIN, b""),
+            (22, b"show clock\r\n*10:00:00"),
+            (30, b" UTC Mon Jan 6 2020\r\n3560CX#show"),
+            (38, b" version\r\nCisco IOS, show clock is\r\n"),
+            (32, b"a command\r\n3560CX#show version"),
+            (9, b"\r\n3560CX#"),
+        ]
+    )
+    conn.peer_sock.send(b"data")
+    results = conn.send_inputs(["show clock", "show version", "show version"], pipeline=True)
+    assert results == ["*10:00:00 UTC Mon Jan 6 2020", "Cisco IOS, show clock is\na command", ""]
+    assert conn.channel.writes == [b"show clock\nshow version\nshow version\n"]
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_bulk():
+    conn = _mock_conn(
+        [
+            (37, b"interface loopback0\r\n3560CX(config-if)#"),
+            (30, b"description bulk\r\n3560CX(config-if)#"),
+            (11, b"no shutdown"),
+            (20, b"\r\n3560CX(config-if)#"),
+        ]
+    )
+    result = conn.send_inputs_bulk("interface loopback0\n\ndescription bulk\nno shutdown\n")
+    assert result == (
+        "interface loopback0\n3560CX(config-if)#description bulk\n3560CX(config-if)#no shutdown"
+    )
+    assert conn.channel.writes == [b"interface loopback0\ndescription bulk\nno shutdown\n"]
+    assert conn._current_prompt == "3560CX(config-if)#"
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_bulk_window():
+    conn = _mock_conn(
+        [
+            (21, b"interface loopback0\r\n"),
+            (36, b"3560CX(config-if)#description bulk\r\n"),
+            (18, b"3560CX(config-if)#"),
+        ]
+    )
+    conn.send_inputs_bulk(["interface loopback0", "description bulk"], window=1)
+    assert conn.channel.writes == [b"interface loopback0\n", b"description bulk\n"]
+
+
+def test_send_inputs_bulk_write_error_releases_lock():
+    conn = _mock_conn([])
+    conn.channel = FailingWriteChannel([])
+    with pytest.raises(OSError):
+        conn.send_inputs_bulk(["interface loopback0", "description bulk"])
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_invalidates_current_prompt_on_failure():
+    conn = _mock_conn([(10, b"show clock"), RuntimeError("channel closed")])
+    conn._current_prompt = "3560CX#"
+    with pytest.raises(RuntimeError):
+        conn.send_inputs("show clock")
+    assert conn._current_prompt is None
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_pipeline_write_error_releases_lock():
+    conn = _mock_conn([])
+    conn.channel = FailingWriteChannel([])
+    with pytest.raises(OSError):
+        conn.send_inputs(["show clock", "show version"], pipeline=True)
+    assert conn.session_lock.locked() is False
+
+
+def test_send_inputs_pipeline_no_strip_prompt():
+    conn = _mock_conn([(43, b"show clock\r\n*10:00:00 UTC Mon Jan 6 2020\r\n3560CX#")])
+    results = conn.send_inputs(["show clock"], strip_prompt=False, pipeline=True)
+    assert results == ["*10:00:00 UTC Mon Jan 6 2020\n3560CX#"]
+
+
+class MockExecChannel:
+    def __init__(self, reads):
+        self.reads = list(reads)
+        self.command = None
+        self.closed = False
+
+    def execute(self, command):
+        self.command = command
+        return 0
+
+    def read(self, size=1024):
+        return self.reads.pop(0)
+
+    def eof(self):
+        return not self.reads
+
+    def close(self):
+        self.closed = True
+
+
+class MockExecSession(MockSession):
+    def __init__(self, channels):
+        super().__init__()
+        self.channels = list(channels)
+
+    def open_session(self):
+        return self.channels.pop(0)
+
+    @staticmethod
+    def userauth_authenticated():
+        return True
+
+
+def test_execute_commands():
+    channels = [
+        MockExecChannel([(LIBSSH2_ERROR_EAGAIN, b""), (14, b"\r\nhostname r1\r\n"), (0, b"")]),
+        MockExecChannel([(9, b"uptime 1\n"), (LIBSSH2_ERROR_EAGAIN, b""), (0, b"")]),
+        MockExecChannel([(0, b"")]),
+    ]
+    conn = _mock_conn([])
+    conn.session = MockExecSession(channels)
+    ssh2_session_obj = SSH2NetSessionSSH2(conn)
+    conn._channel_open_exec = ssh2_session_obj._channel_open_exec
+    conn._channel_read_exec = ssh2_session_obj._channel_read_exec
+    conn._channel_wait_exec = ssh2_session_obj._channel_wait_exec
+    conn.peer_sock.send(b"data")
+    results = conn.execute_commands(["show hostname", "show uptime", "true"], max_channels=2)
+    assert results == ["hostname r1", "uptime 1", ""]
+    assert [channel.command for channel in channels] == ["show hostname", "show uptime", "true"]
+    assert all(channel.closed for channel in channels)
+    assert conn.session.blocking is True
+    assert conn.session_lock.locked() is False
+
+
+class MockEagainExecSession(MockExecSession):
+    would_block = True
+
+    def open_session(self):
+        if self.would_block:
+            self.would_block = False
+            return LIBSSH2_ERROR_EAGAIN
+        return super().open_session()
+
+
+def test_execute_commands_session_io_lock_released_while_waiting():
+    conn = _mock_conn([])
+    conn.session = MockEagainExecSession([MockExecChannel([(9, b"uptime 1\n"), (0, b"")])])
+    lock_free_while_waiting = []
+
+    def _wait_channel_ready(timeout=None):
+        # another thread (another shell channel or the keepalive) must be able to use the session
+        def _use_session():
+            acquired = conn.session_io_lock.acquire(timeout=1)
+            if acquired:
+                conn.session_io_lock.release()
+            lock_free_while_waiting.append(acquired)
+
+        waiter = Thread(target=_use_session)
+        waiter.start()
+        waiter.join()
+        return True
+
+    conn._wait_channel_ready = _wait_channel_ready
+    ssh2_session_obj = SSH2NetSessionSSH2(conn)
+    conn._channel_open_exec = ssh2_session_obj._channel_open_exec
+    conn._channel_read_exec = ssh2_session_obj._channel_read_exec
+    conn._channel_wait_exec = ssh2_session_obj._channel_wait_exec
+    assert conn.execute_commands("show uptime") == ["uptime 1"]
+    assert lock_free_while_waiting == [True]
+
+
+class MockShellChannel(MockChannel):
+    def __init__(self, reads):
+        super().__init__(reads)
+        self.shell_invoked = False
+        self.closed = False
+
+    def pty(self):
+        pass
+
+    def shell(self):
+        self.shell_invoked = True
+
+    def close(self):
+        self.closed = True
+
+
+class MockShellSession(MockExecSession):
+    def disconnect(self):
+        pass
+
+
+def _mock_shell_conn(channels):
+    conn = _mock_conn([])
+    conn.session = MockShellSession(channels)
+    conn.comms_disable_paging = None
+    conn._shell = True
+    return conn
+
+
+def test__channel_write_resumes_partial_write():
+    conn = _mock_conn([])
+    writes = [(LIBSSH2_ERROR_EAGAIN, 4), (6, 6)]
+    conn.channel.write = lambda channel_input: (
+        conn.channel.writes.append(channel_input),
+        writes.pop(0),
+    )[1]
+    conn.peer_sock.send(b"data")
+    conn._channel_write("show clock")
+    assert conn.channel.writes == [b"show clock", b" clock"]
+
+
+def test__channel_read_timeout():
+    conn = _mock_conn([(LIBSSH2_ERROR_EAGAIN, b"")] * 100)
+    with pytest.raises(Timeout):
+        conn._channel_read(ReceiveBuffer(), timeout=0.01)
+
+
+def test_open_shell_channel():
+    shell_channel = MockShellChannel([(12, b"show clock\r\n"), (19, b"*10:00:00\r\n3560CX#")])
+    conn = _mock_shell_conn([shell_channel])
+    shell = conn.open_shell_channel()
+    assert shell.channel is shell_channel
+    assert shell_channel.shell_invoked is True
+    assert shell.session is conn.session
+    assert shell.session_lock is not conn.session_lock
+    assert shell.session_io_lock is conn.session_io_lock
+    assert conn._session_shared is True and shell._session_shared is True
+    assert conn.session.blocking is False
+    assert shell.send_inputs("show clock") == ["*10:00:00"]
+    # shared sessions stay non-blocking
+    assert conn.session.blocking is False
+    assert conn.channel.writes == []
+    shell.close()
+    assert shell_channel.closed is True
+    assert conn.session is not None
+
+
+def test_open_shell_channel_own_selector_and_channel_state():
+    conn = _mock_shell_conn(
+        [
+            MockShellChannel([(12, b"show clock\r\n"), (19, b"*10:00:00\r\n3560CX#")]),
+            MockShellChannel([(12, b"show clock\r\n"), (19, b"*10:00:00\r\n3560CX#")]),
+        ]
+    )
+    conn._session_bind_driver()
+    shells = [conn.open_shell_channel() for _ in range(2)]
+    for shell in shells:
+        assert shell._channel_alive.__self__ is shell
+        assert shell._wait_channel_ready.__self__ is shell
+        assert shell._session_alive.__self__ is shell
+    conn.peer_sock.send(b"data")
+    assert all(shell._wait_channel_ready(timeout=1) for shell in shells)
+    selectors = [shell._socket_selector for shell in shells]
+    assert None not in selectors
+    assert selectors[0] is not selectors[1]
+    assert conn._socket_selector is None
+    shells[0].close()
+    assert shells[0]._channel_alive() is False
+    assert shells[1]._channel_alive() is True
+
+
+def test_shell_group():
+    conn = _mock_shell_conn(
+        [MockShellChannel([(12, b"show clock\r\n"), (19, b"*10:00:00\r\n3560CX#")])]
+    )
+    group = SSH2NetShellGroup(conn, shells=2)
+    assert group.shells[0] is conn
+    with group.shell() as shell:
+        assert shell is conn
+        # the connection's own shell is busy, so input goes to the other shell channel
+        assert group.send_inputs("show clock") == ["*10:00:00"]
+    assert group.shells[1].channel.writes == [b"show clock", b"\n"]
+    group.close()
+    assert group.shells == [conn]
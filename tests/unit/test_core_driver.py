@@ -2,9 +2,13 @@ import sys
 
 import pytest
 
-from ssh2net.exceptions import UnknownPrivLevel
-from ssh2net.core.driver import BaseNetworkDriver
-from ssh2net.core.cisco_iosxe.driver import PRIVS
+from ssh2net.exceptions import ConfigurationFailed, UnknownPrivLevel
+from ssh2net.core.driver import BaseNetworkDriver, privilege_graph
+from ssh2net.core.cisco_iosxe.driver import IOSXEDriver, PRIVS
+from ssh2net.core.arista_eos.driver import EOSDriver
+from ssh2net.core.cisco_iosxr.driver import PRIVS as IOSXR_PRIVS
+from ssh2net.core.cisco_nxos.driver import NXOSDriver
+from ssh2net.prompt import PromptMatcher
 
 
 IOS_ARP = """Protocol  Address          Age (min)  Hardware Addr   Type   Interface
@@ -34,3 +38,231 @@ def test_textfsm_parse_output():
     result = base_driver.textfsm_parse_output("show ip arp", IOS_ARP)
     assert isinstance(result, list)
     assert result[0] == ["Internet", "172.31.254.1", "-", "0000.0c07.acfe", "ARPA", "Vlan254"]
+
+
+class MockPromptDriver(BaseNetworkDriver):
+    def __init__(self, prompt):
+        super().__init__()
+        self.privs = PRIVS
+        self.prompt = prompt
+        self.get_prompt_calls = 0
+        self.sent = []
+
+    def send_inputs(self, inputs, pipeline=False):
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        self.sent.append((inputs, pipeline))
+        self._current_prompt = {
+            "disable": "3560CX>",
+            "configure terminal": "3560CX(config)#",
+            "end": "3560CX#",
+        }[inputs[-1]]
+
+    def send_inputs_interact(self, inputs, hidden_response=False):
+        self.sent.append((inputs, hidden_response))
+        self._current_prompt = "3560CX#"
+
+    def get_prompt(self):
+        self.get_prompt_calls += 1
+        self._current_prompt = self.prompt
+        return self.prompt
+
+
+def test__current_priv_tracked_prompt():
+    base_driver = MockPromptDriver("execprompt>")
+    base_driver._current_prompt = "3560CX#"
+    assert base_driver._current_priv().name == "privilege_exec"
+    assert base_driver.get_prompt_calls == 0
+
+
+def test__current_priv_unknown_prompt():
+    base_driver = MockPromptDriver("execprompt>")
+    assert base_driver._current_priv().name == "exec"
+    assert base_driver.get_prompt_calls == 1
+    assert base_driver._current_priv().name == "exec"
+    assert base_driver.get_prompt_calls == 1
+
+
+def test_attain_priv_tracked_prompt():
+    base_driver = MockPromptDriver("execprompt>")
+    base_driver._current_prompt = "3560CX#"
+    base_driver.attain_priv("privilege_exec")
+    assert base_driver.get_prompt_calls == 0
+
+
+def test_privilege_graph_plan():
+    graph = privilege_graph(PRIVS)
+    assert [transition.command for transition in graph.plan("exec", "configuration")] == [
+        "enable",
+        "configure terminal",
+    ]
+    assert [transition.command for transition in graph.plan("configuration", "exec")] == [
+        "end",
+        "disable",
+    ]
+    assert [
+        transition.command for transition in graph.plan("special_configuration", "privilege_exec")
+    ] == ["end"]
+    assert graph.plan("exec", "exec") == []
+    assert privilege_graph(PRIVS) is graph
+
+
+def test_privilege_graph_plan_unreachable():
+    graph = privilege_graph(IOSXR_PRIVS)
+    with pytest.raises(UnknownPrivLevel):
+        graph.plan("privilege_exec", "special_configuration")
+
+
+def test_attain_priv_batches_transitions():
+    base_driver = MockPromptDriver("3560CX(config-if)#")
+    base_driver.attain_priv("exec")
+    assert base_driver.sent == [(["end", "disable"], True)]
+    assert base_driver.get_prompt_calls == 1
+
+
+def test_attain_priv_escalate_auth():
+    base_driver = MockPromptDriver("3560CX>")
+    base_driver.auth_secondary = "secret"
+    base_driver.attain_priv("configuration")
+    assert base_driver.sent == [
+        (("enable", "Password:", "secret", base_driver.comms_prompt_regex), True),
+        (["configure terminal"], False),
+    ]
+
+
+def test_privilege_graph_pattern():
+    graph = privilege_graph(PRIVS)
+    assert graph.match_priv(graph.pattern.search("3560CX(config-if)#")).name == (
+        "special_configuration"
+    )
+    assert graph.match_priv(graph.pattern.search("3560CX(config)#")).name == "configuration"
+    assert graph.match_priv(graph.pattern.search("!!!!thisissoooowrongggg!!!!!!?!")) is None
+
+
+def test_privilege_graph_prompt_pattern_fallback():
+    graph = privilege_graph(PRIVS)
+    pattern = graph.prompt_pattern(r"^[a-z0-9.\-@()/:]{1,32}[#>$]$")
+    prompt_match = pattern.search("3560CX$")
+    assert prompt_match is not None
+    assert graph.match_priv(prompt_match) is None
+
+
+def test_privilege_graph_prompt_pattern_gated_by_comms_prompt_regex():
+    graph = privilege_graph(PRIVS)
+    pattern = graph.prompt_pattern(r"^r1[#>]$")
+    # looks like a privilege exec prompt, but is not a prompt as per comms_prompt_regex
+    assert pattern.search("3560CX#") is None
+    prompt_match = pattern.search("show run\nr1#")
+    assert prompt_match.group(0) == "r1#"
+    assert graph.match_priv(prompt_match).name == "privilege_exec"
+
+
+def test__current_priv_from_prompt_match():
+    base_driver = MockPromptDriver("execprompt>")
+    prompt_matcher = PromptMatcher(base_driver._prompt_pattern())
+    assert prompt_matcher.feed(b"show run\r\nhostname 3560CX\r\n3560CX(config)#")
+    base_driver._update_current_prompt(prompt_matcher)
+    assert base_driver._current_prompt == "3560CX(config)#"
+    assert base_driver._current_priv().name == "configuration"
+    assert base_driver.get_prompt_calls == 0
+
+
+class MockBulkDriver(IOSXEDriver):
+    def __init__(self, output):
+        super().__init__(setup_host="my_device")
+        self.output = output
+
+    def attain_priv(self, desired_priv):
+        pass
+
+    def send_inputs_bulk(self, inputs):
+        return self.output
+
+
+def test_send_config_set_bulk():
+    conn = MockBulkDriver("interface loopback0\n3560CX(config-if)#description bulk")
+    assert conn.send_config_set("interface loopback0\ndescription bulk", bulk=True) == [
+        "interface loopback0\n3560CX(config-if)#description bulk"
+    ]
+
+
+def test_send_config_set_bulk_config_errors():
+    conn = MockBulkDriver(
+        "interface loopbak0\n                ^\n% Invalid input detected at '^' marker."
+    )
+    with pytest.raises(ConfigurationFailed) as exc:
+        conn.send_config_set("interface loopbak0", bulk=True)
+    assert "% Invalid input detected" in str(exc.value)
+
+
+class MockCommitDriver(EOSDriver):
+    def __init__(self, bulk_output="", commit_output=""):
+        super().__init__(setup_host="my_device")
+        self.bulk_output = bulk_output
+        self.commit_output = commit_output
+        self.sent = []
+
+    def attain_priv(self, desired_priv):
+        self.sent.append(desired_priv)
+
+    def send_inputs_bulk(self, inputs):
+        self.sent.append(inputs)
+        return self.bulk_output
+
+    def send_inputs(self, inputs):
+        self.sent.append(inputs)
+        if inputs == "show session-config diffs":
+            return ["+hostname 3560CX"]
+        if isinstance(inputs, str) and inputs.startswith("commit"):
+            return [self.commit_output]
+        return [""]
+
+
+def test_send_config_commit():
+    conn = MockCommitDriver()
+    diff = conn.send_config_commit("hostname 3560CX", session_name="test")
+    assert diff == "+hostname 3560CX"
+    assert conn.sent == [
+        "privilege_exec",
+        "configure session test",
+        "hostname 3560CX",
+        "show session-config diffs",
+        "commit",
+        "privilege_exec",
+    ]
+
+
+def test_send_config_commit_confirmed():
+    conn = MockCommitDriver()
+    conn.send_config_commit("hostname 3560CX", confirmed=300, session_name="test")
+    assert "commit timer 00:05:00" in conn.sent
+    conn.confirm_commit()
+    assert conn.sent[-2:] == ["configure session test commit", "privilege_exec"]
+
+
+def test_send_config_commit_dry_run():
+    conn = MockCommitDriver()
+    conn.send_config_commit("hostname 3560CX", dry_run=True, session_name="test")
+    assert "commit" not in conn.sent
+    assert conn.sent[-2:] == [["abort"], "privilege_exec"]
+
+
+def test_send_config_commit_rejected_line():
+    conn = MockCommitDriver(bulk_output="hostnme 3560CX\n% Invalid input")
+    with pytest.raises(ConfigurationFailed):
+        conn.send_config_commit("hostnme 3560CX", session_name="test")
+    assert "commit" not in conn.sent
+    assert conn.sent[-2:] == [["abort"], "privilege_exec"]
+
+
+def test_send_config_commit_not_supported():
+    conn = MockBulkDriver("")
+    assert not hasattr(conn, "send_config_commit")
+    assert not hasattr(conn, "confirm_commit")
+
+
+def test_send_config_commit_confirmed_not_supported():
+    conn = NXOSDriver()
+    with pytest.raises(ValueError):
+        conn.send_config_commit("hostname 3560CX", confirmed=300)
+    with pytest.raises(ValueError):
+        conn.confirm_commit()
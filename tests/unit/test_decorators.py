@@ -1,14 +1,10 @@
-import sys
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 import pytest
 
 from ssh2net import SSH2Net
-
-if not sys.platform.startswith("win"):
-    from ssh2net.decorators import operation_timeout
-else:
-    from ssh2net.decorators import operation_timeout_win as operation_timeout
+from ssh2net.decorators import check_operation_deadline, operation_deadline
 
 
 class MockSSH2Net(SSH2Net):
@@ -16,27 +12,51 @@ class MockSSH2Net(SSH2Net):
         super().__init__()
         self.comms_operation_timeout = 0.1
 
-    @operation_timeout("comms_operation_timeout")
-    def operation_timeout_func(self):
-        time.sleep(1000)
+    @operation_deadline("comms_operation_timeout")
+    def operation_deadline_func(self):
+        while True:
+            check_operation_deadline()
+            time.sleep(0.001)
+
+    @operation_deadline("comms_operation_timeout")
+    def operation_deadline_success_func(self):
+        return check_operation_deadline()
 
-    @operation_timeout("comms_operation_timeout")
-    def operation_success_func(self):
-        time.sleep(0.00001)
+    @operation_deadline("comms_operation_timeout")
+    def operation_deadline_nested_func(self):
+        self.comms_operation_timeout = 1000
+        return self.operation_deadline_success_func()
 
 
-def test_operation_timeout_timeout():
+def test_operation_deadline_timeout():
     timeout_test = MockSSH2Net()
     with pytest.raises(TimeoutError):
-        timeout_test.operation_timeout_func()
+        timeout_test.operation_deadline_func()
+    assert check_operation_deadline() is None
+
+
+def test_operation_deadline_timeout_threads():
+    timeout_tests = [MockSSH2Net() for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(timeout_test.operation_deadline_func) for timeout_test in timeout_tests
+        ]
+        for future in futures:
+            with pytest.raises(TimeoutError):
+                future.result(timeout=5)
+
+
+def test_operation_deadline_success():
+    timeout_test = MockSSH2Net()
+    assert 0 < timeout_test.operation_deadline_success_func() <= 0.1
 
 
-def test_operation_timeout_success():
+def test_operation_deadline_nested_not_extended():
     timeout_test = MockSSH2Net()
-    timeout_test.operation_success_func()
+    assert timeout_test.operation_deadline_nested_func() <= 0.1
 
 
-def test_operation_timeout_no_timeout_value():
+def test_operation_deadline_no_timeout_value():
     timeout_test = MockSSH2Net()
-    timeout_test.comms_prompt_timeout = None
-    timeout_test.operation_success_func()
+    timeout_test.comms_operation_timeout = None
+    assert timeout_test.operation_deadline_success_func() is None
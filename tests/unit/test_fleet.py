@@ -0,0 +1,118 @@
+import socket
+
+import pytest
+
+from ssh2net import SSH2NetFleet
+from tests.unit.mock_conn import MockConn, MockDriverConn, mock_host
+
+
+def test_fleet_invalid_workers():
+    with pytest.raises(ValueError):
+        SSH2NetFleet([], max_workers=0)
+
+
+def test_fleet_results_as_completed():
+    fleet = SSH2NetFleet([mock_host("slow", delay=0.1), mock_host("fast")], max_workers=2)
+    results = list(fleet.send_inputs("show version"))
+    assert [result.host for result in results] == ["fast", "slow"]
+    assert results[0].result == ["fast: show version"]
+    assert results[0].exception is None
+    assert results[1].elapsed >= 0.1
+
+
+def test_fleet_failure_isolation():
+    fleet = SSH2NetFleet(
+        [mock_host("bad", fail=True), mock_host("hung", hang=True), mock_host("good")],
+        max_workers=3,
+        device_timeout=0.1,
+    )
+    results = {result.host: result for result in fleet.send_inputs("show version")}
+    assert isinstance(results["bad"].exception, ValueError)
+    assert isinstance(results["hung"].exception, TimeoutError)
+    assert results["good"].result == ["good: show version"]
+
+
+def test_fleet_bounded_concurrency():
+    MockConn.max_active = 0
+    fleet = SSH2NetFleet([mock_host(str(index), delay=0.01) for index in range(10)], max_workers=3)
+    assert len(list(fleet.send_inputs("show version"))) == 10
+    assert MockConn.max_active <= 3
+
+
+def test_fleet_send_command_kwargs():
+    fleet = SSH2NetFleet([mock_host("device", driver=MockDriverConn)])
+    result = next(fleet.send_command("show version", strip_prompt=False))
+    assert result.result == ["device: show version", {"strip_prompt": False}]
+
+
+def test_fleet_missing_operation():
+    fleet = SSH2NetFleet([mock_host("device")])
+    result = next(fleet.send_command("show version"))
+    assert isinstance(result.exception, AttributeError)
+
+
+class MockSocketConn(MockConn):
+    def __init__(self, setup_host, setup_port):
+        super().__init__(setup_host)
+        self.port = setup_port
+        self.sock = None
+        self.reconnected = False
+
+    def open_shell(self):
+        super().open_shell()
+        if self.sock is None:
+            self.reconnected = True
+            self.sock = socket.create_connection((self.host, self.port))
+
+    def send_inputs(self, inputs):
+        return [self.sock.getpeername()[1], self.reconnected]
+
+    def close(self):
+        super().close()
+        self.sock.close()
+
+
+@pytest.fixture
+def listeners():
+    listeners = []
+    for _ in range(2):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(4)
+        listeners.append(listener)
+    yield listeners
+    for listener in listeners:
+        listener.close()
+
+
+def test_fleet_pre_scan(listeners):
+    port = listeners[0].getsockname()[1]
+    hosts = [
+        {"setup_host": "127.0.0.1", "setup_port": port, "driver": MockSocketConn},
+        {"setup_host": "127.0.0.2", "setup_port": port, "driver": MockSocketConn},
+    ]
+    fleet = SSH2NetFleet(hosts, pre_scan_timeout=1)
+    results = {result.host: result for result in fleet.send_inputs("show version")}
+    assert results["127.0.0.1"].result == [port, False]
+    assert isinstance(results["127.0.0.2"].exception, OSError)
+
+
+def test_fleet_pre_scan_same_host_different_ports(listeners):
+    ports = [listener.getsockname()[1] for listener in listeners]
+    hosts = [
+        {"setup_host": "127.0.0.1", "setup_port": port, "driver": MockSocketConn} for port in ports
+    ]
+    fleet = SSH2NetFleet(hosts, pre_scan_timeout=1)
+    results = sorted(result.result for result in fleet.send_inputs("show version"))
+    assert results == sorted([port, False] for port in ports)
+
+
+def test_fleet_pre_scan_keeps_max_workers_sockets(listeners):
+    ports = [listener.getsockname()[1] for listener in listeners]
+    hosts = [
+        {"setup_host": "127.0.0.1", "setup_port": port, "driver": MockSocketConn} for port in ports
+    ]
+    fleet = SSH2NetFleet(hosts, max_workers=1, pre_scan_timeout=1)
+    results = sorted(result.result for result in fleet.send_inputs("show version"))
+    assert sorted(port for port, _ in results) == sorted(ports)
+    assert sorted(reconnected for _, reconnected in results) == [False, True]
@@ -0,0 +1,137 @@
+import gc
+from threading import Event, RLock, Thread
+import time
+
+from ssh2net import SSH2Net
+from ssh2net.keepalive import KeepaliveScheduler
+from ssh2net.lock import SessionLock
+
+
+class MockKeepaliveConn:
+    host = "my_device"
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.sent = 0
+        self.done = Event()
+
+    def _session_keepalive_send(self):
+        self.sent += 1
+        if len(self.delays) == 1:
+            self.done.set()
+        return self.delays.pop(0)
+
+
+def test_scheduler_sends_until_stopped():
+    scheduler = KeepaliveScheduler()
+    conn = MockKeepaliveConn([0.01, 0.01, None])
+    scheduler.register(conn, 0.01)
+    assert conn.done.wait(timeout=1)
+    time.sleep(0.05)
+    assert conn.sent == 3
+    assert scheduler.registered(conn) is False
+
+
+def test_scheduler_unregister():
+    scheduler = KeepaliveScheduler()
+    conn = MockKeepaliveConn([0.01])
+    scheduler.register(conn, 0.05)
+    scheduler.unregister(conn)
+    time.sleep(0.1)
+    assert conn.sent == 0
+
+
+def test_scheduler_single_thread_for_many_connections():
+    scheduler = KeepaliveScheduler()
+    conns = [MockKeepaliveConn([None]) for _ in range(100)]
+    for conn in conns:
+        scheduler.register(conn, 0.01)
+    assert all(conn.done.wait(timeout=1) for conn in conns)
+    assert scheduler._thread.is_alive()
+
+
+def test_scheduler_drops_garbage_collected_connections():
+    scheduler = KeepaliveScheduler()
+    scheduler.register(MockKeepaliveConn([0.01]), 0.01)
+    gc.collect()
+    time.sleep(0.05)
+    assert scheduler._connections == {}
+
+
+class MockChannel:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, channel_input):
+        self.writes.append(channel_input)
+        return len(channel_input), len(channel_input)
+
+
+class MockSession:
+    def __init__(self):
+        self.keepalives = 0
+
+    @staticmethod
+    def userauth_authenticated():
+        return True
+
+    def keepalive_send(self):
+        self.keepalives += 1
+
+
+def _mock_conn():
+    conn = SSH2Net(setup_host="my_device", session_keepalive=True, session_keepalive_interval=10)
+    conn.session = MockSession()
+    conn.channel = MockChannel()
+    conn.session_lock = SessionLock()
+    conn.session_io_lock = RLock()
+    return conn
+
+
+def test__session_keepalive_send():
+    conn = _mock_conn()
+    assert conn._session_keepalive_send() == 10
+    assert conn.channel.writes == [b"\x05"]
+
+
+def test__session_keepalive_send_skipped_on_recent_traffic():
+    conn = _mock_conn()
+    conn._last_activity = time.monotonic() - 4
+    assert 5 < conn._session_keepalive_send() <= 6
+    assert conn.channel.writes == []
+
+
+def test__session_keepalive_send_session_busy():
+    conn = _mock_conn()
+    conn.session_lock.acquire()
+    assert conn._session_keepalive_send() == 1
+    assert conn.channel.writes == []
+
+
+def test__session_keepalive_send_standard():
+    conn = _mock_conn()
+    conn.session_keepalive_type = "standard"
+    assert conn._session_keepalive_send() == 10
+    assert conn.session.keepalives == 1
+
+
+def test__session_keepalive_send_standard_session_io_busy():
+    conn = _mock_conn()
+    conn.session_keepalive_type = "standard"
+    locked = Event()
+    release = Event()
+
+    def _hold_io_lock():
+        with conn.session_io_lock:
+            locked.set()
+            release.wait()
+
+    holder = Thread(target=_hold_io_lock)
+    holder.start()
+    locked.wait()
+    try:
+        assert conn._session_keepalive_send() == 1
+    finally:
+        release.set()
+        holder.join()
+    assert conn.session.keepalives == 0
@@ -0,0 +1,76 @@
+from threading import Thread
+import time
+
+import pytest
+
+from ssh2net import SSH2Net
+from ssh2net.exceptions import SessionLockTimeout
+from ssh2net.lock import SessionLock
+
+
+def test_acquire_release():
+    session_lock = SessionLock()
+    assert session_lock.acquire() is True
+    assert session_lock.locked() is True
+    session_lock.release_lock()
+    assert session_lock.locked() is False
+    assert session_lock.acquire_count == 1
+    assert session_lock.wait_count == 0
+
+
+def test_acquire_non_blocking():
+    session_lock = SessionLock()
+    session_lock.acquire_lock()
+    assert session_lock.acquire(blocking=False) is False
+    assert session_lock.wait_count == 0
+
+
+def test_release_unlocked():
+    with pytest.raises(RuntimeError):
+        SessionLock().release()
+
+
+def test_acquire_timeout():
+    session_lock = SessionLock()
+    session_lock.acquire()
+    assert session_lock.acquire(timeout=0.01) is False
+    assert session_lock.timeout_count == 1
+    assert session_lock.wait_count == 1
+    assert session_lock.wait_time_max >= 0.01
+    # timed out waiter must not be handed the lock
+    session_lock.release()
+    assert session_lock.locked() is False
+
+
+def test_fifo_order():
+    session_lock = SessionLock()
+    session_lock.acquire()
+    order = []
+
+    def worker(worker_id):
+        with session_lock:
+            order.append(worker_id)
+
+    threads = []
+    for worker_id in range(5):
+        thread = Thread(target=worker, args=(worker_id,))
+        thread.start()
+        threads.append(thread)
+        # make sure each worker is queued before starting the next
+        while len(session_lock._waiters) <= worker_id:
+            time.sleep(0.001)
+    session_lock.release()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+    assert session_lock.wait_count == 5
+    assert session_lock.locked() is False
+
+
+def test_acquire_session_lock_timeout():
+    conn = SSH2Net(setup_host="my_device", session_lock_timeout=1)
+    conn.session_lock = SessionLock()
+    conn.session_lock.acquire()
+    conn.session_lock_timeout = 0.01
+    with pytest.raises(SessionLockTimeout):
+        conn._acquire_session_lock()
@@ -0,0 +1,46 @@
+from ssh2net.normalize import OutputNormalizer, _render_line
+
+
+def test__render_line_carriage_return():
+    assert _render_line("--More--\r        \rinterface Gi1") == "interface Gi1"
+
+
+def test__render_line_backspace():
+    assert _render_line("show clokc\b\bck") == "show clock"
+
+
+def test_normalize():
+    output = b"\r\n\r\n  Building configuration...   \r\n\r\nhostname 3560CX\r\n!\r\n\r\n3560CX#"
+    normalizer = OutputNormalizer()
+    assert normalizer.normalize(output) == (
+        "Building configuration...\n\nhostname 3560CX\n!\n\n3560CX#"
+    )
+    assert normalizer.normalize(output, strip_prompt=True) == (
+        "Building configuration...\n\nhostname 3560CX\n!\n"
+    )
+
+
+def test_normalize_empty():
+    assert OutputNormalizer().normalize(b"\r\n   \r\n") == ""
+    assert OutputNormalizer().normalize(b"3560CX#", strip_prompt=True) == ""
+
+
+def test_feed_holds_last_line():
+    normalizer = OutputNormalizer()
+    assert normalizer.feed(b"\r\nline one\r\n") == []
+    assert normalizer.feed(b"\r\n\r\nline two\r\n3560") == ["line one", "", ""]
+    assert normalizer.feed(b"CX#") == []
+    assert normalizer.finish(strip_prompt=True) == ["line two"]
+
+
+def test_feed_multibyte_character_split_across_chunks():
+    output = "interface description café\r\n3560CX#".encode()
+    split_at = output.index(b"\xc3") + 1
+    normalizer = OutputNormalizer()
+    lines = normalizer.feed(output[:split_at]) + normalizer.feed(output[split_at:])
+    lines += normalizer.finish()
+    assert lines == ["interface description café", "3560CX#"]
+
+
+def test_normalize_does_not_interpret_escapes():
+    assert OutputNormalizer().normalize(b"banner motd \\n hello\r\n") == "banner motd \\n hello"
@@ -0,0 +1,86 @@
+from threading import Thread
+import time
+
+import pytest
+
+from ssh2net import SSH2NetConnectionPool
+from ssh2net.exceptions import ConnectionPoolTimeout
+from tests.unit.mock_conn import mock_host
+
+
+def test_pool_invalid_max_permock_host():
+    with pytest.raises(ValueError):
+        SSH2NetConnectionPool(max_per_host=0)
+
+
+def test_pool_reuses_connection():
+    pool = SSH2NetConnectionPool()
+    with pool.connection(mock_host()) as conn:
+        assert conn.opened is True
+    with pool.connection(mock_host()) as conn_again:
+        assert conn_again is conn
+    assert conn.privs == ["privilege_exec"]
+
+
+def test_pool_keyed_by_credentials():
+    pool = SSH2NetConnectionPool()
+    with pool.connection(mock_host(auth_user="one")) as conn:
+        pass
+    with pool.connection(mock_host(auth_user="two")) as other_conn:
+        assert other_conn is not conn
+
+
+def test_pool_discard_on_exception():
+    pool = SSH2NetConnectionPool()
+    with pytest.raises(ValueError):
+        with pool.connection(mock_host()) as conn:
+            raise ValueError
+    assert conn.closed is True
+    with pool.connection(mock_host()) as new_conn:
+        assert new_conn is not conn
+
+
+def test_pool_replaces_unhealthy_connection():
+    pool = SSH2NetConnectionPool()
+    conn = pool.checkout(mock_host())
+    conn.healthy = False
+    pool.checkin(conn)
+    new_conn = pool.checkout(mock_host())
+    assert new_conn is not conn
+    assert conn.closed is True
+
+
+def test_pool_idle_eviction():
+    pool = SSH2NetConnectionPool(idle_ttl=0.01)
+    with pool.connection(mock_host()) as conn:
+        pass
+    time.sleep(0.02)
+    assert pool.evict_idle() == 1
+    assert conn.closed is True
+
+
+def test_pool_max_per_host_timeout():
+    pool = SSH2NetConnectionPool(max_per_host=1)
+    pool.checkout(mock_host())
+    with pytest.raises(ConnectionPoolTimeout):
+        pool.checkout(mock_host(), timeout=0.01)
+
+
+def test_pool_max_per_host_waits_for_checkin():
+    pool = SSH2NetConnectionPool(max_per_host=1)
+    conn = pool.checkout(mock_host())
+    Thread(target=lambda: (time.sleep(0.02), pool.checkin(conn))).start()
+    assert pool.checkout(mock_host(), timeout=1) is conn
+
+
+def test_pool_close():
+    pool = SSH2NetConnectionPool()
+    with pool.connection(mock_host()) as conn:
+        pass
+    checked_out = pool.checkout(mock_host("other"))
+    pool.close()
+    assert conn.closed is True
+    pool.checkin(checked_out)
+    assert checked_out.closed is True
+    with pytest.raises(RuntimeError):
+        pool.checkout(mock_host())
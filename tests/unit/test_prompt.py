@@ -0,0 +1,72 @@
+from ssh2net.prompt import PromptMatcher, _pattern_max_width
+
+
+PROMPT_REGEX = r"^[a-z0-9.\-@()/:]{1,32}[#>$]$"
+
+
+def test_prompt_matcher_single_read():
+    output = b"\r\nsome output\r\nmore output\r\n3560CX#"
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(output) is True
+    assert prompt_matcher.prompt == "3560CX#"
+    assert output[prompt_matcher.start : prompt_matcher.end] == b"3560CX#"
+
+
+def test_prompt_matcher_no_prompt():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(b"some output\r\nmore output\r\n") is False
+    assert prompt_matcher.prompt == ""
+    assert prompt_matcher.start == -1
+
+
+def test_prompt_matcher_prompt_split_across_reads():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(b"some output\r\n3560") is False
+    assert prompt_matcher.feed(b"CX") is False
+    assert prompt_matcher.feed(b"# ") is True
+    assert prompt_matcher.prompt == "3560CX#"
+    assert (prompt_matcher.start, prompt_matcher.end) == (13, 20)
+
+
+def test_prompt_matcher_not_at_line_start():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(b"interface description is 3560CX#") is False
+    assert prompt_matcher.feed(b"\n") is False
+
+
+def test_prompt_matcher_not_at_line_start_after_trimming_tail():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(b"x" * 100) is False
+    assert prompt_matcher.feed(b"3560CX#") is False
+
+
+def test_prompt_matcher_bounded_tail():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    for _ in range(1000):
+        assert prompt_matcher.feed(b"interface GigabitEthernet1\r\n no shutdown\r\n") is False
+    assert len(prompt_matcher._tail) <= prompt_matcher.tail_window + 3
+    assert prompt_matcher.feed(b"3560CX#") is True
+    assert prompt_matcher.start == 1000 * 42
+
+
+def test_prompt_matcher_substring():
+    prompt_matcher = PromptMatcher("Password:", regex=False)
+    assert prompt_matcher.feed(b"enable\r\nPass") is False
+    assert prompt_matcher.feed(b"word: ") is True
+    assert prompt_matcher.start == 8
+
+
+def test_prompt_matcher_reset():
+    prompt_matcher = PromptMatcher(PROMPT_REGEX)
+    assert prompt_matcher.feed(b"3560CX#") is True
+    prompt_matcher.reset()
+    assert prompt_matcher.match is None
+    assert prompt_matcher.feed(b"some output") is False
+
+
+def test_pattern_max_width_cached():
+    _pattern_max_width.cache_clear()
+    PromptMatcher(r"^router[#>]$")
+    PromptMatcher(r"^router[#>]$")
+    assert _pattern_max_width.cache_info().hits == 1
+    assert _pattern_max_width.cache_info().misses == 1
@@ -0,0 +1,89 @@
+import socket
+
+import pytest
+
+from ssh2net import SSH2Net
+from ssh2net.resolver import Resolver, host_port
+
+
+class MockGetaddrinfo:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, host, port, type=0):  # pylint: disable=W0622
+        self.calls += 1
+        if host == "notresolvable":
+            raise socket.gaierror
+        return [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("::1", port, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+
+@pytest.fixture
+def getaddrinfo(monkeypatch):
+    mock_getaddrinfo = MockGetaddrinfo()
+    monkeypatch.setattr(socket, "getaddrinfo", mock_getaddrinfo)
+    return mock_getaddrinfo
+
+
+def test_resolve_cached(getaddrinfo):
+    resolver = Resolver()
+    addresses = resolver.resolve("my_device", 22)
+    assert addresses == [
+        (socket.AF_INET6, ("::1", 22, 0, 0)),
+        (socket.AF_INET, ("127.0.0.1", 22)),
+    ]
+    assert resolver.resolve("my_device", 22) == addresses
+    assert getaddrinfo.calls == 1
+
+
+def test_resolve_ttl_expired(getaddrinfo):
+    resolver = Resolver(ttl=0)
+    resolver.resolve("my_device", 22)
+    resolver.resolve("my_device", 22)
+    assert getaddrinfo.calls == 2
+
+
+def test_resolve_failure_not_cached(getaddrinfo):
+    resolver = Resolver()
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            resolver.resolve("notresolvable", 22)
+    assert getaddrinfo.calls == 2
+
+
+def test_host_port():
+    assert host_port({"setup_host": " my_device ", "setup_port": 2222}) == ("my_device", 2222)
+    assert host_port({"host": "my_device", "port": "2222"}) == ("my_device", 2222)
+    assert host_port({"ip": "::1"}) == ("::1", 22)
+    assert host_port({}) == ("", 22)
+
+
+def test_resolve_hosts(getaddrinfo):
+    resolver = Resolver()
+    resolved = resolver.resolve_hosts(
+        [
+            {"setup_host": "my_device", "setup_port": 2222},
+            {"host": "my_device", "port": 2222, "device_type": "cisco_ios"},
+            {"setup_host": "notresolvable"},
+        ]
+    )
+    assert list(resolved) == [("my_device", 2222)]
+    assert getaddrinfo.calls == 2
+
+
+def test_socket_open_ipv6_fallback(getaddrinfo, monkeypatch):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    port = listener.getsockname()[1]
+    resolver = Resolver()
+    monkeypatch.setattr("ssh2net.base.RESOLVER", resolver)
+    conn = SSH2Net(setup_host="my_device", setup_port=port)
+    conn._socket_open()
+    # ::1 is either unavailable or has nothing listening on the port; falls back to ipv4
+    assert conn.sock.getpeername() == ("127.0.0.1", port)
+    conn.sock.close()
+    listener.close()
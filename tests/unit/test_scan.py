@@ -0,0 +1,107 @@
+import socket
+
+import pytest
+
+from ssh2net import SSH2NetScanner
+from ssh2net.scan import socket_connected
+
+
+@pytest.fixture
+def listener():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    yield listener
+    listener.close()
+
+
+def _closed_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_scanner_invalid_max_concurrent():
+    with pytest.raises(ValueError):
+        SSH2NetScanner(max_concurrent=0)
+
+
+def test_scan(listener):
+    port = listener.getsockname()[1]
+    hosts = [
+        {"setup_host": "127.0.0.1", "setup_port": port},
+        {"host": "127.0.0.2", "port": _closed_port(), "device_type": "cisco_ios"},
+    ]
+    results = SSH2NetScanner(timeout=1).scan(hosts)
+    assert set(results.reachable) == {("127.0.0.1", port)}
+    assert results.reachable["127.0.0.1", port].rtt >= 0
+    assert results.reachable["127.0.0.1", port].sock is None
+    assert isinstance(results.unreachable["127.0.0.2", hosts[1]["port"]].exception, OSError)
+
+
+def test_scan_keep_sockets(listener):
+    port = listener.getsockname()[1]
+    results = SSH2NetScanner(timeout=1, keep_sockets=True).scan(
+        [{"setup_host": "127.0.0.1", "setup_port": port}]
+    )
+    sock = results.reachable["127.0.0.1", port].sock
+    assert sock.getpeername() == ("127.0.0.1", port)
+    sock.close()
+
+
+@pytest.fixture
+def second_listener():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    yield listener
+    listener.close()
+
+
+def test_scan_same_host_different_ports(listener, second_listener):
+    ports = [listener.getsockname()[1], second_listener.getsockname()[1]]
+    hosts = [{"setup_host": "127.0.0.1", "setup_port": port} for port in ports]
+    results = SSH2NetScanner(timeout=1, keep_sockets=True).scan(hosts)
+    for port in ports:
+        sock = results.reachable["127.0.0.1", port].sock
+        assert sock.getpeername() == ("127.0.0.1", port)
+        sock.close()
+
+
+def test_scan_max_kept_sockets(listener, second_listener):
+    ports = [listener.getsockname()[1], second_listener.getsockname()[1]]
+    hosts = [{"setup_host": "127.0.0.1", "setup_port": port} for port in ports]
+    results = SSH2NetScanner(timeout=1, keep_sockets=True, max_kept_sockets=1).scan(hosts)
+    assert len(results.reachable) == 2
+    kept = [result.sock for result in results.reachable.values() if result.sock is not None]
+    assert len(kept) == 1
+    kept[0].close()
+
+
+def test_scan_socket_creation_failure(listener, monkeypatch):
+    def _socket(*args, **kwargs):
+        raise OSError(24, "Too many open files")
+
+    monkeypatch.setattr(socket, "socket", _socket)
+    port = listener.getsockname()[1]
+    results = SSH2NetScanner(timeout=1).scan([{"setup_host": "127.0.0.1", "setup_port": port}])
+    assert results.unreachable["127.0.0.1", port].exception.errno == 24
+
+
+def test_socket_connected(listener):
+    sock = socket.create_connection(listener.getsockname())
+    peer_sock, _ = listener.accept()
+    assert socket_connected(sock) is True
+    peer_sock.close()
+    assert socket_connected(sock) is False
+    sock.close()
+
+
+def test_scan_max_concurrent(listener):
+    hosts = [{"setup_host": f"127.0.0.{index}", "setup_port": _closed_port()} for index in (2, 3)]
+    hosts.append({"setup_host": "127.0.0.1", "setup_port": listener.getsockname()[1]})
+    results = SSH2NetScanner(timeout=1, max_concurrent=1).scan(hosts)
+    assert [host for host, _ in results.reachable] == ["127.0.0.1"]
+    assert sorted(host for host, _ in results.unreachable) == ["127.0.0.2", "127.0.0.3"]
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from ssh2net import SSH2NetShardedExecutor
+from ssh2net import sharded
+from tests.unit.mock_conn import MockDriverConn, mock_host
+
+
+def _hosts(count):
+    return [mock_host(f"device{index}") for index in range(count)]
+
+
+def test_sharded_invalid_processes():
+    with pytest.raises(ValueError):
+        SSH2NetShardedExecutor([], processes=2, max_workers=0)
+
+
+def test_sharded_run_across_processes():
+    with SSH2NetShardedExecutor(_hosts(4), processes=2) as executor:
+        results = {result.host: result.result for result in executor.send_inputs("show ver")}
+        assert results["device0"] == ["device0: show ver"]
+        info = {result.host: result.result for result in executor.run("connection_info")}
+        assert len({pid for pid, _ in info.values()}) == 2
+        assert os.getpid() not in {pid for pid, _ in info.values()}
+        # connections stay open in the workers between operations
+        assert {result.host: result.result for result in executor.run("connection_info")} == info
+
+
+def test_sharded_send_command_kwargs():
+    hosts = [mock_host("device", driver=MockDriverConn)]
+    with SSH2NetShardedExecutor(hosts, processes=1) as executor:
+        result = next(executor.send_command("show version", strip_prompt=False))
+        assert result.result == ["device: show version", {"strip_prompt": False}]
+
+
+def test_sharded_submit_get_result():
+    with SSH2NetShardedExecutor(_hosts(2), processes=2) as executor:
+        request_id = executor.submit(1, "send_inputs", "show ver")
+        result_request_id, result = executor.get_result(timeout=5)
+        assert result_request_id == request_id
+        assert result.host == "device1"
+
+
+def test_sharded_unpicklable_exception():
+    with SSH2NetShardedExecutor(_hosts(1), processes=1) as executor:
+        result = next(executor.run("raise_unpicklable"))
+        assert isinstance(result.exception, RuntimeError)
+        assert "UnpicklableError" in str(result.exception)
+
+
+def test_sharded_dead_worker(monkeypatch):
+    monkeypatch.setattr(sharded, "WORKER_POLL_INTERVAL", 0.05)
+    executor = SSH2NetShardedExecutor(_hosts(1), processes=1)
+    result = next(executor.run("crash"))
+    assert isinstance(result.exception, RuntimeError)
+    executor.close()